@@ -1,58 +1,72 @@
+import os
+import sys
+import time
 from datetime import date
-import json
-from flask import Flask, render_template
 from functools import lru_cache
-import subprocess
-import re
-import time
 
+from flask import Flask, render_template
+
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from main import createTodaysGames, data_url
+from src.DataProviders.OddsCache import OddsCache
+from src.DataProviders.SbrOddsProvider import SbrOddsProvider
+from src.Predict import Model_Registry, Renderers, XGBoost_Runner
+from src.Utils.tools import create_todays_games_from_odds, get_json_data, to_data_frame
 
-@lru_cache()
-def fetch_fanduel(ttl_hash=None):
-    del ttl_hash
-    return fetch_game_data(sportsbook="fanduel")
+sportsbooks = ['fanduel', 'draftkings', 'betmgm']
+odds_cache = OddsCache(ttl=600, stale_ttl=3600)
 
-@lru_cache()
-def fetch_draftkings(ttl_hash=None):
-    del ttl_hash
-    return fetch_game_data(sportsbook="draftkings")
 
-@lru_cache()
-def fetch_betmgm(ttl_hash=None):
-    del ttl_hash
-    return fetch_game_data(sportsbook="betmgm")
-
-def fetch_game_data(sportsbook="fanduel"):
-    cmd = ["python", "main.py", "-xgb", f"-odds={sportsbook}"]
-    stdout = subprocess.check_output(cmd, cwd="../").decode()
-    data_re = re.compile(r'\n(?P<home_team>[\w ]+)(\((?P<home_confidence>[\d+\.]+)%\))? vs (?P<away_team>[\w ]+)(\((?P<away_confidence>[\d+\.]+)%\))?: (?P<ou_pick>OVER|UNDER) (?P<ou_value>[\d+\.]+) (\((?P<ou_confidence>[\d+\.]+)%\))?', re.MULTILINE)
-    ev_re = re.compile(r'(?P<team>[\w ]+) EV: (?P<ev>[-\d+\.]+)', re.MULTILINE)
-    odds_re = re.compile(r'(?P<away_team>[\w ]+) \((?P<away_team_odds>-?\d+)\) @ (?P<home_team>[\w ]+) \((?P<home_team_odds>-?\d+)\)', re.MULTILINE)
+def to_game_records(results):
+    """
+    Formats one sportsbook's column of scored games for the template, missing odds and EV as blank cells.
+
+    Returns:
+        dictionary: {away_team + ':' + home_team: game prediction dict}
+    """
     games = {}
-    for match in data_re.finditer(stdout):
-        game_dict = {'away_team': match.group('away_team').strip(),
-                     'home_team': match.group('home_team').strip(),
-                     'away_confidence': match.group('away_confidence'),
-                     'home_confidence': match.group('home_confidence'),
-                     'ou_pick': match.group('ou_pick'),
-                     'ou_value': match.group('ou_value'),
-                     'ou_confidence': match.group('ou_confidence')}
-        for ev_match in ev_re.finditer(stdout):
-            if ev_match.group('team') == game_dict['away_team']:
-                game_dict['away_team_ev'] = ev_match.group('ev')
-            if ev_match.group('team') == game_dict['home_team']:
-                game_dict['home_team_ev'] = ev_match.group('ev')
-        for odds_match in odds_re.finditer(stdout):
-            if odds_match.group('away_team') == game_dict['away_team']:
-                game_dict['away_team_odds'] = odds_match.group('away_team_odds')
-            if odds_match.group('home_team') == game_dict['home_team']:
-                game_dict['home_team_odds'] = odds_match.group('home_team_odds')
-
-        print(json.dumps(game_dict, sort_keys=True, indent=4))
-        games[f"{game_dict['away_team']}:{game_dict['home_team']}"] = game_dict
+    for record in Renderers.to_records(results):
+        if record['ou_value'] is None:
+            continue
+        home_wins = record['winner'] == record['home_team']
+        record['ou_value'] = f"{record['ou_value']:g}"
+        for side in ('home_team_odds', 'away_team_odds'):
+            if record[side] is not None:
+                record[side] = int(record[side])
+        record['home_confidence'] = record['winner_confidence'] if home_wins else None
+        record['away_confidence'] = None if home_wins else record['winner_confidence']
+        games[f"{record['away_team']}:{record['home_team']}"] = {key: '' if value is None else value
+                                                                 for key, value in record.items()}
     return games
 
 
+@lru_cache(maxsize=1)
+def fetch_team_stats(ttl_hash=None):
+    del ttl_hash
+    return to_data_frame(get_json_data(data_url))
+
+
+def fetch_game_data():
+    """
+    Reads the odds of every sportsbook from the odds cache and scores today's games against all books' lines in
+    a single batch.
+    """
+    provider = SbrOddsProvider(cache=odds_cache)
+    odds = provider.get_all_odds(sportsbooks)
+    games = create_todays_games_from_odds(provider.get_odds())
+    if len(games) == 0:
+        return {sportsbook: {} for sportsbook in sportsbooks}
+
+    team_stats = fetch_team_stats(ttl_hash=get_ttl_hash())
+    data, _, _, _, _ = createTodaysGames(games, team_stats, provider.get_odds())
+    rows = {tuple(game): i for i, game in enumerate(odds['games'])}
+    selected = [rows[tuple(game)] for game in games]
+    odds = dict(odds, games=games, **{key: odds[key][selected] for key in ('home_ml', 'away_ml', 'total')})
+
+    results = XGBoost_Runner.predict_books(data, odds)
+    return {sportsbook: to_game_records(results[:, i]) for i, sportsbook in enumerate(sportsbooks)}
+
+
 def get_ttl_hash(seconds=600):
     """Return the same value withing `seconds` time period"""
     return round(time.time() / seconds)
@@ -60,12 +74,11 @@ def get_ttl_hash(seconds=600):
 
 app = Flask(__name__)
 app.jinja_env.add_extension('jinja2.ext.loopcontrols')
+Model_Registry.preload('xgboost')
 
 
 @app.route("/")
 def index():
-    fanduel = fetch_fanduel(ttl_hash=get_ttl_hash())
-    draftkings = fetch_draftkings(ttl_hash=get_ttl_hash())
-    betmgm = fetch_betmgm(ttl_hash=get_ttl_hash())
+    data = fetch_game_data()
 
-    return render_template('index.html', today=date.today(), data={"fanduel": fanduel, "draftkings": draftkings, "betmgm": betmgm})
\ No newline at end of file
+    return render_template('index.html', today=date.today(), data=data)
@@ -0,0 +1,61 @@
+import sqlite3
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.Predict import Backtest
+from src.Utils import Feature_Store, Games_Dataset
+
+
+class TestBacktest(unittest.TestCase):
+
+    def test_simulate(self):
+        result = Backtest.simulate(np.array([0.6, 0.3, 0.5]), np.array([1, 1, 0]), np.array([110, -200, np.nan]),
+                                   np.array([-130, 150, np.nan]), np.array(['2023-11-01', '2023-11-01', '2023-11-02']))
+        np.testing.assert_array_equal(result['bet'], [True, True, False])
+        np.testing.assert_allclose(result['returns'], [1.1, -1, 0])
+        np.testing.assert_allclose(result['stake'], [0.2364, 0.5, 0])
+        np.testing.assert_allclose(result['flat_equity'], [1.1, 0.1, 0.1])
+        np.testing.assert_allclose(result['kelly_equity'], [1 + 0.2364 * 1.1 - 0.5] * 2)
+        self.assertAlmostEqual(Backtest.max_drawdown(result['flat_equity']), 1.0)
+        self.assertAlmostEqual(Backtest.max_drawdown(result['kelly_equity'], start=1.0, relative=True), 0.23996)
+
+    def test_calibration(self):
+        table, brier = Backtest.calibration(np.array([0.15, 0.12, 0.75, 0.72]), np.array([0, 1, 1, 1]))
+        self.assertEqual(table['bin'].tolist(), ['0.1-0.2', '0.7-0.8'])
+        np.testing.assert_allclose(table['predicted'], [0.135, 0.735])
+        np.testing.assert_allclose(table['observed'], [0.5, 1])
+        self.assertAlmostEqual(brier, (0.15 ** 2 + 0.88 ** 2 + 0.25 ** 2 + 0.28 ** 2) / 4)
+
+    def test_align_odds(self):
+        def games(dates, ou):
+            return pd.DataFrame({'TEAM_NAME': 'A', 'PTS': 100.0, 'Date': dates, 'TEAM_NAME.1': 'B', 'Date.1': dates,
+                                 'Score': 200.0, 'Home-Team-Win': 1.0, 'OU': ou, 'OU-Cover': 1.0})
+
+        def keys(dates, homes):
+            return pd.DataFrame({'season': '2023-24', 'Date': dates, 'Home': homes, 'Away': 'B'})
+
+        odds = pd.DataFrame({'Date': ['2023-11-01', '2023-11-01', '2023-11-01', '2023-11-02', '2023-11-03'],
+                             'Home': ['A', 'C', 'D', 'E', 'F'], 'Away': 'B', 'OU': [220.5, 221, 219, 230, 219],
+                             'ML_Home': [-150, 120, -110, 100, None], 'ML_Away': [130, -140, -105, -120, 105]})
+        with tempfile.TemporaryDirectory() as directory:
+            con = sqlite3.connect(':memory:')
+            dates = ['2023-11-01', '2023-11-01', '2023-11-03']
+            Games_Dataset.write_games(con, 'games', games(dates, [220.5, 221, 219]), keys(dates, ['A', 'C', 'F']),
+                                      replace=True)
+            # D's odds arrived after 2023-11-03 was built, so its row comes last with the same OU as F
+            Games_Dataset.write_games(con, 'games', games(['2023-11-01'], [219]), keys(['2023-11-01'], ['D']))
+            features = Feature_Store.load(con, 'games', directory)
+            odds_con = sqlite3.connect(':memory:')
+            odds.to_sql('odds_2023-24_new', odds_con)
+
+            home_odds, away_odds = Backtest.align_odds(con, odds_con, features)
+            np.testing.assert_array_equal(home_odds, [-150, 120, np.nan, -110])
+            np.testing.assert_array_equal(away_odds, [130, -140, 105, -105])
+            con.close()
+            odds_con.close()
+
+if __name__ == '__main__':
+    unittest.main()
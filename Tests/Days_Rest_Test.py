@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+import numpy as np
+
+from src.Utils import Days_Rest
+from src.Utils.tools import get_date
+
+schedule_csv = """Match Number,Round Number,Date,Location,Home Team,Away Team,Result
+1,1,24/10/2023 23:30,Ball Arena,Denver Nuggets,Los Angeles Lakers,
+2,1,25/10/2023 02:00,Chase Center,Golden State Warriors,Phoenix Suns,
+3,1,27/10/2023 02:00,Crypto.com Arena,Los Angeles Lakers,Phoenix Suns,
+4,1,29/10/2023 23:00,Ball Arena,Denver Nuggets,Golden State Warriors,
+"""
+
+
+def legacy_rest_between_games(games):
+    """ The row by row loop Add_Days_Rest.py used to run over each season. """
+    teams_last_played = {}
+    rested = []
+    for date_string, home, away in games:
+        rest = []
+        for team in (home, away):
+            current_date = get_date(date_string)
+            if team not in teams_last_played:
+                rest.append(10)
+            else:
+                days = (current_date - teams_last_played[team]).days
+                rest.append(days if 0 < days < 9 else 9)
+            teams_last_played[team] = current_date
+        rested.append(rest)
+    return rested
+
+
+class TestDaysRest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'schedule.csv')
+        with open(self.path, 'w') as schedule_file:
+            schedule_file.write(schedule_csv)
+
+    def tearDown(self):
+        Days_Rest.loaded_schedules.clear()
+        self.directory.cleanup()
+
+    def test_days_rest(self):
+        schedule = Days_Rest.load_schedule(self.path)
+        result = schedule.days_rest(['Los Angeles Lakers', 'Phoenix Suns', 'Denver Nuggets', 'Boston Celtics'],
+                                    datetime(2023, 10, 28, 12, 0))
+        self.assertEqual(result.tolist(), [2, 2, 4, 7])
+
+    def test_days_rest_before_first_game(self):
+        schedule = Days_Rest.load_schedule(self.path)
+        result = schedule.days_rest(['Denver Nuggets'], datetime(2023, 10, 24, 23, 29))
+        self.assertEqual(result.tolist(), [7])
+
+    def test_days_rest_from_disk_cache(self):
+        Days_Rest.load_schedule(self.path)
+        Days_Rest.loaded_schedules.clear()
+        self.assertTrue(os.path.exists(self.path + '.npz'))
+        schedule = Days_Rest.load_schedule(self.path)
+        result = schedule.days_rest(['Denver Nuggets', 'Phoenix Suns'], datetime(2023, 10, 31, 0, 0))
+        self.assertEqual(result.tolist(), [2, 4])
+
+    def test_rest_between_games_matches_row_loop(self):
+        rng = np.random.default_rng(0)
+        teams = ['Boston Celtics', 'Miami Heat', 'Utah Jazz', 'LA Clippers', 'Denver Nuggets']
+        seasons = []
+        for season in ('2021-22', '2022-23'):
+            # dates across new year, out of order in places and with same day repeats
+            days = np.sort(rng.integers(0, 140, 80))
+            days[rng.integers(0, 80, 6)] = rng.integers(0, 140, 6)
+            dates = np.datetime64(f'20{season[2:4]}-10-15') + days
+            games = []
+            for date in dates.astype(datetime):
+                home, away = rng.choice(teams, 2, replace=False)
+                games.append((f"{season}-{date.month:02d}{date.day:02d}", home, away))
+            seasons.append(games)
+
+        games = [game for season in seasons for game in season]
+        home_rest, away_rest = Days_Rest.rest_between_games(
+            [get_date(date) for date, _, _ in games], [game[1] for game in games], [game[2] for game in games],
+            groups=np.repeat([0, 1], 80))
+        expected = [rest for season in seasons for rest in legacy_rest_between_games(season)]
+        self.assertEqual(np.column_stack([home_rest, away_rest]).tolist(), expected)
@@ -1,3 +1,4 @@
+import numpy as np
 import unittest
 from src.Utils import Expected_Value
 
@@ -35,3 +36,13 @@ class TestExpectedValue(unittest.TestCase):
     def test_expected_value_8(self):
         result = Expected_Value.expected_value(.638, 275)
         self.assertEqual(result, 139.25)
+
+    def test_expected_value_array(self):
+        result = Expected_Value.expected_value_array([.76, .3, .6, .2, .8137, .2175, .5298, .638],
+                                                     [-200, -500, 250, -200, -200, -550, 1000, 275])
+        self.assertEqual(result.tolist(), [14, -64, 110, -70, 22.05, -74.30, 482.78, 139.25])
+
+    def test_expected_value_array_missing_odds(self):
+        result = Expected_Value.expected_value_array([.6, .6], [float('nan'), 150])
+        self.assertTrue(np.isnan(result[0]))
+        self.assertEqual(result[1], 50)
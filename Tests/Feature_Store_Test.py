@@ -0,0 +1,98 @@
+import sqlite3
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.Utils import Feature_Store, Games_Dataset
+
+
+def make_dataset(dates):
+    rng = np.random.default_rng(3)
+    count = len(dates)
+    return pd.DataFrame({
+        'TEAM_NAME': 'Boston Celtics',
+        'W_PCT': rng.random(count),
+        'PTS': rng.normal(110, 8, count),
+        'Date': dates,
+        'TEAM_NAME.1': 'Miami Heat',
+        'W_PCT.1': rng.random(count),
+        'PTS.1': rng.normal(110, 8, count),
+        'Date.1': dates,
+        'Score': rng.integers(190, 250, count).astype(float),
+        'Home-Team-Win': rng.integers(0, 2, count).astype(float),
+        'OU': rng.choice([210.5, 220.0, 225.5], count),
+        'OU-Cover': rng.integers(0, 3, count).astype(float),
+        'Days-Rest-Home': rng.integers(1, 10, count).astype(float),
+        'Days-Rest-Away': rng.integers(1, 10, count).astype(float),
+    })
+
+
+class TestFeatureStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.con = sqlite3.connect(':memory:')
+        # a 2013-14 game sits between 2012-13 rows in the table, the export groups rows by season
+        self.data = make_dataset(['2013-01-02', '2013-11-01', '2012-11-01', '2013-04-10', '2013-12-25'])
+        self.data.to_sql('games', self.con)
+
+    def tearDown(self):
+        self.con.close()
+        self.directory.cleanup()
+
+    def test_export(self):
+        features = Feature_Store.load(self.con, 'games', self.directory.name)
+        self.assertEqual(features.seasons, {'2012-13': (0, 3), '2013-14': (3, 5)})
+        self.assertEqual(features.columns, ['W_PCT', 'PTS', 'W_PCT.1', 'PTS.1', 'Days-Rest-Home',
+                                            'Days-Rest-Away', 'OU'])
+        self.assertEqual(features.features.dtype, np.float32)
+        self.assertIsInstance(features.features, np.memmap)
+
+        expected = self.data.iloc[[0, 2, 3, 1, 4]]
+        np.testing.assert_array_equal(features.dates, expected['Date'].values)
+        np.testing.assert_array_equal(features.index, [0, 2, 3, 1, 4])
+        np.testing.assert_array_equal(features.ml_features(), expected[features.columns[:-1]].values.astype(np.float32))
+        np.testing.assert_array_equal(features.labels['OU-Cover'], expected['OU-Cover'].values)
+        self.assertEqual(features.labels['Home-Team-Win'].dtype, np.int8)
+
+        rows = features.season_rows('2013-14')
+        self.assertTrue(np.shares_memory(features.ou_features(rows), features.features))
+        np.testing.assert_array_equal(features.dates[rows], ['2013-11-01', '2013-12-25'])
+
+    def test_reexport_when_table_changes(self):
+        first = Feature_Store.load(self.con, 'games', self.directory.name)
+        self.assertEqual(len(first), 5)
+        self.assertEqual(Feature_Store.load(self.con, 'games', self.directory.name).metadata, first.metadata)
+
+        make_dataset(['2014-01-05']).set_axis([5]).to_sql('games', self.con, if_exists='append')
+        second = Feature_Store.load(self.con, 'games', self.directory.name)
+        self.assertEqual(len(second), 6)
+        self.assertEqual(second.seasons['2013-14'], (3, 6))
+
+    def test_reexport_when_table_is_rewritten(self):
+        built = pd.DataFrame({'season': Feature_Store.season_of(self.data['Date']), 'Date': self.data['Date'],
+                              'Home': 'Boston Celtics', 'Away': 'Miami Heat'})
+        Games_Dataset.write_games(self.con, 'games', self.data, built, replace=True)
+        first = Feature_Store.load(self.con, 'games', self.directory.name)
+
+        # same rows and index, new values
+        rewritten = self.data.copy()
+        rewritten['PTS'] += 1.0
+        Games_Dataset.write_games(self.con, 'games', rewritten, built, replace=True)
+        second = Feature_Store.load(self.con, 'games', self.directory.name)
+        self.assertNotEqual(second.metadata['source_version'], first.metadata['source_version'])
+        np.testing.assert_array_equal(second.ml_features()[:, 1], rewritten['PTS'].values[[0, 2, 3, 1, 4]]
+                                      .astype(np.float32))
+
+    def test_reexport_when_columns_change(self):
+        first = Feature_Store.load(self.con, 'games', self.directory.name)
+        self.data.rename(columns={'W_PCT': 'FG_PCT'}).to_sql('games', self.con, if_exists='replace')
+        second = Feature_Store.load(self.con, 'games', self.directory.name)
+        self.assertEqual(first.columns[0], 'W_PCT')
+        self.assertEqual(second.columns[0], 'FG_PCT')
+
+
+if __name__ == '__main__':
+    unittest.main()
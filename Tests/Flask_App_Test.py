@@ -0,0 +1,93 @@
+import importlib.util
+import os
+import sys
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from src.DataProviders import OddsCache, SbrOddsProvider
+from src.Predict import Model_Registry
+
+app_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'Flask', 'app.py'))
+spec = importlib.util.spec_from_file_location('flask_app', app_path)
+app = importlib.util.module_from_spec(spec)
+# Flask finds the templates folder through the module's file
+sys.modules['flask_app'] = app
+# the app loads its models and opens the odds cache file at import, neither is needed with stubs
+with mock.patch.object(Model_Registry, 'preload'), mock.patch.object(OddsCache, 'OddsCache'):
+    spec.loader.exec_module(app)
+
+
+class FakeScoreboard:
+    def __init__(self, sport):
+        self.games = [
+            {'home_team': 'Boston Celtics', 'away_team': 'Miami Heat',
+             'home_ml': {'fanduel': -150, 'draftkings': -145}, 'away_ml': {'fanduel': 130},
+             'total': {'fanduel': 220.5, 'draftkings': 221}},
+            {'home_team': 'Utah Jazz', 'away_team': 'Los Angeles Clippers',
+             'home_ml': {'fanduel': 180}, 'away_ml': {'fanduel': -210}, 'total': {'fanduel': 230}},
+        ]
+
+
+class FakeModel:
+    def __init__(self, classes):
+        self.classes = classes
+
+    def inplace_predict(self, features):
+        proba = np.full((len(features), self.classes), 0.1, dtype=np.float32)
+        proba[:, -1] = 1 - 0.1 * (self.classes - 1)
+        return proba
+
+
+def create_todays_games(games, team_stats, odds):
+    return np.ones((len(games), 4), dtype=np.float32), None, None, None, None
+
+
+class TestFlaskApp(unittest.TestCase):
+
+    def setUp(self):
+        models = {'ML': FakeModel(2), 'OU': FakeModel(3)}
+        self.patches = [
+            mock.patch.object(SbrOddsProvider, 'Scoreboard', FakeScoreboard),
+            mock.patch.object(app, 'SbrOddsProvider', lambda cache: SbrOddsProvider.SbrOddsProvider()),
+            mock.patch.object(app, 'fetch_team_stats', lambda ttl_hash=None: None),
+            mock.patch.object(app, 'createTodaysGames', create_todays_games),
+            mock.patch.object(app.XGBoost_Runner.Model_Registry, 'get_model', lambda family, kind: models[kind]),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in reversed(self.patches):
+            patch.stop()
+
+    def test_fetch_game_data(self):
+        data = app.fetch_game_data()
+        self.assertEqual(list(data), ['fanduel', 'draftkings', 'betmgm'])
+        self.assertEqual(list(data['fanduel']), ['Miami Heat:Boston Celtics', 'LA Clippers:Utah Jazz'])
+        # books without a total for a game leave it out
+        self.assertEqual(list(data['draftkings']), ['Miami Heat:Boston Celtics'])
+        self.assertEqual(data['betmgm'], {})
+
+        game = data['fanduel']['Miami Heat:Boston Celtics']
+        self.assertEqual((game['home_team_odds'], game['away_team_odds'], game['ou_value']), (-150, 130, '220.5'))
+        self.assertEqual((game['winner'], game['home_confidence'], game['away_confidence']),
+                         ('Boston Celtics', 90.0, ''))
+        self.assertIsInstance(game['home_team_ev'], float)
+
+        # a missing line shows blank cells, not None
+        game = data['draftkings']['Miami Heat:Boston Celtics']
+        self.assertEqual((game['home_team_odds'], game['away_team_odds'], game['ou_value']), (-145, '', '221'))
+        self.assertEqual((game['home_team_ev'], game['away_team_ev'], game['home_team_kelly']), ('', '', ''))
+
+    def test_index_has_no_none_cells(self):
+        page = app.app.test_client().get('/')
+        self.assertEqual(page.status_code, 200)
+        html = page.data.decode()
+        self.assertIn('Miami Heat', html)
+        self.assertNotIn('None', html)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,207 @@
+import sqlite3
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.Utils import Games_Dataset, Team_Stats_Store
+from src.Utils.Dictionaries import team_index_14, team_index_current
+
+seasons = {
+    '2015-16': (team_index_14, ['2015-11-02', '2015-11-03', '2015-11-04']),
+    '2023-24': (team_index_current, ['2023-11-01', '2023-11-02']),
+}
+
+
+def legacy_create_games(teams_con, odds_con, seasons):
+    """ The per-game loop Create_Games used before the join based builder. """
+    scores, win_margin, OU, OU_Cover, games, days_rest_away, days_rest_home = [], [], [], [], [], [], []
+    for season in seasons:
+        odds_df = pd.read_sql_query(f"select * from \"odds_{season}_new\"", odds_con, index_col="index")
+        for row in odds_df.itertuples():
+            date = row[1]
+            team_df = pd.read_sql_query(f"select * from \"{date}\"", teams_con, index_col="index")
+            if len(team_df.index) == 30:
+                scores.append(row[8])
+                OU.append(row[4])
+                days_rest_home.append(row[10])
+                days_rest_away.append(row[11])
+                win_margin.append(1 if row[9] > 0 else 0)
+                if row[8] < row[4]:
+                    OU_Cover.append(0)
+                elif row[8] > row[4]:
+                    OU_Cover.append(1)
+                elif row[8] == row[4]:
+                    OU_Cover.append(2)
+                team_index = team_index_current if season == '2023-24' else team_index_14
+                home_team_series = team_df.iloc[team_index.get(row[2])]
+                away_team_series = team_df.iloc[team_index.get(row[3])]
+                games.append(pd.concat([home_team_series, away_team_series.rename(
+                    index={col: f"{col}.1" for col in team_df.columns.values}
+                )]))
+    season = pd.concat(games, ignore_index=True, axis=1).T
+    frame = season.drop(columns=['TEAM_ID', 'TEAM_ID.1'])
+    frame['Score'] = np.asarray(scores)
+    frame['Home-Team-Win'] = np.asarray(win_margin)
+    frame['OU'] = np.asarray(OU)
+    frame['OU-Cover'] = np.asarray(OU_Cover)
+    frame['Days-Rest-Home'] = np.asarray(days_rest_home)
+    frame['Days-Rest-Away'] = np.asarray(days_rest_away)
+    for field in frame.columns.values:
+        if 'TEAM_' in field or 'Date' in field or field not in frame:
+            continue
+        frame[field] = frame[field].astype(float)
+    return frame
+
+
+class TestGamesDataset(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.teams_con = sqlite3.connect(':memory:')
+        self.odds_con = sqlite3.connect(':memory:')
+        for season, (team_index, dates) in seasons.items():
+            names = {}
+            for name, position in team_index.items():
+                names.setdefault(position, name)
+            for day, date in enumerate(dates):
+                # the last date of a season is missing a team and must be skipped
+                count = 29 if day == len(dates) - 1 else 30
+                pd.DataFrame({
+                    'TEAM_ID': np.arange(1610612737, 1610612737 + count),
+                    'TEAM_NAME': [names[position] for position in range(count)],
+                    'GP': rng.integers(1, 82, count),
+                    'W_PCT': rng.random(count).round(3),
+                    'PTS': rng.normal(110, 8, count).round(1),
+                    'Date': date,
+                }).to_sql(date, self.teams_con, if_exists='replace')
+
+            home, away = [], []
+            for date in dates:
+                teams = rng.permutation(sorted(team_index))[:12]
+                home += [(date, team) for team in teams[:6]]
+                away += list(teams[6:])
+            ou = rng.choice([210.5, 220.0, 225.5], len(home))
+            points = rng.choice([205, 220, 230], len(home))
+            pd.DataFrame({
+                'Date': [date for date, _ in home],
+                'Home': [team for _, team in home],
+                'Away': away,
+                'OU': ou,
+                'Spread': rng.normal(0, 5, len(home)).round(1),
+                'ML_Home': rng.integers(-300, 300, len(home)),
+                'ML_Away': rng.integers(-300, 300, len(home)),
+                'Points': points,
+                'Win_Margin': rng.integers(-20, 20, len(home)),
+                'Days_Rest_Home': rng.integers(1, 10, len(home)),
+                'Days_Rest_Away': rng.integers(1, 10, len(home)),
+            }).to_sql(f"odds_{season}_new", self.odds_con, if_exists='replace')
+
+    def tearDown(self):
+        self.teams_con.close()
+        self.odds_con.close()
+
+    def test_matches_legacy_builder(self):
+        expected = legacy_create_games(self.teams_con, self.odds_con, seasons)
+
+        Team_Stats_Store.migrate_per_date_tables(self.teams_con)
+        games = []
+        for season in seasons:
+            odds_df = pd.read_sql_query(f"select * from \"odds_{season}_new\"", self.odds_con, index_col="index")
+            team_stats = Team_Stats_Store.read_snapshots(self.teams_con, odds_df['Date'].min(),
+                                                         odds_df['Date'].max())
+            games.append(Games_Dataset.build_season_games(season, odds_df, team_stats))
+        frame = Games_Dataset.fix_types(pd.concat(games, ignore_index=True))
+
+        self.assertEqual(len(frame.index), 18)
+        pd.testing.assert_frame_equal(frame, expected)
+        self.assertEqual(frame.select_dtypes(exclude='float').columns.tolist(),
+                         ['TEAM_NAME', 'Date', 'TEAM_NAME.1', 'Date.1'])
+
+    def build_and_write(self, con, odds_df, replace=False):
+        built = Games_Dataset.read_built_games(con, 'games')
+        frame, keys = Games_Dataset.build_new_games('2015-16', odds_df, built, self.teams_con)
+        if len(frame.index) > 0:
+            Games_Dataset.write_games(con, 'games', Games_Dataset.fix_types(frame), keys, replace=replace)
+        return len(frame.index)
+
+    def test_append_matches_rebuild(self):
+        Team_Stats_Store.migrate_per_date_tables(self.teams_con)
+        odds_df = pd.read_sql_query('select * from "odds_2015-16_new"', self.odds_con, index_col="index")
+
+        con = sqlite3.connect(':memory:')
+        self.assertEqual(self.build_and_write(con, odds_df[odds_df['Date'] == '2015-11-02'], replace=True), 6)
+        self.assertEqual(self.build_and_write(con, odds_df), 6)
+        # nothing left to build, the 2015-11-04 snapshot is incomplete
+        self.assertEqual(self.build_and_write(con, odds_df), 0)
+        appended = pd.read_sql_query('select * from "games"', con)
+        self.assertEqual(len(Games_Dataset.read_built_games(con, 'games').index), 12)
+
+        rebuilt = sqlite3.connect(':memory:')
+        self.build_and_write(rebuilt, odds_df, replace=True)
+        pd.testing.assert_frame_equal(appended, pd.read_sql_query('select * from "games"', rebuilt))
+        rebuilt.close()
+
+        frame = pd.read_sql_query('select * from "games"', con, index_col='index')
+        with self.assertRaises(ValueError):
+            Games_Dataset.write_games(con, 'games', frame.drop(columns=['OU']), Games_Dataset.read_built_games(
+                con, 'games'))
+        con.close()
+
+    def test_late_rows_and_completed_snapshots_are_built(self):
+        Team_Stats_Store.migrate_per_date_tables(self.teams_con)
+        odds_df = pd.read_sql_query('select * from "odds_2015-16_new"', self.odds_con, index_col="index")
+        con = sqlite3.connect(':memory:')
+        late = (odds_df['Date'] == '2015-11-02') & (odds_df.index % 6 == 5)
+        self.assertEqual(self.build_and_write(con, odds_df[~late], replace=True), 11)
+
+        # a row for a date already built arrives, and the missing team of 2015-11-04 is filled in
+        snapshot = Team_Stats_Store.read_snapshots(self.teams_con, '2015-11-04', '2015-11-04')
+        missing = sorted(set(team_index_14) - set(snapshot['TEAM_NAME']))
+        filled = snapshot.iloc[-1:].assign(TEAM_NAME=missing[0], TEAM_ID=1610612767, index=29)
+        Team_Stats_Store.write_snapshot(self.teams_con, '2015-11-04',
+                                        pd.concat([snapshot, filled]).drop(columns='Date'))
+        self.assertEqual(self.build_and_write(con, odds_df), 7)
+        games = pd.read_sql_query('select * from "games"', con)
+        self.assertEqual(sorted(games['Date'].value_counts().to_dict().items()),
+                         [('2015-11-02', 6), ('2015-11-03', 6), ('2015-11-04', 6)])
+        # the late row is appended after 2015-11-03, its record points at the row it became
+        recorded = Games_Dataset.read_built_games(con, 'games').merge(games, on='index')
+        self.assertEqual(len(recorded.index), 18)
+        self.assertEqual(recorded['Date_x'].tolist(), recorded['Date_y'].tolist())
+        self.assertEqual(recorded['Home'].tolist(), recorded['TEAM_NAME'].tolist())
+        self.assertEqual(recorded['Away'].tolist(), recorded['TEAM_NAME.1'].tolist())
+        con.close()
+
+    def test_no_snapshots_builds_nothing(self):
+        odds_df = pd.read_sql_query('select * from "odds_2023-24_new"', self.odds_con, index_col="index")
+        self.assertEqual(len(Games_Dataset.build_season_games('2023-24', odds_df, pd.DataFrame()).index), 0)
+        # the store returns an empty frame before any snapshot was written
+        con = sqlite3.connect(':memory:')
+        frame, keys = Games_Dataset.build_new_games('2023-24', odds_df, Games_Dataset.read_built_games(con, 'games'),
+                                                    con)
+        self.assertEqual((len(frame.index), len(keys.index)), (0, 0))
+        con.close()
+
+    def test_duplicate_snapshot_positions(self):
+        odds_df = pd.read_sql_query('select * from "odds_2023-24_new"', self.odds_con, index_col="index")
+        Team_Stats_Store.migrate_per_date_tables(self.teams_con)
+        team_stats = Team_Stats_Store.read_snapshots(self.teams_con, '2023-11-01', '2023-11-02')
+        # two rows at position 3 on a date that still counts 30 rows
+        first_day = team_stats[team_stats['Date'] == '2023-11-01']
+        team_stats = team_stats.drop(first_day.index[4])
+        team_stats = pd.concat([team_stats, first_day.iloc[[3]]], ignore_index=True)
+        with self.assertRaises(ValueError):
+            Games_Dataset.build_season_games('2023-24', odds_df, team_stats)
+
+    def test_unknown_team(self):
+        odds_df = pd.read_sql_query('select * from "odds_2023-24_new"', self.odds_con, index_col="index")
+        odds_df.loc[0, 'Home'] = 'Seattle SuperSonics'
+        Team_Stats_Store.migrate_per_date_tables(self.teams_con)
+        team_stats = Team_Stats_Store.read_snapshots(self.teams_con, '2023-11-01', '2023-11-02')
+        with self.assertRaises(KeyError):
+            Games_Dataset.build_season_games('2023-24', odds_df, team_stats)
+
+
+if __name__ == '__main__':
+    unittest.main()
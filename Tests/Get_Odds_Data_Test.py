@@ -0,0 +1,119 @@
+import importlib.util
+import multiprocessing
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+
+import pandas as pd
+
+from src.Utils import Sqlite_Storage
+
+script_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src', 'Process-Data', 'Get_Odds_Data.py'))
+spec = importlib.util.spec_from_file_location('Get_Odds_Data', script_path)
+Get_Odds_Data = importlib.util.module_from_spec(spec)
+# pool workers unpickle fetch_day by module name
+sys.modules['Get_Odds_Data'] = Get_Odds_Data
+spec.loader.exec_module(Get_Odds_Data)
+
+seasons = {
+    '2023-24': {'start_date': '2023-10-24', 'end_date': '2023-10-27'},
+    '2024-25': {'start_date': '2024-10-22', 'end_date': '2024-10-24'},
+}
+
+
+def game(home, away, odds=True):
+    def line(value):
+        return {'fanduel': value} if odds else {}
+    return {'home_team': home, 'away_team': away, 'total': line(220.5), 'away_spread': line(3.5),
+            'home_ml': line(-150), 'away_ml': line(130), 'home_score': 110, 'away_score': 100}
+
+
+scoreboards = {
+    date(2023, 10, 24): [game('Boston Celtics', 'Miami Heat'), game('Utah Jazz', 'LA Clippers')],
+    date(2023, 10, 26): [game('Boston Celtics', 'Utah Jazz')],
+    date(2023, 10, 27): [game('Miami Heat', 'Boston Celtics', odds=False), game('LA Clippers', 'Miami Heat')],
+    date(2024, 10, 22): [game('Boston Celtics', 'Miami Heat')],
+    date(2024, 10, 24): [game('Boston Celtics', 'LA Clippers')],
+}
+
+
+class FakeScoreboard:
+
+    def __init__(self, date):
+        if date in scoreboards:
+            self.games = scoreboards[date]
+
+
+class TestGetOddsData(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.patches = [
+            mock.patch.object(Get_Odds_Data, 'Scoreboard', FakeScoreboard),
+            mock.patch.object(Get_Odds_Data.random, 'randint', return_value=0),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in reversed(self.patches):
+            patch.stop()
+        self.directory.cleanup()
+
+    def scrape(self, name, workers=1, chunk_size=2, config=seasons):
+        con = Sqlite_Storage.connect(os.path.join(self.directory.name, name))
+        work = Get_Odds_Data.season_dates(config)
+        if workers > 1:
+            with multiprocessing.get_context('fork').Pool(workers) as pool:
+                Get_Odds_Data.write_seasons(con, Get_Odds_Data.odds_rows(pool.imap(Get_Odds_Data.fetch_day, work)),
+                                            chunk_size)
+        else:
+            Get_Odds_Data.write_seasons(con, Get_Odds_Data.odds_rows(map(Get_Odds_Data.fetch_day, work)), chunk_size)
+        return con
+
+    def read(self, con, season):
+        return pd.read_sql(f'select * from "{season}"', con, index_col='index')
+
+    def test_days_of_rest_reset_per_season(self):
+        con = self.scrape('odds.sqlite')
+        first = self.read(con, '2023-24')
+        second = self.read(con, '2024-25')
+        con.close()
+        self.assertEqual(first[['Home', 'Away']].values.tolist(),
+                         [['Boston Celtics', 'Miami Heat'], ['Utah Jazz', 'LA Clippers'],
+                          ['Boston Celtics', 'Utah Jazz'], ['LA Clippers', 'Miami Heat']])
+        # Miami's game without odds on the 27th still counts as played
+        self.assertEqual(first['Days_Rest_Home'].tolist(), [7, 7, 2, 3])
+        self.assertEqual(first['Days_Rest_Away'].tolist(), [7, 7, 2, 0])
+        self.assertEqual(second['Days_Rest_Home'].tolist(), [7, 2])
+        self.assertEqual(second['Days_Rest_Away'].tolist(), [7, 7])
+
+    def test_chunks_continue_the_index(self):
+        for chunk_size in (1, 3, 500):
+            con = self.scrape(f'odds-{chunk_size}.sqlite', chunk_size=chunk_size)
+            self.assertEqual(self.read(con, '2023-24').index.tolist(), [0, 1, 2, 3])
+            self.assertEqual(self.read(con, '2024-25').index.tolist(), [0, 1])
+            con.close()
+
+    def test_pooled_run_matches_serial_run(self):
+        serial = self.scrape('serial.sqlite')
+        pooled = self.scrape('pooled.sqlite', workers=2)
+        for season in seasons:
+            pd.testing.assert_frame_equal(self.read(pooled, season), self.read(serial, season))
+        serial.close()
+        pooled.close()
+
+    def test_season_without_games_keeps_its_table(self):
+        con = self.scrape('odds.sqlite')
+        before = self.read(con, '2024-25')
+        con.close()
+        con = self.scrape('odds.sqlite', config={'2024-25': {'start_date': '2024-11-01', 'end_date': '2024-11-02'}})
+        pd.testing.assert_frame_equal(self.read(con, '2024-25'), before)
+        con.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from src.Utils.Http_Cache import HttpCache
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+    body = {'resultSets': [{'headers': ['TEAM_ID'], 'rowSet': [[1]]}]}
+
+    def do_GET(self):
+        StubHandler.requests_seen.append(self.headers.get('If-None-Match'))
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('ETag', '"v1"')
+        self.end_headers()
+        self.wfile.write(json.dumps(StubHandler.body).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+class TestHttpCache(unittest.TestCase):
+
+    def setUp(self):
+        StubHandler.requests_seen = []
+        StubHandler.body = {'resultSets': [{'headers': ['TEAM_ID'], 'rowSet': [[1]]}]}
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/stats"
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = HttpCache(os.path.join(self.directory.name, 'http.sqlite'))
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.directory.cleanup()
+
+    def test_fresh_response_is_served_from_disk(self):
+        self.assertEqual(self.cache.get_json(self.url, ttl=60), StubHandler.body)
+        self.assertEqual(HttpCache(self.cache.path).get_json(self.url, ttl=60), StubHandler.body)
+        self.assertEqual(StubHandler.requests_seen, [None])
+
+    def test_stale_response_is_revalidated(self):
+        expected = StubHandler.body
+        self.cache.get_json(self.url, ttl=60)
+        StubHandler.body = {'resultSets': []}
+        self.assertEqual(self.cache.get_json(self.url, ttl=0), expected)
+        self.assertEqual(StubHandler.requests_seen, [None, '"v1"'])
+
+    def test_unreachable_server_falls_back_to_cache(self):
+        self.cache.get_json(self.url, ttl=60)
+        self.server.shutdown()
+        self.server.server_close()
+        # a session without retries, so the test does not sit through the backoff
+        cache = HttpCache(self.cache.path, session=requests.Session())
+        self.assertEqual(cache.get_json(self.url, ttl=0, timeout=1), StubHandler.body)
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def test_invalid_response_is_not_cached(self):
+        StubHandler.body = {'message': 'rate limited'}
+        self.cache.get_json(self.url, ttl=60, validate=lambda data: 'resultSets' in data)
+        self.cache.get_json(self.url, ttl=60, validate=lambda data: 'resultSets' in data)
+        self.assertEqual(StubHandler.requests_seen, [None, None])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -23,3 +23,11 @@ class TestKellyCriterion(unittest.TestCase):
     def test_calculate_kelly_criterion_5(self):
         result = kc.calculate_kelly_criterion(100, .99)
         self.assertEqual(result, 98)
+
+    def test_calculate_kelly_criterion_array(self):
+        result = kc.calculate_kelly_criterion_array([-110, -110, 400, -500, 100], [.6, .4, .35, .85, .99])
+        self.assertEqual(result.tolist(), [16.04, 0, 18.75, 10, 98])
+
+    def test_calculate_kelly_criterion_array_broadcast(self):
+        result = kc.calculate_kelly_criterion_array([[-110], [400]], [.6, .35])
+        self.assertEqual(result.tolist(), [[16.04, 0], [50, 18.75]])
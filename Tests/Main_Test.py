@@ -0,0 +1,65 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import unittest
+from unittest import mock
+
+import main
+
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+team_stats = [{'headers': ['TEAM_ID', 'TEAM_NAME'], 'rowSet': [[1, 'Boston Celtics']]}]
+
+hanging_run = """
+import asyncio, time
+import main
+main.source_timeouts['odds'] = 0.5
+main.get_json_data = lambda url: {team_stats!r}
+try:
+    asyncio.run(main.fetch_inputs(lambda: time.sleep(30)))
+except asyncio.TimeoutError:
+    pass
+""".format(team_stats=team_stats)
+
+
+class TestFetchInputs(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(main, 'get_json_data', lambda url: team_stats)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_sources_are_fetched_concurrently(self):
+        def load_odds():
+            time.sleep(0.5)
+            return {'Boston Celtics:Miami Heat': {}}
+
+        def slow_team_stats(url):
+            time.sleep(0.5)
+            return team_stats
+
+        start = time.perf_counter()
+        with mock.patch.object(main, 'get_json_data', slow_team_stats):
+            odds, games, df = asyncio.run(main.fetch_inputs(load_odds))
+        self.assertLess(time.perf_counter() - start, 0.9)
+        self.assertEqual(games, [['Boston Celtics', 'Miami Heat']])
+        self.assertEqual(df['TEAM_NAME'].tolist(), ['Boston Celtics'])
+
+    def test_hanging_source_times_out(self):
+        start = time.perf_counter()
+        with mock.patch.dict(main.source_timeouts, {'odds': 0.5}):
+            with self.assertRaises(asyncio.TimeoutError):
+                asyncio.run(main.fetch_inputs(lambda: time.sleep(5)))
+        self.assertLess(time.perf_counter() - start, 2)
+
+    def test_hanging_source_does_not_keep_the_process_alive(self):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', hanging_run], cwd=repo_root, check=True, timeout=25,
+                       stdout=subprocess.DEVNULL)
+        # importing main takes a moment, the hanging call would take 30s
+        self.assertLess(time.perf_counter() - start, 15)
+
+
+if __name__ == '__main__':
+    unittest.main()
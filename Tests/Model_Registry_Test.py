@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src.Predict import Model_Registry
+
+
+class TestModelRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self.directory.name, 'XGBoost_Models'))
+        self.manifest_path = os.path.join(self.directory.name, 'manifest.toml')
+        self.loads = []
+        self.patches = [
+            mock.patch.object(Model_Registry, 'models_dir', self.directory.name),
+            mock.patch.object(Model_Registry, 'manifest_path', self.manifest_path),
+            mock.patch.object(Model_Registry, 'manifest', None),
+            mock.patch.object(Model_Registry, 'active_paths', {}),
+            mock.patch.object(Model_Registry, 'loaded_models', {}),
+            mock.patch.dict(Model_Registry.loaders, {'xgboost': self.load}),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in reversed(self.patches):
+            patch.stop()
+        self.directory.cleanup()
+
+    def load(self, path):
+        self.loads.append(os.path.basename(path))
+        return os.path.basename(path)
+
+    def artifact(self, name):
+        open(os.path.join(self.directory.name, 'XGBoost_Models', name), 'w').close()
+
+    def test_manifest_is_parsed_once(self):
+        self.artifact('XGBoost_68.7%_ML-4.json')
+        self.artifact('XGBoost_53.7%_UO-9.json')
+        with open(self.manifest_path, 'w') as manifest:
+            manifest.write('[xgboost]\nML = "XGBoost_68.7%_ML-4.json"\n')
+        with mock.patch.object(Model_Registry.toml, 'load', wraps=Model_Registry.toml.load) as load:
+            for _ in range(3):
+                self.assertEqual(Model_Registry.get_model('xgboost', 'ML'), 'XGBoost_68.7%_ML-4.json')
+                self.assertEqual(Model_Registry.get_model('xgboost', 'OU'), 'XGBoost_53.7%_UO-9.json')
+        self.assertEqual(load.call_count, 1)
+        self.assertEqual(self.loads, ['XGBoost_68.7%_ML-4.json', 'XGBoost_53.7%_UO-9.json'])
+
+    def test_preload_fails_before_loading_when_a_kind_is_missing(self):
+        self.artifact('XGBoost_68.7%_ML-4.json')
+        with self.assertRaisesRegex(FileNotFoundError, 'No xgboost OU model found'):
+            Model_Registry.preload('xgboost')
+        self.assertEqual(self.loads, [])
+
+    def test_preload_fails_on_a_missing_manifest_entry(self):
+        self.artifact('XGBoost_68.7%_ML-4.json')
+        with open(self.manifest_path, 'w') as manifest:
+            manifest.write('[xgboost]\nOU = "XGBoost_53.7%_UO-9.json"\n')
+        with self.assertRaisesRegex(FileNotFoundError, 'XGBoost_53.7%_UO-9.json does not exist'):
+            Model_Registry.preload('xgboost')
+        self.assertEqual(self.loads, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import contextlib
+import io
+import unittest
+from unittest import mock
+
+import numpy as np
+import tensorflow as tf
+
+from src.Predict import NN_Runner
+
+
+def make_model(n_features, n_classes):
+    tf.keras.utils.set_random_seed(5)
+    return tf.keras.Sequential([
+        tf.keras.Input(shape=(n_features,)),
+        tf.keras.layers.Dense(8, activation='relu'),
+        tf.keras.layers.Dense(n_classes, activation='softmax'),
+    ])
+
+
+class TestNNRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.data = np.random.default_rng(5).random((2 * NN_Runner.batch_size + 37, 6)).astype(np.float32)
+
+    def test_predict_batched_matches_predict(self):
+        model = make_model(6, 2)
+        predictions, latencies = NN_Runner.predict_batched(model, self.data)
+        # two full batches and a padded last one
+        self.assertEqual(len(latencies), 3)
+        np.testing.assert_allclose(predictions, model.predict(self.data, verbose=0), rtol=1e-5, atol=1e-6)
+
+        # a slate smaller than one batch reuses the traced forward pass
+        predictions, latencies = NN_Runner.predict_batched(model, self.data[:5])
+        self.assertEqual(len(latencies), 1)
+        np.testing.assert_allclose(predictions, model.predict(self.data[:5], verbose=0), rtol=1e-5, atol=1e-6)
+
+    def test_latency_report_goes_to_stderr(self):
+        models = {'ML': make_model(6, 2), 'OU': make_model(7, 3)}
+        ou_data = np.column_stack([self.data, np.full(len(self.data), 0.5, dtype=np.float32)])
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with mock.patch.object(NN_Runner.Model_Registry, 'get_model', lambda family, kind: models[kind]), \
+                contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            predictions = NN_Runner.predict_slate(self.data, ou_data, report_latency=True)
+        self.assertEqual(len(predictions), len(self.data))
+        self.assertEqual(stdout.getvalue(), '')
+        self.assertTrue(stderr.getvalue().startswith('ML model: 3 batch(es), '))
+
+
+if __name__ == '__main__':
+    unittest.main()
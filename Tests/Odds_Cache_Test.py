@@ -0,0 +1,73 @@
+import os
+import tempfile
+import time
+import unittest
+
+from src.DataProviders.OddsCache import OddsCache
+
+
+def scoreboard(home_ml):
+    return [
+        {'home_team': 'Boston Celtics', 'away_team': 'Miami Heat', 'home_ml': {'fanduel': home_ml, 'draftkings': -145},
+         'away_ml': {'fanduel': 130, 'draftkings': 125}, 'total': {'fanduel': 220.5, 'draftkings': 221}},
+        {'home_team': 'Utah Jazz', 'away_team': 'LA Clippers', 'home_ml': {}, 'away_ml': {}, 'total': {}},
+    ]
+
+
+class TestOddsCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'odds.sqlite')
+        self.fetches = []
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def fetch(self, home_ml=-150):
+        def fetch():
+            self.fetches.append(home_ml)
+            return scoreboard(home_ml)
+        return fetch
+
+    def test_fresh_lines_are_reused(self):
+        cache = OddsCache(self.path, ttl=600)
+        self.assertEqual(cache.get_games('2023-11-01', self.fetch()), scoreboard(-150))
+        self.assertEqual(cache.get_games('2023-11-01', self.fetch(-160)), scoreboard(-150))
+        # a new process reads the same scrape from disk
+        self.assertEqual(OddsCache(self.path, ttl=600).get_games('2023-11-01', self.fetch(-160)), scoreboard(-150))
+        self.assertEqual(self.fetches, [-150])
+
+    def test_stale_while_revalidate(self):
+        cache = OddsCache(self.path, ttl=600, stale_ttl=600)
+        cache.store('2023-11-01', scoreboard(-150), time.time() - 900)
+        self.assertEqual(cache.get_games('2023-11-01', self.fetch(-160)), scoreboard(-150))
+        for _ in range(100):
+            if not cache.refreshing:
+                break
+            time.sleep(0.05)
+        self.assertEqual(cache.get_games('2023-11-01', self.fetch(-170)), scoreboard(-160))
+        self.assertEqual(self.fetches, [-160])
+
+        cache.store('2023-11-01', scoreboard(-160), time.time() - 1300)
+        self.assertEqual(cache.get_games('2023-11-01', self.fetch(-180)), scoreboard(-180))
+
+    def test_failed_scrape_keeps_lines(self):
+        cache = OddsCache(self.path, ttl=0, stale_ttl=0)
+        cache.store('2023-11-01', scoreboard(-150), time.time() - 10)
+        self.assertEqual(cache.get_games('2023-11-01', lambda: []), scoreboard(-150))
+
+    def test_line_history(self):
+        cache = OddsCache(self.path, ttl=600)
+        cache.store('2023-11-01', scoreboard(-150), 100.0)
+        cache.store('2023-11-01', scoreboard(-150), 200.0)
+        cache.store('2023-11-01', scoreboard(-165), 300.0)
+        self.assertEqual(cache.history('2023-11-01', 'fanduel'), [
+            ('fanduel', 'Boston Celtics', 'Miami Heat', -150, 130, 220.5, 100.0),
+            ('fanduel', 'Boston Celtics', 'Miami Heat', -165, 130, 220.5, 300.0),
+        ])
+        self.assertEqual(len(cache.history('2023-11-01')), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+import numpy as np
+
+from src.Predict import Predictions
+from src.Utils import Expected_Value
+from src.Utils import Kelly_Criterion as kc
+
+games = [['Boston Celtics', 'Miami Heat'], ['Utah Jazz', 'LA Clippers'], ['Denver Nuggets', 'Phoenix Suns']]
+ml_predictions = [[0.3, 0.7], [0.6, 0.4], [0.45, 0.55]]
+ou_predictions = [[0.2, 0.7, 0.1], [0.55, 0.4, 0.05], [0.1, 0.2, 0.7]]
+
+
+def slate():
+    predictions = Predictions.to_prediction_array(ml_predictions, ou_predictions)
+    # lines as main.py gets them: numbers, strings, and None for the sportsbook missing a line
+    return Predictions.build_results(predictions, games, [220.5, '230', None], [-150, 180, None], [130, '-210', 110])
+
+
+class TestPredictions(unittest.TestCase):
+
+    def test_picks_and_confidence(self):
+        results = slate()
+        self.assertEqual(results['home_team'].tolist(), ['Boston Celtics', 'Utah Jazz', 'Denver Nuggets'])
+        self.assertEqual(results['winner'].tolist(), [1, 0, 1])
+        self.assertEqual(results['winner_confidence'].tolist(), [70.0, 60.0, 55.0])
+        # a push pick is shown as an over, with the over probability
+        self.assertEqual(results['under_over'].tolist(), [1, 0, 2])
+        self.assertEqual(results['ou_confidence'].tolist(), [70.0, 55.0, 20.0])
+        np.testing.assert_array_equal(results['ou_line'], [220.5, 230, np.nan])
+
+    def test_expected_value_and_kelly(self):
+        results = slate()
+        ml_proba = results['ml_proba'].astype(np.float64)
+        for row, (home_odds, away_odds) in enumerate([(-150, 130), (180, -210)]):
+            self.assertEqual(results['home_ev'][row], Expected_Value.expected_value(ml_proba[row, 1], home_odds))
+            self.assertEqual(results['away_ev'][row], Expected_Value.expected_value(ml_proba[row, 0], away_odds))
+            self.assertEqual(results['home_kelly'][row], kc.calculate_kelly_criterion(home_odds, ml_proba[row, 1]))
+            self.assertEqual(results['away_kelly'][row], kc.calculate_kelly_criterion(away_odds, ml_proba[row, 0]))
+
+    def test_missing_line_hides_ev_and_kelly(self):
+        results = slate()
+        self.assertTrue(np.isnan(results['home_odds'][2]))
+        self.assertEqual(results['away_odds'][2], 110)
+        for field in ('home_ev', 'away_ev', 'home_kelly', 'away_kelly'):
+            self.assertTrue(np.isnan(results[field][2]), field)
+
+
+if __name__ == '__main__':
+    unittest.main()
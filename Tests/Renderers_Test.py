@@ -0,0 +1,58 @@
+import csv
+import io
+import json
+import unittest
+
+from src.Predict import Predictions, Renderers
+
+
+def slate():
+    predictions = Predictions.to_prediction_array([[0.3, 0.7], [0.6, 0.4], [0.45, 0.55]],
+                                                  [[0.2, 0.7, 0.1], [0.55, 0.4, 0.05], [0.1, 0.2, 0.7]])
+    games = [['Boston Celtics', 'Miami Heat'], ['Utah Jazz', 'LA Clippers'], ['Denver Nuggets', 'Phoenix Suns']]
+    return Predictions.build_results(predictions, games, [220.5, '230', None], [-150, 180, None], [130, '-210', 110])
+
+
+class TestRenderers(unittest.TestCase):
+
+    def test_to_records(self):
+        records = Renderers.to_records(slate())
+        self.assertEqual(records[0]['winner'], 'Boston Celtics')
+        self.assertEqual(records[0]['ou_pick'], 'OVER')
+        self.assertEqual(records[0]['home_team_odds'], -150.0)
+        self.assertAlmostEqual(records[0]['home_win_proba'], 0.7, places=6)
+        self.assertEqual(records[1]['winner'], 'LA Clippers')
+        self.assertEqual(records[1]['ou_pick'], 'UNDER')
+        self.assertEqual(records[1]['ou_value'], 230.0)
+        # missing lines and everything derived from them are None
+        self.assertEqual([records[2][key] for key in ('home_team_odds', 'ou_value', 'home_team_ev', 'away_team_ev',
+                                                      'home_team_kelly', 'away_team_kelly')], [None] * 6)
+        self.assertEqual(records[2]['away_team_odds'], 110.0)
+
+    def test_to_json(self):
+        results = slate()
+        self.assertEqual(json.loads(Renderers.to_json(results)), Renderers.to_records(results))
+        by_model = json.loads(Renderers.to_json({'XGBoost': results, 'NN': results[:1]}))
+        self.assertEqual(list(by_model), ['XGBoost', 'NN'])
+        self.assertEqual(len(by_model['NN']), 1)
+        self.assertIsNone(by_model['XGBoost'][2]['home_team_ev'])
+
+    def test_to_csv(self):
+        results = slate()
+        rows = list(csv.DictReader(io.StringIO(Renderers.to_csv(results))))
+        self.assertEqual(list(rows[0]), list(Renderers.to_records(results)[0]))
+        self.assertEqual([row['winner'] for row in rows], ['Boston Celtics', 'LA Clippers', 'Denver Nuggets'])
+        self.assertEqual(rows[2]['home_team_ev'], '')
+
+        rows = list(csv.DictReader(io.StringIO(Renderers.to_csv({'XGBoost': results, 'NN': results[:1]}))))
+        self.assertEqual([row['model'] for row in rows], ['XGBoost'] * 3 + ['NN'])
+        self.assertEqual(Renderers.to_csv(results[:0]), '')
+
+    def test_console_numbers(self):
+        self.assertEqual(Renderers.format_number(float('nan')), '0')
+        self.assertEqual(Renderers.format_number(0.0), '0')
+        self.assertEqual(Renderers.format_number(12.86), '12.86')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from src.DataProviders import SbrOddsProvider
+from src.Predict import XGBoost_Runner
+
+
+class FakeScoreboard:
+    def __init__(self, sport):
+        self.games = [
+            {'home_team': 'Boston Celtics', 'away_team': 'Miami Heat',
+             'home_ml': {'fanduel': -150, 'draftkings': -145}, 'away_ml': {'fanduel': 130, 'draftkings': 125},
+             'total': {'fanduel': 220.5, 'draftkings': 221}},
+            {'home_team': 'Utah Jazz', 'away_team': 'Los Angeles Clippers',
+             'home_ml': {'betmgm': 180}, 'away_ml': {'betmgm': -210}, 'total': {}},
+        ]
+
+
+class FakeModel:
+    def __init__(self):
+        self.rows = []
+
+    def inplace_predict(self, features):
+        self.rows.append(features.copy())
+        # the last column decides the pick, so each model's output can be traced back to its input rows
+        proba = features[:, -1:] / 1000
+        return np.hstack([proba, 1 - proba])
+
+
+class TestSbrOddsProvider(unittest.TestCase):
+
+    def setUp(self):
+        with mock.patch.object(SbrOddsProvider, 'Scoreboard', FakeScoreboard):
+            self.provider = SbrOddsProvider.SbrOddsProvider()
+
+    def test_get_all_odds(self):
+        odds = self.provider.get_all_odds()
+        self.assertEqual(odds['games'], [['Boston Celtics', 'Miami Heat'], ['Utah Jazz', 'LA Clippers']])
+        self.assertEqual(odds['sportsbooks'], ['betmgm', 'draftkings', 'fanduel'])
+        np.testing.assert_array_equal(odds['home_ml'], [[np.nan, -145, -150], [180, np.nan, np.nan]])
+        np.testing.assert_array_equal(odds['total'], [[np.nan, 221, 220.5], [np.nan, np.nan, np.nan]])
+
+        np.testing.assert_array_equal(odds['best_home_ml'], [-145, 180])
+        self.assertEqual(odds['best_home_book'], ['draftkings', 'betmgm'])
+        np.testing.assert_array_equal(odds['best_away_ml'], [130, -210])
+        self.assertEqual(odds['best_away_book'], ['fanduel', 'betmgm'])
+        np.testing.assert_array_equal(odds['best_over_total'], [220.5, np.nan])
+        np.testing.assert_array_equal(odds['best_under_total'], [221, np.nan])
+        self.assertEqual(odds['best_under_book'], ['draftkings', None])
+
+    def test_get_odds_for_other_book(self):
+        odds = self.provider.get_odds('draftkings')
+        self.assertEqual(odds['Boston Celtics:Miami Heat'], {'under_over_odds': 221,
+                                                             'Boston Celtics': {'money_line_odds': -145},
+                                                             'Miami Heat': {'money_line_odds': 125}})
+        self.assertEqual(self.provider.get_odds()['Utah Jazz:LA Clippers']['under_over_odds'], None)
+
+    def test_predict_books_scores_money_line_once_per_game(self):
+        odds = self.provider.get_all_odds()
+        data = np.array([[1, 100], [2, 200]], dtype=np.float32)
+        models = {'ML': FakeModel(), 'OU': FakeModel()}
+        with mock.patch.object(XGBoost_Runner.Model_Registry, 'get_model', lambda family, kind: models[kind]):
+            results = XGBoost_Runner.predict_books(data, odds)
+        np.testing.assert_array_equal(models['ML'].rows, [data])
+        np.testing.assert_array_equal(models['OU'].rows[0][:, :-1], np.repeat(data, 3, axis=0))
+        np.testing.assert_array_equal(models['OU'].rows[0][:, -1], np.float32(odds['total'].ravel()))
+        self.assertEqual(results.shape, (2, 3))
+        np.testing.assert_allclose(results['ml_proba'][:, :, 0], [[0.1] * 3, [0.2] * 3])
+        np.testing.assert_allclose(results['ou_proba'][0, 1:, 0], [0.221, 0.2205])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from src.Utils import Sqlite_Storage
+
+
+class TestSqliteStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'data.sqlite')
+        self.frame = pd.DataFrame({
+            'Date': [date(2023, 10, 24), date(2023, 10, 25), date(2023, 10, 25)],
+            'Home': ['Denver Nuggets', 'Golden State Warriors', None],
+            'OU': [233.5, np.nan, 229.0],
+            'Days_Rest_Home': [10, 2, 9],
+            'Tip_Off': pd.to_datetime(['2023-10-24 23:30', '2023-10-25 02:00', '2023-10-25 23:00']),
+        })
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_tuned_connection(self):
+        con = Sqlite_Storage.connect(self.path)
+        self.assertEqual(con.execute('pragma journal_mode').fetchone()[0], 'wal')
+        self.assertEqual(con.execute('pragma synchronous').fetchone()[0], 1)
+        con.close()
+
+    def test_write_frame_matches_to_sql(self):
+        expected = sqlite3.connect(os.path.join(self.directory.name, 'expected.sqlite'))
+        self.frame.to_sql('odds', expected, if_exists="replace")
+        con = Sqlite_Storage.connect(self.path)
+        self.frame.iloc[:1].to_sql('odds', con)
+        Sqlite_Storage.write_frames(con, {'odds': self.frame}, size=2)
+
+        for schema in ("select type, name, tbl_name from sqlite_master order by name",
+                       "select sql from sqlite_master where type = 'table'"):
+            self.assertEqual(con.execute(schema).fetchall(), expected.execute(schema).fetchall())
+        self.assertEqual(con.execute('select * from odds').fetchall(), expected.execute('select * from odds').fetchall())
+        con.close()
+        expected.close()
+
+    def test_append_frame(self):
+        con = Sqlite_Storage.connect(self.path)
+        with Sqlite_Storage.transaction(con):
+            Sqlite_Storage.write_frame(con, 'odds', self.frame.iloc[:2])
+        with Sqlite_Storage.transaction(con):
+            Sqlite_Storage.append_frame(con, 'odds', self.frame.iloc[2:])
+        written = pd.read_sql_query('select * from odds', con, index_col='index')
+        self.assertEqual(written.index.tolist(), [0, 1, 2])
+        self.assertEqual(written['Days_Rest_Home'].tolist(), [10, 2, 9])
+        con.close()
+
+    def test_failed_write_rolls_back(self):
+        con = Sqlite_Storage.connect(self.path)
+        Sqlite_Storage.write_frames(con, {'odds': self.frame})
+        with self.assertRaises(sqlite3.Error):
+            Sqlite_Storage.write_frames(con, {'odds': self.frame.iloc[:1], 'bad': self.frame.rename(
+                columns={'Home': 'OU'})})
+        self.assertEqual(con.execute('select count(*) from odds').fetchone()[0], 3)
+        self.assertIsNone(con.execute("select 1 from sqlite_master where name = 'bad'").fetchone())
+        con.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import unittest
+
+import numpy as np
+import toml
+
+from src.Utils import Dictionaries, Games_Dataset
+from src.Utils.Team_Index import TeamIndex, default_path, get_team_index
+
+# the literal team indexes src/Utils/Dictionaries.py held before they moved to Data/team-index.toml
+legacy_07 = {
+    'Atlanta Hawks': 0, 'Boston Celtics': 1, 'Charlotte Bobcats': 2, 'Chicago Bulls': 3, 'Cleveland Cavaliers': 4,
+    'Dallas Mavericks': 5, 'Denver Nuggets': 6, 'Detroit Pistons': 7, 'Golden State Warriors': 8,
+    'Houston Rockets': 9, 'Indiana Pacers': 10, 'Los Angeles Clippers': 11, 'Los Angeles Lakers': 12,
+    'Memphis Grizzlies': 13, 'Miami Heat': 14, 'Milwaukee Bucks': 15, 'Minnesota Timberwolves': 16,
+    'New Jersey Nets': 17, 'New Orleans Pelicans': 18, 'New York Knicks': 19, 'Orlando Magic': 20,
+    'Philadelphia 76ers': 21, 'Phoenix Suns': 22, 'Portland Trail Blazers': 23, 'Sacramento Kings': 24,
+    'San Antonio Spurs': 25, 'Seattle SuperSonics': 26, 'Toronto Raptors': 27, 'Utah Jazz': 28,
+    'Washington Wizards': 29
+}
+
+legacy_08 = {
+    'Atlanta Hawks': 0, 'Boston Celtics': 1, 'Charlotte Bobcats': 2, 'Chicago Bulls': 3, 'Cleveland Cavaliers': 4,
+    'Dallas Mavericks': 5, 'Denver Nuggets': 6, 'Detroit Pistons': 7, 'Golden State Warriors': 8,
+    'Houston Rockets': 9, 'Indiana Pacers': 10, 'Los Angeles Clippers': 11, 'Los Angeles Lakers': 12,
+    'Memphis Grizzlies': 13, 'Miami Heat': 14, 'Milwaukee Bucks': 15, 'Minnesota Timberwolves': 16,
+    'New Jersey Nets': 17, 'New Orleans Pelicans': 18, 'New York Knicks': 19, 'Oklahoma City Thunder': 20,
+    'Orlando Magic': 21, 'Philadelphia 76ers': 22, 'Phoenix Suns': 23, 'Portland Trail Blazers': 24,
+    'Sacramento Kings': 25, 'San Antonio Spurs': 26, 'Toronto Raptors': 27, 'Utah Jazz': 28,
+    'Washington Wizards': 29
+}
+
+legacy_12 = {
+    'Atlanta Hawks': 0, 'Boston Celtics': 1, 'Brooklyn Nets': 2, 'Charlotte Bobcats': 3, 'Chicago Bulls': 4,
+    'Cleveland Cavaliers': 5, 'Dallas Mavericks': 6, 'Denver Nuggets': 7, 'Detroit Pistons': 8,
+    'Golden State Warriors': 9, 'Houston Rockets': 10, 'Indiana Pacers': 11, 'Los Angeles Clippers': 12,
+    'Los Angeles Lakers': 13, 'Memphis Grizzlies': 14, 'Miami Heat': 15, 'Milwaukee Bucks': 16,
+    'Minnesota Timberwolves': 17, 'New Orleans Pelicans': 18, 'New York Knicks': 19, 'Oklahoma City Thunder': 20,
+    'Orlando Magic': 21, 'Philadelphia 76ers': 22, 'Phoenix Suns': 23, 'Portland Trail Blazers': 24,
+    'Sacramento Kings': 25, 'San Antonio Spurs': 26, 'Toronto Raptors': 27, 'Utah Jazz': 28,
+    'Washington Wizards': 29
+}
+
+legacy_13 = {
+    'Atlanta Hawks': 0, 'Boston Celtics': 1, 'Brooklyn Nets': 2, 'Charlotte Bobcats': 3, 'Chicago Bulls': 4,
+    'Cleveland Cavaliers': 5, 'Dallas Mavericks': 6, 'Denver Nuggets': 7, 'Detroit Pistons': 8,
+    'Golden State Warriors': 9, 'Houston Rockets': 10, 'Indiana Pacers': 11, 'Los Angeles Clippers': 12,
+    'Los Angeles Lakers': 13, 'Memphis Grizzlies': 14, 'Miami Heat': 15, 'Milwaukee Bucks': 16,
+    'Minnesota Timberwolves': 17, 'New Orleans Pelicans': 18, 'New York Knicks': 19, 'Oklahoma City Thunder': 20,
+    'Orlando Magic': 21, 'Philadelphia 76ers': 22, 'Phoenix Suns': 23, 'Portland Trail Blazers': 24,
+    'Sacramento Kings': 25, 'San Antonio Spurs': 26, 'Toronto Raptors': 27, 'Utah Jazz': 28,
+    'Washington Wizards': 29
+}
+
+legacy_14 = {
+    'Atlanta Hawks': 0, 'Boston Celtics': 1, 'Brooklyn Nets': 2, 'Charlotte Bobcats': 3, 'Chicago Bulls': 4,
+    'Cleveland Cavaliers': 5, 'Dallas Mavericks': 6, 'Denver Nuggets': 7, 'Detroit Pistons': 8,
+    'Golden State Warriors': 9, 'Houston Rockets': 10, 'Indiana Pacers': 11, 'Los Angeles Clippers': 12,
+    'Los Angeles Lakers': 13, 'Memphis Grizzlies': 14, 'Miami Heat': 15, 'Milwaukee Bucks': 16,
+    'Minnesota Timberwolves': 17, 'New Orleans Pelicans': 18, 'New York Knicks': 19, 'Oklahoma City Thunder': 20,
+    'Orlando Magic': 21, 'Philadelphia 76ers': 22, 'Phoenix Suns': 23, 'Portland Trail Blazers': 24,
+    'Sacramento Kings': 25, 'San Antonio Spurs': 26, 'Toronto Raptors': 27, 'Utah Jazz': 28,
+    'Washington Wizards': 29
+}
+
+legacy_current = {
+    'Atlanta Hawks': 0, 'Boston Celtics': 1, 'Brooklyn Nets': 2, 'Charlotte Hornets': 3, 'Chicago Bulls': 4,
+    'Cleveland Cavaliers': 5, 'Dallas Mavericks': 6, 'Denver Nuggets': 7, 'Detroit Pistons': 8,
+    'Golden State Warriors': 9, 'Houston Rockets': 10, 'Indiana Pacers': 11, 'Los Angeles Clippers': 12,
+    'LA Clippers': 12, 'Los Angeles Lakers': 13, 'Memphis Grizzlies': 14, 'Miami Heat': 15, 'Milwaukee Bucks': 16,
+    'Minnesota Timberwolves': 17, 'New Orleans Pelicans': 18, 'New York Knicks': 19, 'Oklahoma City Thunder': 20,
+    'Orlando Magic': 21, 'Philadelphia 76ers': 22, 'Phoenix Suns': 23, 'Portland Trail Blazers': 24,
+    'Sacramento Kings': 25, 'San Antonio Spurs': 26, 'Toronto Raptors': 27, 'Utah Jazz': 28,
+    'Washington Wizards': 29
+}
+
+
+def legacy_season_team_index(season):
+    """ The if/elif dispatch Create_Games used to pick a season's team index. """
+    if season == '2007-08':
+        return legacy_07
+    elif season == '2008-09' or season == "2009-10" or season == "2010-11" or season == "2011-12":
+        return legacy_08
+    elif season == "2012-13":
+        return legacy_12
+    elif season == '2013-14':
+        return legacy_13
+    elif season == '2022-23' or season == '2023-24':
+        return legacy_current
+    else:
+        return legacy_14
+
+
+class TestTeamIndex(unittest.TestCase):
+
+    def test_positions_match_legacy_dispatch(self):
+        team_index = get_team_index()
+        for year in range(2007, 2025):
+            season = f"{year}-{str(year + 1)[2:]}"
+            expected = legacy_season_team_index(season)
+            self.assertEqual(team_index.season_team_index(season), expected)
+            positions = team_index.season_positions(season, list(expected))
+            self.assertEqual(positions.tolist(), list(expected.values()))
+        self.assertEqual(Dictionaries.team_index_current, legacy_current)
+        self.assertEqual(Dictionaries.team_index_07, legacy_07)
+
+    def test_unknown_teams(self):
+        team_index = get_team_index()
+        positions = team_index.season_positions('2023-24', ['Seattle SuperSonics', 'Boston Celtics', 'Nowhere'])
+        self.assertEqual(positions.tolist(), [-1, 1, -1])
+        self.assertEqual(team_index.team_ids(['Nowhere']).tolist(), [-1])
+        with self.assertRaises(KeyError):
+            Games_Dataset.team_positions('2023-24', np.array(['Boston Celtics', 'Seattle SuperSonics']))
+
+    def test_new_season_from_data(self):
+        team_index = TeamIndex({'2014-15': {'Boston Celtics': 1, 'Charlotte Hornets': 3},
+                                '2024-25': {'Boston Celtics': 0, 'Charlotte Hornets': 1}},
+                               {'2024-25': '2024-25'}, '2014-15', '2024-25',
+                               {'Boston Celtics': 1, 'Charlotte Hornets': 32})
+        self.assertEqual(team_index.season_positions('2024-25', ['Charlotte Hornets']).tolist(), [1])
+        self.assertEqual(team_index.season_positions('2016-17', ['Charlotte Hornets']).tolist(), [3])
+        self.assertEqual(team_index.team_ids(['Charlotte Hornets', 'Boston Celtics']).tolist(), [32, 1])
+
+    def test_ids_stay_stable_when_a_team_is_added(self):
+        config = toml.load(default_path)
+        before = TeamIndex.from_toml()
+        # a name sorting before every other one joins a new era
+        config['eras']['2025-26'] = dict(config['eras']['2022-23'], **{'Aardvark City Aces': 0})
+        config['team_ids']['Aardvark City Aces'] = max(config['team_ids'].values()) + 1
+        after = TeamIndex(config['eras'], config['seasons'], config['default_era'], config['current_season'],
+                          config['team_ids'])
+        names = list(before.names)
+        self.assertEqual(after.team_ids(names).tolist(), before.team_ids(names).tolist())
+
+    def test_every_name_needs_an_id(self):
+        with self.assertRaises(ValueError):
+            TeamIndex({'2014-15': {'Boston Celtics': 1}}, {}, '2014-15', '2014-15', {})
+
+
+if __name__ == '__main__':
+    unittest.main()
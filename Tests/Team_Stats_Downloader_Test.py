@@ -0,0 +1,119 @@
+import json
+import sqlite3
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from src.DataProviders.TeamStatsDownloader import TeamStatsDownloader, TokenBucket
+from src.Utils import Team_Stats_Store
+
+seasons = {'2023-24': {'start_date': '2023-10-24', 'end_date': '2023-10-27', 'start_year': '2023', 'end_year': '2024'}}
+
+
+class StubStatsHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+    fail_first = set()
+
+    def do_GET(self):
+        date_to = parse_qs(urlparse(self.path).query)['DateTo'][0]
+        StubStatsHandler.requests_seen.append(date_to)
+        if date_to in StubStatsHandler.fail_first:
+            StubStatsHandler.fail_first.discard(date_to)
+            self.send_response(503)
+            self.end_headers()
+            return
+        body = json.dumps({'resultSets': [{'headers': ['TEAM_ID', 'TEAM_NAME', 'W'],
+                                           'rowSet': [[1, 'Boston Celtics', 3], [2, 'Miami Heat', 1]]}]})
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+class TestTeamStatsDownloader(unittest.TestCase):
+
+    def setUp(self):
+        StubStatsHandler.requests_seen = []
+        StubStatsHandler.fail_first = set()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubStatsHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/stats?DateFrom=10%2F01%2F{{2}}&DateTo={{0}}%2F{{1}}%2F{{3}}&Season={{4}}"
+        self.con = sqlite3.connect(':memory:')
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.con.close()
+
+    def downloader(self):
+        return TeamStatsDownloader(self.con, self.url, workers=3, rate=1000, retries=2, backoff=0.01, timeout=5)
+
+    def test_downloads_every_date(self):
+        failed = self.downloader().run(seasons)
+        self.assertEqual(failed, [])
+        self.assertEqual(sorted(StubStatsHandler.requests_seen), ['10/24/2023', '10/25/2023', '10/26/2023', '10/27/2023'])
+        rows = self.con.execute('select TEAM_NAME, W, Date from team_stats where Date = ?', ('2023-10-25',)).fetchall()
+        self.assertEqual(rows, [('Boston Celtics', 3, '2023-10-25'), ('Miami Heat', 1, '2023-10-25')])
+
+    def test_retries_server_errors(self):
+        StubStatsHandler.fail_first = {'10/26/2023'}
+        failed = self.downloader().run(seasons)
+        self.assertEqual(failed, [])
+        self.assertEqual(StubStatsHandler.requests_seen.count('10/26/2023'), 2)
+
+    def test_rerun_skips_completed_dates(self):
+        self.downloader().run(seasons)
+        StubStatsHandler.requests_seen = []
+        self.con.execute("delete from completed_dates where date = '2023-10-28'")
+        self.downloader().run(seasons)
+        self.assertEqual(StubStatsHandler.requests_seen, ['10/27/2023'])
+
+    def write_per_date_tables(self):
+        days = {
+            '2023-10-24': pd.DataFrame({'TEAM_ID': [1, 2], 'TEAM_NAME': ['Boston Celtics', 'Miami Heat'], 'W': [0, 0]}),
+            '2023-10-25': pd.DataFrame({'TEAM_ID': [2, 1], 'TEAM_NAME': ['Miami Heat', 'Boston Celtics'], 'W': [1, 1]}),
+        }
+        for date, df in days.items():
+            df.to_sql(date, self.con, if_exists='replace')
+        return days
+
+    def test_migrates_per_date_tables(self):
+        days = self.write_per_date_tables()
+        self.assertEqual(Team_Stats_Store.migrate_per_date_tables(self.con, drop=True), 2)
+
+        tables = [name for (name,) in self.con.execute("select name from sqlite_master where type = 'table'")]
+        self.assertEqual(tables, ['team_stats'])
+        stats = Team_Stats_Store.read_snapshots(self.con, '2023-10-24', '2023-10-25').sort_values(['Date', 'index'])
+        expected = pd.concat([df.reset_index().assign(Date=date) for date, df in days.items()])
+        pd.testing.assert_frame_equal(stats[expected.columns].reset_index(drop=True),
+                                      expected.reset_index(drop=True))
+        self.assertEqual(Team_Stats_Store.count_teams_by_date(self.con), {'2023-10-24': 2, '2023-10-25': 2})
+
+    def test_get_team_stats(self):
+        self.write_per_date_tables()
+        Team_Stats_Store.migrate_per_date_tables(self.con)
+
+        # pairs come back in the order given, with NaN rows for a missing date and a missing team
+        stats = Team_Stats_Store.get_team_stats(self.con, [('2023-10-25', 1), ('2023-10-24', 2), ('2023-10-26', 1),
+                                                           ('2023-10-24', 9), ('2023-10-24', 1)])
+        self.assertEqual(stats['TEAM_NAME'].tolist(), ['Boston Celtics', 'Miami Heat', None, None, 'Boston Celtics'])
+        np.testing.assert_array_equal(stats['W'], [1, 0, np.nan, np.nan, 0])
+
+        by_position = Team_Stats_Store.get_team_stats(self.con, [('2023-10-25', 0), ('2023-10-24', 0)], by='index')
+        self.assertEqual(by_position['TEAM_NAME'].tolist(), ['Miami Heat', 'Boston Celtics'])
+        self.assertEqual(by_position['Date'].tolist(), ['2023-10-25', '2023-10-24'])
+
+    def test_token_bucket_limits_rate(self):
+        bucket = TokenBucket(rate=50, capacity=1)
+        begin = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - begin, 0.09)
@@ -0,0 +1,56 @@
+import re
+import unittest
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.Utils.tools import get_date, parse_sbr_dates
+
+season_dates = ['2022-23-1018', '2022-23-1231', '2022-23-0101', '2022-23-0228', '2022-23-1201', '2022-23-0615']
+
+
+def legacy_get_date(date_string):
+    # the per-date regex and strptime get_date used to run
+    year1, month, day = re.search(r'(\d+)-\d+-(\d\d)(\d\d)', date_string).groups()
+    year = year1 if int(month) > 8 else int(year1) + 1
+    return datetime.strptime(f"{year}-{month}-{day}", '%Y-%m-%d')
+
+
+class TestParseSbrDates(unittest.TestCase):
+
+    def test_month_rollover_matches_legacy_get_date(self):
+        parsed = parse_sbr_dates(season_dates)
+        self.assertEqual(parsed.tolist(), [pd.Timestamp(legacy_get_date(date)) for date in season_dates])
+
+    def test_get_date(self):
+        self.assertEqual([get_date(date) for date in season_dates], [legacy_get_date(date) for date in season_dates])
+        self.assertIsInstance(get_date(season_dates[0]), datetime)
+        with self.assertRaises(ValueError):
+            get_date('not a date')
+
+    def test_january_rollover(self):
+        # the row loop Fix_Odds_Date_Format.py used to run: every row from the first January one on is next year
+        expected = []
+        year_count = 0
+        for date in season_dates:
+            year, _, month_day = date.split('-')
+            if month_day[:2] == '01':
+                year_count += 1
+            if year_count > 0:
+                year = str(int(year) + 1)
+            expected.append(str(datetime.strptime(f'{year}-{month_day[:2]}-{month_day[2:]}', '%Y-%m-%d').date()))
+
+        parsed = parse_sbr_dates(season_dates, rollover='january')
+        self.assertEqual(parsed.dt.strftime('%Y-%m-%d').tolist(), expected)
+        self.assertEqual(expected[4], '2023-12-01')
+
+    def test_unparseable_dates(self):
+        parsed = parse_sbr_dates(['2022-23-1018', 'not a date'])
+        self.assertTrue(np.isnat(parsed.to_numpy()[1]))
+        with self.assertRaises(ValueError):
+            parse_sbr_dates(season_dates, rollover='june')
+
+
+if __name__ == '__main__':
+    unittest.main()
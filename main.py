@@ -1,15 +1,24 @@
+import time
+
+startup_start = time.perf_counter()
+
 import argparse
-from datetime import datetime, timedelta
+import asyncio
+import importlib
+import os
+import threading
+from datetime import datetime
 
 import pandas as pd
-import tensorflow as tf
 from colorama import Fore, Style
 
-from src.DataProviders.SbrOddsProvider import SbrOddsProvider
-from src.Predict import NN_Runner, XGBoost_Runner
+from src.Predict import Renderers
+from src.Utils import Days_Rest
 from src.Utils.Dictionaries import team_index_current
+from src.Utils.Team_Index import get_team_index
 from src.Utils.tools import create_todays_games_from_odds, get_json_data, to_data_frame, get_todays_games_json, create_todays_games
 
+schedule_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Data', 'nba-2023-UTC.csv')
 todays_games_url = 'https://data.nba.com/data/10s/v2015/json/mobile_teams/nba/2023/scores/00_todays_scores.json'
 data_url = 'https://stats.nba.com/stats/leaguedashteamstats?' \
            'Conference=&DateFrom=&DateTo=&Division=&GameScope=&' \
@@ -19,16 +28,39 @@ data_url = 'https://stats.nba.com/stats/leaguedashteamstats?' \
            'PlayerExperience=&PlayerPosition=&PlusMinus=N&Rank=N&' \
            'Season=2023-24&SeasonSegment=&SeasonType=Regular+Season&ShotClockRange=&' \
            'StarterBench=&TeamID=0&TwoWay=0&VsConference=&VsDivision='
+# seconds each data source may take before the run gives up on it
+source_timeouts = {'odds': 60, 'todays_games': 30, 'team_stats': 60, 'schedule': 30}
+
+core_imports_time = time.perf_counter() - startup_start
+import_times = {}
+
+
+def timed_import(name):
+    """
+    Imports a module on the code path that needs it, recording the time taken for --profile-startup.
+    """
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    import_times.setdefault(name, time.perf_counter() - start)
+    return module
+
+
+def print_startup_profile():
+    print("--------------------Startup Profile--------------------")
+    print(f"{'core (pandas, colorama, requests, src.Utils)':<48}{core_imports_time:8.3f}s")
+    for name, seconds in import_times.items():
+        print(f"{name:<48}{seconds:8.3f}s")
+    print(f"{'total':<48}{core_imports_time + sum(import_times.values()):8.3f}s")
+    print("-------------------------------------------------------")
 
 
 def createTodaysGames(games, df, odds):
-    match_data = []
     todays_games_uo = []
     home_team_odds = []
     away_team_odds = []
 
-    home_team_days_rest = []
-    away_team_days_rest = []
+    home_teams = []
+    away_teams = []
 
     for game in games:
         home_team = game[0]
@@ -48,35 +80,22 @@ def createTodaysGames(games, df, odds):
             home_team_odds.append(input(home_team + ' odds: '))
             away_team_odds.append(input(away_team + ' odds: '))
 
-        # calculate days rest for both teams
-        schedule_df = pd.read_csv('Data/nba-2023-UTC.csv', parse_dates=['Date'], date_format='%d/%m/%Y %H:%M')
-        home_games = schedule_df[(schedule_df['Home Team'] == home_team) | (schedule_df['Away Team'] == home_team)]
-        away_games = schedule_df[(schedule_df['Home Team'] == away_team) | (schedule_df['Away Team'] == away_team)]
-        previous_home_games = home_games.loc[schedule_df['Date'] <= datetime.today()].sort_values('Date',ascending=False).head(1)['Date']
-        previous_away_games = away_games.loc[schedule_df['Date'] <= datetime.today()].sort_values('Date',ascending=False).head(1)['Date']
-        if len(previous_home_games) > 0:
-            last_home_date = previous_home_games.iloc[0]
-            home_days_off = timedelta(days=1) + datetime.today() - last_home_date
-        else:
-            home_days_off = timedelta(days=7)
-        if len(previous_away_games) > 0:
-            last_away_date = previous_away_games.iloc[0]
-            away_days_off = timedelta(days=1) + datetime.today() - last_away_date
-        else:
-            away_days_off = timedelta(days=7)
-        # print(f"{away_team} days off: {away_days_off.days} @ {home_team} days off: {home_days_off.days}")
+        home_teams.append(home_team)
+        away_teams.append(away_team)
 
-        home_team_days_rest.append(home_days_off.days)
-        away_team_days_rest.append(away_days_off.days)
-        home_team_series = df.iloc[team_index_current.get(home_team)]
-        away_team_series = df.iloc[team_index_current.get(away_team)]
-        stats = pd.concat([home_team_series, away_team_series])
-        stats['Days-Rest-Home'] = home_days_off.days
-        stats['Days-Rest-Away'] = away_days_off.days
-        match_data.append(stats)
+    # calculate days rest for both teams of every game in one lookup
+    schedule = Days_Rest.load_schedule(schedule_path)
+    days_rest = schedule.days_rest(home_teams + away_teams, datetime.today())
+    home_team_days_rest = days_rest[:len(home_teams)]
+    away_team_days_rest = days_rest[len(home_teams):]
 
-    games_data_frame = pd.concat(match_data, ignore_index=True, axis=1)
-    games_data_frame = games_data_frame.T
+    # stats rows of both teams of every game, looked up at once
+    team_index = get_team_index()
+    home_stats = df.iloc[team_index.season_positions(team_index.current_season, home_teams)]
+    away_stats = df.iloc[team_index.season_positions(team_index.current_season, away_teams)]
+    games_data_frame = pd.concat([home_stats.reset_index(drop=True), away_stats.reset_index(drop=True)], axis=1)
+    games_data_frame['Days-Rest-Home'] = home_team_days_rest
+    games_data_frame['Days-Rest-Away'] = away_team_days_rest
 
     frame_ml = games_data_frame.drop(columns=['TEAM_ID', 'TEAM_NAME'])
     data = frame_ml.values
@@ -85,11 +104,94 @@ def createTodaysGames(games, df, odds):
     return data, todays_games_uo, frame_ml, home_team_odds, away_team_odds
 
 
+def run_in_thread(function, *args):
+    """
+    Runs a blocking call on a daemon thread. Unlike the default executor, a call that hangs past its timeout
+    does not keep the process alive once the run has given up on it.
+
+    Returns:
+        asyncio future: resolved with the call's result or exception
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def settle(result, error):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def run():
+        try:
+            result, error = function(*args), None
+        except Exception as e:
+            result, error = None, e
+        try:
+            loop.call_soon_threadsafe(settle, result, error)
+        except RuntimeError:
+            # the loop already closed after a timeout
+            pass
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+
+async def fetch_source(name, function, *args):
+    """
+    Runs a blocking fetch on a worker thread, giving up after the source's timeout.
+    """
+    try:
+        return await asyncio.wait_for(run_in_thread(function, *args), source_timeouts[name])
+    except asyncio.TimeoutError:
+        print(f"Timed out after {source_timeouts[name]}s waiting for {name}.")
+        raise
+
+
+async def fetch_games(load_odds):
+    if load_odds is not None:
+        odds = await fetch_source('odds', load_odds)
+        return odds, create_todays_games_from_odds(odds)
+    data = await fetch_source('todays_games', get_todays_games_json, todays_games_url)
+    return None, create_todays_games(data)
+
+
+async def fetch_team_stats():
+    data = await fetch_source('team_stats', get_json_data, data_url)
+    return to_data_frame(data)
+
+
+async def fetch_inputs(load_odds=None):
+    """
+    Fetches the games (with their odds when load_odds is given), the team stats and the schedule concurrently,
+    turning each into its frame as soon as it lands.
+
+    Returns:
+        tuple: (odds, games, team stats frame)
+    """
+    (odds, games), df, _ = await asyncio.gather(fetch_games(load_odds), fetch_team_stats(),
+                                                fetch_source('schedule', Days_Rest.load_schedule, schedule_path))
+    return odds, games, df
+
+
 def main():
-    odds = None
+    load_odds = None
+    if args.odds:
+        SbrOddsProvider = timed_import('src.DataProviders.SbrOddsProvider').SbrOddsProvider
+        cache = None
+        if args.odds_ttl > 0:
+            # a command line run exits right away, so stale lines are never served while refreshing
+            cache = timed_import('src.DataProviders.OddsCache').OddsCache(ttl=args.odds_ttl, stale_ttl=0)
+
+        def load_odds():
+            # the provider scrapes when it is created, so it is built on the worker thread too
+            return SbrOddsProvider(sportsbook=args.odds, cache=cache).get_odds()
+    try:
+        odds, games, df = asyncio.run(fetch_inputs(load_odds))
+    except asyncio.TimeoutError:
+        return
     if args.odds:
-        odds = SbrOddsProvider(sportsbook=args.odds).get_odds()
-        games = create_todays_games_from_odds(odds)
         if len(games) == 0:
             print("No games found.")
             return
@@ -98,34 +200,44 @@ def main():
             print(Fore.RED,"--------------Games list not up to date for todays games!!! Scraping disabled until list is updated.--------------")
             print(Style.RESET_ALL)
             odds = None
-        else:
+        elif args.output == 'console':
             print(f"------------------{args.odds} odds data------------------")
             for g in odds.keys():
                 home_team, away_team = g.split(":")
                 print(f"{away_team} ({odds[g][away_team]['money_line_odds']}) @ {home_team} ({odds[g][home_team]['money_line_odds']})")
-    else:
-        data = get_todays_games_json(todays_games_url)
-        games = create_todays_games(data)
-    data = get_json_data(data_url)
-    df = to_data_frame(data)
     data, todays_games_uo, frame_ml, home_team_odds, away_team_odds = createTodaysGames(games, df, odds)
+    if args.nn or args.A:
+        tf = timed_import('tensorflow')
+        NN_Runner = timed_import('src.Predict.NN_Runner')
+    if args.xgb or args.A:
+        timed_import('xgboost')
+        XGBoost_Runner = timed_import('src.Predict.XGBoost_Runner')
+    if args.profile_startup:
+        print_startup_profile()
+    console = args.output == 'console'
+    results = {}
+
+    def run_model(title, name, runner, model_data, **options):
+        if console:
+            print(title)
+        results[name] = runner(model_data, todays_games_uo, frame_ml, games, home_team_odds, away_team_odds, args.kc,
+                               renderer=Renderers.render_console if console else None, **options)
+        if console:
+            print("-------------------------------------------------------")
+
+    nn_title = "------------Neural Network Model Predictions-----------"
+    xgb_title = "---------------XGBoost Model Predictions---------------"
     if args.nn:
-        print("------------Neural Network Model Predictions-----------")
-        data = tf.keras.utils.normalize(data, axis=1)
-        NN_Runner.nn_runner(data, todays_games_uo, frame_ml, games, home_team_odds, away_team_odds, args.kc)
-        print("-------------------------------------------------------")
+        run_model(nn_title, 'nn', NN_Runner.nn_runner, tf.keras.utils.normalize(data, axis=1),
+                  report_latency=args.report_latency)
     if args.xgb:
-        print("---------------XGBoost Model Predictions---------------")
-        XGBoost_Runner.xgb_runner(data, todays_games_uo, frame_ml, games, home_team_odds, away_team_odds, args.kc)
-        print("-------------------------------------------------------")
+        run_model(xgb_title, 'xgboost', XGBoost_Runner.xgb_runner, data)
     if args.A:
-        print("---------------XGBoost Model Predictions---------------")
-        XGBoost_Runner.xgb_runner(data, todays_games_uo, frame_ml, games, home_team_odds, away_team_odds, args.kc)
-        print("-------------------------------------------------------")
-        data = tf.keras.utils.normalize(data, axis=1)
-        print("------------Neural Network Model Predictions-----------")
-        NN_Runner.nn_runner(data, todays_games_uo, frame_ml, games, home_team_odds, away_team_odds, args.kc)
-        print("-------------------------------------------------------")
+        run_model(xgb_title, 'xgboost', XGBoost_Runner.xgb_runner, data)
+        run_model(nn_title, 'nn', NN_Runner.nn_runner, tf.keras.utils.normalize(data, axis=1),
+                  report_latency=args.report_latency)
+    if not console and results:
+        Renderers.renderers[args.output](results)
 
 
 if __name__ == "__main__":
@@ -134,6 +246,10 @@ if __name__ == "__main__":
     parser.add_argument('-nn', action='store_true', help='Run with Neural Network Model')
     parser.add_argument('-A', action='store_true', help='Run all Models')
     parser.add_argument('-odds', help='Sportsbook to fetch from. (fanduel, draftkings, betmgm, pointsbet, caesars, wynn, bet_rivers_ny')
+    parser.add_argument('-odds_ttl', type=int, default=600, help='Seconds to reuse scraped odds for, 0 to always scrape')
     parser.add_argument('-kc', action='store_true', help='Calculates percentage of bankroll to bet based on model edge')
+    parser.add_argument('-output', choices=Renderers.renderers.keys(), default='console', help='Output format for the predictions (console, json, csv)')
+    parser.add_argument('--profile-startup', action='store_true', help='Print the time spent importing each dependency')
+    parser.add_argument('--report-latency', action='store_true', help='Print the neural network latency of every batch to stderr')
     args = parser.parse_args()
     main()
@@ -0,0 +1,141 @@
+import os
+import sqlite3
+import threading
+import time
+
+default_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'Data', 'OddsCache.sqlite'))
+line_keys = ('home_ml', 'away_ml', 'total')
+
+
+class OddsCache:
+    """ Scoreboard cache shared by every odds lookup, kept in memory and in a SQLite file so it survives restarts.
+    Lines are stored per (date, sportsbook, game). A scrape younger than ttl seconds is served as is; one that is
+    older, but by no more than stale_ttl, is still served while a background scrape refreshes it. Every change of a
+    line is appended to a history table.
+    """
+
+    def __init__(self, path=default_path, ttl=600, stale_ttl=3600):
+        self.path = path
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.memory = {}
+        self.lock = threading.Lock()
+        self.refreshing = set()
+        con = self.connect()
+        with con:
+            con.execute('create table if not exists odds_fetches (date TEXT PRIMARY KEY, fetched_at REAL)')
+            con.execute('create table if not exists odds_lines (date TEXT, sportsbook TEXT, home_team TEXT, '
+                        'away_team TEXT, home_ml NUMERIC, away_ml NUMERIC, total NUMERIC, '
+                        'primary key (date, sportsbook, home_team, away_team))')
+            con.execute('create table if not exists odds_line_history (date TEXT, sportsbook TEXT, home_team TEXT, '
+                        'away_team TEXT, home_ml NUMERIC, away_ml NUMERIC, total NUMERIC, recorded_at REAL)')
+        con.close()
+
+    def connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get_games(self, date, fetch):
+        """
+        Returns the scoreboard games of a date, calling fetch() for a fresh scrape only when the cached one is
+        missing or too old.
+
+        Returns:
+            list: games in the sbrscrape format (home_team, away_team and home_ml / away_ml / total by sportsbook)
+        """
+        fetched_at, games = self.lookup(date)
+        age = time.time() - fetched_at if games is not None else None
+        if age is not None and age <= self.ttl:
+            return games
+        if age is not None and age <= self.ttl + self.stale_ttl:
+            self.refresh_in_background(date, fetch)
+            return games
+        return self.refresh(date, fetch, fallback=games)
+
+    def lookup(self, date):
+        with self.lock:
+            if date in self.memory:
+                return self.memory[date]
+        con = self.connect()
+        row = con.execute('select fetched_at from odds_fetches where date = ?', (date,)).fetchone()
+        if row is None:
+            con.close()
+            return None, None
+        lines = con.execute('select sportsbook, home_team, away_team, home_ml, away_ml, total from odds_lines '
+                            'where date = ? order by rowid', (date,)).fetchall()
+        con.close()
+        games = {}
+        for sportsbook, home_team, away_team, *values in lines:
+            game = games.setdefault((home_team, away_team), {'home_team': home_team, 'away_team': away_team,
+                                                             **{key: {} for key in line_keys}})
+            for key, value in zip(line_keys, values):
+                if value is not None:
+                    game[key][sportsbook] = value
+        with self.lock:
+            self.memory[date] = (row[0], list(games.values()))
+            return self.memory[date]
+
+    def refresh(self, date, fetch, fallback=None):
+        games = fetch()
+        # an empty scrape is what sbrscrape returns on errors, keep serving what we have and retry next time
+        if not games:
+            return fallback if fallback is not None else []
+        self.store(date, games, time.time())
+        return self.lookup(date)[1]
+
+    def refresh_in_background(self, date, fetch):
+        with self.lock:
+            if date in self.refreshing:
+                return
+            self.refreshing.add(date)
+
+        def run():
+            try:
+                self.refresh(date, fetch)
+            except Exception as e:
+                print(f"Odds refresh failed: {e}")
+            finally:
+                with self.lock:
+                    self.refreshing.discard(date)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def store(self, date, games, fetched_at):
+        """
+        Replaces the lines of a date with a new scrape and logs every line that moved.
+        """
+        rows = []
+        for game in games:
+            # a game no book has lines for yet is kept under an empty sportsbook name
+            sportsbooks = sorted({book for key in line_keys for book in game.get(key, {})}) or ['']
+            for book in sportsbooks:
+                rows.append((date, book, game['home_team'], game['away_team'],
+                             *(game.get(key, {}).get(book) for key in line_keys)))
+        con = self.connect()
+        with con:
+            current = {row[:4]: row[4:] for row in con.execute(
+                'select date, sportsbook, home_team, away_team, home_ml, away_ml, total from odds_lines '
+                'where date = ?', (date,))}
+            changed = [row + (fetched_at,) for row in rows if current.get(row[:4]) != tuple(row[4:])]
+            con.execute('delete from odds_lines where date = ?', (date,))
+            con.executemany('insert or replace into odds_lines values (?, ?, ?, ?, ?, ?, ?)', rows)
+            con.executemany('insert into odds_line_history values (?, ?, ?, ?, ?, ?, ?, ?)', changed)
+            con.execute('insert or replace into odds_fetches values (?, ?)', (date, fetched_at))
+        con.close()
+        with self.lock:
+            self.memory.pop(date, None)
+
+    def history(self, date, sportsbook=None):
+        """
+        Returns:
+            list: (sportsbook, home_team, away_team, home_ml, away_ml, total, recorded_at) rows in recording order
+        """
+        query = 'select sportsbook, home_team, away_team, home_ml, away_ml, total, recorded_at ' \
+                'from odds_line_history where date = ?'
+        params = (date,)
+        if sportsbook is not None:
+            query += ' and sportsbook = ?'
+            params += (sportsbook,)
+        con = self.connect()
+        rows = con.execute(query + ' order by rowid', params).fetchall()
+        con.close()
+        return rows
@@ -1,6 +1,14 @@
+from datetime import datetime
+
+import numpy as np
 from sbrscrape import Scoreboard
 
 
+def scrape_games():
+    sb = Scoreboard(sport="NBA")
+    return sb.games if hasattr(sb, 'games') else []
+
+
 class SbrOddsProvider:
     """ Abbreviations dictionary for team location which are sometimes saved with abbrev instead of full name.
     Moneyline options name require always full name
@@ -8,17 +16,21 @@ class SbrOddsProvider:
         string: Full location name
     """
 
-    def __init__(self, sportsbook="fanduel"):
-        sb = Scoreboard(sport="NBA")
-        self.games = sb.games if hasattr(sb, 'games') else []
+    def __init__(self, sportsbook="fanduel", cache=None):
+        if cache is None:
+            self.games = scrape_games()
+        else:
+            self.games = cache.get_games(datetime.today().strftime("%Y-%m-%d"), scrape_games)
         self.sportsbook = sportsbook
 
-    def get_odds(self):
-        """Function returning odds from Sbr server's json content
+    def get_odds(self, sportsbook=None):
+        """Function returning odds from Sbr server's json content, for the provider's sportsbook unless another
+        one is given
 
         Returns:
             dictionary: [home_team_name + ':' + away_team_name: { home_team: money_line_odds, away_team: money_line_odds }, under_over_odds: val]
         """
+        sportsbook = sportsbook or self.sportsbook
         dict_res = {}
         for game in self.games:
             # Get team names
@@ -28,14 +40,14 @@ class SbrOddsProvider:
             money_line_home_value = money_line_away_value = totals_value = None
 
             # Get money line bet values
-            if self.sportsbook in game['home_ml']:
-                money_line_home_value = game['home_ml'][self.sportsbook]
-            if self.sportsbook in game['away_ml']:
-                money_line_away_value = game['away_ml'][self.sportsbook]
+            if sportsbook in game['home_ml']:
+                money_line_home_value = game['home_ml'][sportsbook]
+            if sportsbook in game['away_ml']:
+                money_line_away_value = game['away_ml'][sportsbook]
 
             # Get totals bet value
-            if self.sportsbook in game['total']:
-                totals_value = game['total'][self.sportsbook]
+            if sportsbook in game['total']:
+                totals_value = game['total'][sportsbook]
 
             dict_res[home_team_name + ':' + away_team_name] = {
                 'under_over_odds': totals_value,
@@ -43,3 +55,35 @@ class SbrOddsProvider:
                 away_team_name: {'money_line_odds': money_line_away_value}
             }
         return dict_res
+
+    def get_all_odds(self, sportsbooks=None):
+        """Odds of every game at every sportsbook from the one scoreboard fetch, with the best line available
+        across the books. Higher American odds pay more on either side; the lowest total is best for the over and
+        the highest for the under.
+
+        Returns:
+            dictionary: games ([home_team_name, away_team_name] per row), sportsbooks (one per column),
+            home_ml / away_ml / total (games x sportsbooks arrays, NaN where a book has no line), and per game
+            best_home_ml, best_away_ml, best_over_total, best_under_total with the *_book offering each
+        """
+        if sportsbooks is None:
+            sportsbooks = sorted({book for game in self.games for key in ('home_ml', 'away_ml', 'total')
+                                  for book in game[key]})
+        games = [[game['home_team'].replace("Los Angeles Clippers", "LA Clippers"),
+                  game['away_team'].replace("Los Angeles Clippers", "LA Clippers")] for game in self.games]
+        odds = {'games': games, 'sportsbooks': list(sportsbooks)}
+        for key in ('home_ml', 'away_ml', 'total'):
+            odds[key] = np.array([[game[key].get(book) for book in sportsbooks] for game in self.games],
+                                 dtype=np.float64).reshape(len(games), len(sportsbooks))
+
+        for name, key, pick in (('best_home_ml', 'home_ml', np.fmax), ('best_away_ml', 'away_ml', np.fmax),
+                                ('best_over_total', 'total', np.fmin), ('best_under_total', 'total', np.fmax)):
+            lines = odds[key]
+            best = pick.reduce(lines, axis=1, initial=np.nan) if lines.size else np.full(len(games), np.nan)
+            has_line = ~np.isnan(best)
+            # first book offering the best line
+            column = np.argmax(lines == best[:, None], axis=1) if lines.size else np.zeros(len(games), dtype=int)
+            odds[name] = best
+            odds[name.replace('_ml', '').replace('_total', '') + '_book'] = \
+                [sportsbooks[i] if found else None for i, found in zip(column, has_line)]
+        return odds
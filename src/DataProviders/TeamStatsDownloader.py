@@ -0,0 +1,141 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.Utils import Team_Stats_Store
+from src.Utils.tools import data_headers, to_data_frame
+
+retry_status_codes = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """ Thread-safe token bucket limiting how many requests start per second across all workers.
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class TeamStatsDownloader:
+    """ Downloads daily team stats snapshots for every date of the configured seasons.
+    Requests go through one pooled session from a bounded worker pool, paced by a token bucket and retried with
+    exponential backoff. Every stored date is recorded in a checkpoint table so reruns skip it.
+    """
+
+    def __init__(self, con, url, workers=4, rate=1.0, retries=5, backoff=2.0, timeout=30):
+        self.con = con
+        self.url = url
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.bucket = TokenBucket(rate, capacity=workers)
+        self.session = requests.Session()
+        self.session.headers.update(data_headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.con.execute('create table if not exists completed_dates (season TEXT, date TEXT PRIMARY KEY)')
+
+    def completed_dates(self):
+        return {row[0] for row in self.con.execute('select date from completed_dates')}
+
+    def jobs(self, seasons):
+        """
+        Lists the (season, season config, fetch date, table date) jobs for the seasons in config['get-data'] format that are
+        not yet checkpointed. Stats fetched through a date are stored under the following day.
+        """
+        completed = self.completed_dates()
+        jobs = []
+        for key, value in seasons.items():
+            date_pointer = datetime.strptime(value['start_date'], "%Y-%m-%d").date()
+            end_date = datetime.strptime(value['end_date'], "%Y-%m-%d").date()
+            while date_pointer <= end_date:
+                table_date = str(date_pointer + timedelta(days=1))
+                if table_date not in completed:
+                    jobs.append((key, value, date_pointer, table_date))
+                date_pointer = date_pointer + timedelta(days=1)
+        return jobs
+
+    def fetch(self, url):
+        """
+        GETs a stats.nba.com URL, retrying connection errors, throttling and server errors with backoff.
+
+        Returns:
+            list: the response's resultSets
+        """
+        error = None
+        for attempt in range(self.retries + 1):
+            self.bucket.acquire()
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+                if response.status_code == 200:
+                    result_sets = response.json().get('resultSets')
+                    if result_sets:
+                        return result_sets
+                    error = "response has no resultSets"
+                else:
+                    error = f"HTTP {response.status_code}"
+                    if response.status_code not in retry_status_codes:
+                        break
+            except (requests.RequestException, ValueError) as e:
+                error = e
+            if attempt < self.retries:
+                time.sleep(self.backoff * 2 ** attempt * random.uniform(0.5, 1.5))
+        raise RuntimeError(f"Giving up on {url}: {error}")
+
+    def fetch_day(self, key, value, date_pointer):
+        raw_data = self.fetch(
+            self.url.format(date_pointer.month, date_pointer.day, value['start_year'], date_pointer.year, key))
+        return to_data_frame(raw_data)
+
+    def store(self, key, table_date, df):
+        Team_Stats_Store.write_snapshot(self.con, table_date, df)
+        with self.con:
+            self.con.execute('insert or replace into completed_dates values (?, ?)', (key, table_date))
+
+    def run(self, seasons):
+        """
+        Downloads every missing date. Results are written from the calling thread as they arrive, so one sqlite
+        connection is enough; dates that still fail after all retries are reported and left for the next run.
+
+        Returns:
+            list: table dates that failed
+        """
+        jobs = self.jobs(seasons)
+        failed = []
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self.fetch_day, key, value, date_pointer): (key, table_date)
+                       for key, value, date_pointer, table_date in jobs}
+            for future in as_completed(futures):
+                key, table_date = futures[future]
+                try:
+                    df = future.result()
+                except RuntimeError as e:
+                    print(e)
+                    failed.append(table_date)
+                    continue
+                print("Got data: ", table_date)
+                self.store(key, table_date, df)
+        return failed
@@ -0,0 +1,235 @@
+import argparse
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from src.Utils import Expected_Value, Feature_Store, Games_Dataset
+from src.Utils import Kelly_Criterion as kc
+
+data_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'Data'))
+# walk forward retraining uses the parameters of XGBoost_Model_ML
+ml_params = {'max_depth': 3, 'eta': 0.01, 'objective': 'multi:softprob', 'num_class': 2}
+ml_epochs = 750
+
+
+def align_odds(con, odds_con, features):
+    """
+    Looks up the money lines of every dataset row. Create_Games records the season, Date, Home and Away of the
+    odds row each dataset row was built from, so the odds are joined on that key and placed by the dataset index,
+    whatever order the rows were appended in.
+
+    Returns:
+        tuple: (home odds, away odds) arrays, NaN for rows without a record or an odds table
+    """
+    home_odds = np.full(len(features), np.nan)
+    away_odds = np.full(len(features), np.nan)
+    built = Games_Dataset.read_built_games(con, features.metadata['dataset']).dropna(subset=['index'])
+    tables = {name for (name,) in odds_con.execute("select name from sqlite_master where type = 'table'")}
+    rows = pd.Index(features.index)
+    for season, season_built in built.groupby('season'):
+        if f"odds_{season}_new" not in tables:
+            continue
+        odds_df = pd.read_sql_query(f"select * from \"odds_{season}_new\"", odds_con)
+        odds_df = odds_df[Games_Dataset.game_keys + ['ML_Home', 'ML_Away']].drop_duplicates(Games_Dataset.game_keys)
+        matched = season_built.merge(odds_df, on=Games_Dataset.game_keys)
+        positions = rows.get_indexer(matched['index'].astype(np.int64))
+        found = positions >= 0
+        home_odds[positions[found]] = pd.to_numeric(matched['ML_Home'], errors='coerce').values[found]
+        away_odds[positions[found]] = pd.to_numeric(matched['ML_Away'], errors='coerce').values[found]
+    unrecorded = len(features) - rows.isin(built['index']).sum()
+    if unrecorded:
+        print(f"{unrecorded} dataset rows have no record of their odds row and are not bet on, "
+              f"rebuild the dataset with Create_Games -full")
+    return home_odds, away_odds
+
+
+def score_registry(features, family):
+    """
+    Scores every row with the active models of a family, as main.py would score a slate.
+
+    Returns:
+        numpy array: home win probability per row
+    """
+    if family == 'xgboost':
+        from src.Predict import XGBoost_Runner
+        predictions = XGBoost_Runner.predict_slate(features.ml_features(), features.ou_features()[:, -1])
+    else:
+        import tensorflow as tf
+        from src.Predict import NN_Runner
+        predictions = NN_Runner.predict_slate(tf.keras.utils.normalize(features.ml_features(), axis=1),
+                                              tf.keras.utils.normalize(features.ou_features(), axis=1))
+    return predictions['ml_proba'][:, 1].astype(np.float64)
+
+
+def walk_forward(features, first_season=None):
+    """
+    Trains the money line model on all seasons before each test season and scores that season with it.
+
+    Returns:
+        numpy array: home win probability per row, NaN for the seasons only used for training
+    """
+    import xgboost as xgb
+    seasons = sorted(features.seasons)
+    first_season = first_season or seasons[1]
+    labels = features.labels['Home-Team-Win']
+    home_proba = np.full(len(features), np.nan)
+    for season in seasons[seasons.index(first_season):]:
+        start, stop = features.seasons[season]
+        train = xgb.QuantileDMatrix(features.ml_features(slice(0, start)), label=labels[:start])
+        model = xgb.train(ml_params, train, ml_epochs)
+        home_proba[start:stop] = model.inplace_predict(features.ml_features(slice(start, stop)))[:, 1]
+        print(f"{season}: trained on {start} games, scored {stop - start}")
+    return home_proba
+
+
+def simulate(home_proba, home_win, home_odds, away_odds, dates, kelly_scale=1.0):
+    """
+    Bets the side with the higher positive expected value of every game, once with a flat unit stake and once
+    with the Kelly fraction of a compounding bankroll. Games of the same day are staked from the same bankroll,
+    scaled down if their fractions add up to more than all of it.
+
+    Returns:
+        dictionary: per game arrays (bet, won, returns, stake) and the flat and Kelly equity curves
+    """
+    home_win = np.asarray(home_win) == 1
+    home_ev = Expected_Value.expected_value_array(home_proba, home_odds)
+    away_ev = Expected_Value.expected_value_array(1 - home_proba, away_odds)
+    home_ev = np.where(np.isnan(home_ev), -np.inf, home_ev)
+    away_ev = np.where(np.isnan(away_ev), -np.inf, away_ev)
+
+    home_side = home_ev >= away_ev
+    bet = np.maximum(home_ev, away_ev) > 0
+    odds = np.where(home_side, home_odds, away_odds)
+    proba = np.where(home_side, home_proba, 1 - home_proba)
+    won = home_side == home_win
+    # profit per unit staked
+    returns = np.where(bet, np.where(won, Expected_Value.payout_array(odds) / 100, -1.0), 0.0)
+
+    stake = np.where(bet, kc.calculate_kelly_criterion_array(odds, proba) / 100 * kelly_scale, 0.0)
+    stake = np.nan_to_num(stake)
+    order = np.argsort(dates, kind='stable')
+    sorted_dates = np.asarray(dates)[order]
+    day_starts = np.flatnonzero(np.r_[True, sorted_dates[1:] != sorted_dates[:-1]])
+    day_stake = np.add.reduceat(stake[order], day_starts)
+    day_return = np.add.reduceat(stake[order] * returns[order], day_starts) / np.maximum(day_stake, 1)
+
+    return {
+        'bet': bet,
+        'won': won,
+        'returns': returns,
+        'stake': stake,
+        'flat_equity': np.cumsum(returns[order]),
+        'kelly_equity': np.cumprod(1 + day_return),
+    }
+
+
+def max_drawdown(equity, start=0.0, relative=False):
+    peak = np.maximum.accumulate(np.r_[start, equity])[1:]
+    drawdown = (peak - equity) / peak if relative else peak - equity
+    return float(drawdown.max()) if len(drawdown) else 0.0
+
+
+def calibration(proba, outcome, bins=10):
+    """
+    Returns:
+        tuple: (DataFrame of count, mean predicted and observed rate per probability bin, Brier score)
+    """
+    outcome = np.asarray(outcome, dtype=np.float64)
+    index = np.clip(np.digitize(proba, np.linspace(0, 1, bins + 1)[1:-1]), 0, bins - 1)
+    count = np.bincount(index, minlength=bins)
+    with np.errstate(invalid='ignore'):
+        table = pd.DataFrame({
+            'bin': [f"{i / bins:.1f}-{(i + 1) / bins:.1f}" for i in range(bins)],
+            'games': count,
+            'predicted': np.bincount(index, proba, minlength=bins) / count,
+            'observed': np.bincount(index, outcome, minlength=bins) / count,
+        })
+    return table[table['games'] > 0], float(np.mean((proba - outcome) ** 2))
+
+
+def report(features, home_proba, home_odds, away_odds, kelly_scale=1.0):
+    """
+    Summarizes a replay per season and overall: accuracy, flat staking ROI and drawdown, Kelly bankroll growth
+    and drawdown, and calibration of the home win probabilities.
+
+    Returns:
+        tuple: (per season DataFrame, totals dictionary, calibration DataFrame)
+    """
+    scored = ~np.isnan(home_proba)
+    home_win = features.labels['Home-Team-Win'][scored]
+    proba = home_proba[scored]
+    dates = features.dates[scored]
+    result = simulate(proba, home_win, home_odds[scored], away_odds[scored], dates, kelly_scale)
+
+    seasons = Feature_Store.season_of(dates)
+    names, codes = np.unique(seasons, return_inverse=True)
+    correct = (proba > 0.5) == (home_win == 1)
+    bets = np.bincount(codes, result['bet'], minlength=len(names))
+    profit = np.bincount(codes, result['returns'], minlength=len(names))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        per_season = pd.DataFrame({
+            'season': names,
+            'games': np.bincount(codes, minlength=len(names)),
+            'accuracy': np.bincount(codes, correct, minlength=len(names)) / np.bincount(codes, minlength=len(names)),
+            'bets': bets.astype(int),
+            'flat_profit': profit,
+            'flat_roi': profit / bets,
+        })
+
+    calibration_table, brier = calibration(proba, home_win)
+    total_bets = int(result['bet'].sum())
+    totals = {
+        'games': int(scored.sum()),
+        'accuracy': float(correct.mean()) if len(correct) else np.nan,
+        'brier': brier,
+        'bets': total_bets,
+        'flat_profit': float(result['returns'].sum()),
+        'flat_roi': float(result['returns'].sum() / total_bets) if total_bets else np.nan,
+        'flat_max_drawdown': max_drawdown(result['flat_equity']),
+        'kelly_bankroll': float(result['kelly_equity'][-1]) if len(result['kelly_equity']) else 1.0,
+        'kelly_max_drawdown': max_drawdown(result['kelly_equity'], start=1.0, relative=True),
+    }
+    return per_season, totals, calibration_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay historical seasons and simulate betting on the picks')
+    parser.add_argument('-xgb', action='store_true', help='Score with the active XGBoost models')
+    parser.add_argument('-nn', action='store_true', help='Score with the active neural network models')
+    parser.add_argument('-retrain', action='store_true',
+                        help='Walk forward: retrain the XGBoost money line model before every test season')
+    parser.add_argument('-start', help='First test season of a walk forward replay, e.g. 2015-16')
+    parser.add_argument('-dataset', default='dataset_2012-24_new', help='Dataset table of dataset.sqlite')
+    parser.add_argument('-kc', type=float, default=1.0, help='Fraction of the Kelly stake to bet')
+    args = parser.parse_args()
+
+    con = sqlite3.connect(os.path.join(data_dir, 'dataset.sqlite'))
+    features = Feature_Store.load(con, args.dataset)
+    odds_con = sqlite3.connect(os.path.join(data_dir, 'OddsData.sqlite'))
+    home_odds, away_odds = align_odds(con, odds_con, features)
+    odds_con.close()
+    con.close()
+
+    replays = {}
+    if args.retrain:
+        replays['Walk forward XGBoost'] = walk_forward(features, args.start)
+    if args.xgb:
+        replays['XGBoost (active models, seen in training)'] = score_registry(features, 'xgboost')
+    if args.nn:
+        replays['Neural network (active models, seen in training)'] = score_registry(features, 'nn')
+    if not replays:
+        parser.error('choose at least one of -retrain, -xgb, -nn')
+
+    for title, home_proba in replays.items():
+        per_season, totals, calibration_table = report(features, home_proba, home_odds, away_odds, args.kc)
+        print(f"------------{title}------------")
+        print(per_season.to_string(index=False, float_format='{:.3f}'.format))
+        print(calibration_table.to_string(index=False, float_format='{:.3f}'.format))
+        for name, value in totals.items():
+            print(f"{name}: {value:.4g}" if isinstance(value, float) else f"{name}: {value}")
+
+
+if __name__ == '__main__':
+    main()
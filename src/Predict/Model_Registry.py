@@ -0,0 +1,112 @@
+import os
+import re
+import threading
+
+import toml
+
+models_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../Models'))
+manifest_path = os.path.join(models_dir, 'manifest.toml')
+
+# family: (directory under Models/, artifact name pattern)
+families = {
+    'xgboost': ('XGBoost_Models', re.compile(r'^XGBoost_(?P<score>[\d.]+)%_(?P<kind>ML|UO)-\d+\.json$')),
+    'nn': ('NN_Models', re.compile(r'^Trained-Model-(?P<kind>ML|OU)-(?P<score>[\d.]+)$')),
+}
+kind_aliases = {'ML': 'ML', 'OU': 'OU', 'UO': 'OU'}
+
+manifest = None
+active_paths = {}
+loaded_models = {}
+lock = threading.Lock()
+
+
+def load_xgboost(path):
+    import xgboost as xgb
+    booster = xgb.Booster()
+    booster.load_model(path)
+    return booster
+
+
+def load_nn(path):
+    from keras.models import load_model
+    return load_model(path)
+
+
+loaders = {'xgboost': load_xgboost, 'nn': load_nn}
+
+
+def discover():
+    """
+    Scans Models/ for trained artifacts.
+
+    Returns:
+        dictionary: {(family, kind): [(score, artifact name), ...]} sorted best first, where score is the
+        accuracy for XGBoost models and the training timestamp for neural networks
+    """
+    artifacts = {}
+    for family, (directory, pattern) in families.items():
+        family_dir = os.path.join(models_dir, directory)
+        if not os.path.isdir(family_dir):
+            continue
+        for name in os.listdir(family_dir):
+            match = pattern.match(name)
+            if match:
+                key = (family, kind_aliases[match.group('kind')])
+                artifacts.setdefault(key, []).append((float(match.group('score')), name))
+    for candidates in artifacts.values():
+        candidates.sort(reverse=True)
+    return artifacts
+
+
+def read_manifest():
+    """
+    Parses manifest.toml on first use and returns the cached copy afterwards.
+    """
+    global manifest
+    if manifest is None:
+        manifest = toml.load(manifest_path) if os.path.exists(manifest_path) else {}
+    return manifest
+
+
+def active_artifact(family, kind):
+    """
+    Returns the path of the artifact the manifest marks active, falling back to the best discovered one.
+    """
+    kind = kind_aliases[kind.upper()]
+    directory = families[family][0]
+    name = read_manifest().get(family, {}).get(kind)
+    if name is None:
+        candidates = discover().get((family, kind))
+        if not candidates:
+            raise FileNotFoundError(f"No {family} {kind} model found under {os.path.join(models_dir, directory)}, "
+                                    f"train one or list it in {manifest_path}")
+        name = candidates[0][1]
+    path = os.path.join(models_dir, directory, name)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Active {family} {kind} model {path} does not exist, check {manifest_path}")
+    return path
+
+
+def get_model(family, kind):
+    """
+    Loads the active model of a family on first use and returns the cached instance afterwards.
+    """
+    key = (family, kind_aliases[kind.upper()])
+    with lock:
+        if key not in active_paths:
+            active_paths[key] = active_artifact(family, kind)
+        path = active_paths[key]
+        if path not in loaded_models:
+            loaded_models[path] = loaders[family](path)
+        return loaded_models[path]
+
+
+def preload(family):
+    """
+    Loads both the money line and under/over models of a family up front, checking that both exist before
+    loading either.
+    """
+    for kind in ('ML', 'OU'):
+        active_artifact(family, kind)
+    for kind in ('ML', 'OU'):
+        get_model(family, kind)
@@ -1,83 +1,83 @@
-import copy
+import sys
+import time
 
 import numpy as np
 import tensorflow as tf
-from colorama import Fore, Style, init, deinit
-from keras.models import load_model
-
-from src.Utils import Expected_Value
-from src.Utils import Kelly_Criterion as kc
-
-init()
-model = load_model('Models/NN_Models/Trained-Model-ML-1699315388.285516')
-ou_model = load_model("Models/NN_Models/Trained-Model-OU-1699315414.2268295")
-
-
-def nn_runner(data, todays_games_uo, frame_ml, games, home_team_odds, away_team_odds, kelly_criterion):
-    ml_predictions_array = []
-
-    for row in data:
-        ml_predictions_array.append(model.predict(np.array([row])))
-
-    frame_uo = copy.deepcopy(frame_ml)
-    frame_uo['OU'] = np.asarray(todays_games_uo)
-    data = frame_uo.values
-    data = data.astype(float)
-    data = tf.keras.utils.normalize(data, axis=1)
-
-    ou_predictions_array = []
-
-    for row in data:
-        ou_predictions_array.append(ou_model.predict(np.array([row])))
-
-    count = 0
-    for game in games:
-        home_team = game[0]
-        away_team = game[1]
-        winner = int(np.argmax(ml_predictions_array[count]))
-        under_over = int(np.argmax(ou_predictions_array[count]))
-        winner_confidence = ml_predictions_array[count]
-        un_confidence = ou_predictions_array[count]
-        if winner == 1:
-            winner_confidence = round(winner_confidence[0][1] * 100, 1)
-            if under_over == 0:
-                un_confidence = round(ou_predictions_array[count][0][0] * 100, 1)
-                print(Fore.GREEN + home_team + Style.RESET_ALL + Fore.CYAN + f" ({winner_confidence}%)" + Style.RESET_ALL + ' vs ' + Fore.RED + away_team + Style.RESET_ALL + ': ' +
-                      Fore.MAGENTA + 'UNDER ' + Style.RESET_ALL + str(todays_games_uo[count]) + Style.RESET_ALL + Fore.CYAN + f" ({un_confidence}%)" + Style.RESET_ALL)
-            else:
-                un_confidence = round(ou_predictions_array[count][0][1] * 100, 1)
-                print(Fore.GREEN + home_team + Style.RESET_ALL + Fore.CYAN + f" ({winner_confidence}%)" + Style.RESET_ALL + ' vs ' + Fore.RED + away_team + Style.RESET_ALL + ': ' +
-                      Fore.BLUE + 'OVER ' + Style.RESET_ALL + str(todays_games_uo[count]) + Style.RESET_ALL + Fore.CYAN + f" ({un_confidence}%)" + Style.RESET_ALL)
-        else:
-            winner_confidence = round(winner_confidence[0][0] * 100, 1)
-            if under_over == 0:
-                un_confidence = round(ou_predictions_array[count][0][0] * 100, 1)
-                print(Fore.RED + home_team + Style.RESET_ALL + ' vs ' + Fore.GREEN + away_team + Style.RESET_ALL + Fore.CYAN + f" ({winner_confidence}%)" + Style.RESET_ALL + ': ' +
-                      Fore.MAGENTA + 'UNDER ' + Style.RESET_ALL + str(todays_games_uo[count]) + Style.RESET_ALL + Fore.CYAN + f" ({un_confidence}%)" + Style.RESET_ALL)
-            else:
-                un_confidence = round(ou_predictions_array[count][0][1] * 100, 1)
-                print(Fore.RED + home_team + Style.RESET_ALL + ' vs ' + Fore.GREEN + away_team + Style.RESET_ALL + Fore.CYAN + f" ({winner_confidence}%)" + Style.RESET_ALL + ': ' +
-                      Fore.BLUE + 'OVER ' + Style.RESET_ALL + str(todays_games_uo[count]) + Style.RESET_ALL + Fore.CYAN + f" ({un_confidence}%)" + Style.RESET_ALL)
-        count += 1
-    if kelly_criterion:
-        print("------------Expected Value & Kelly Criterion-----------")
-    else:
-        print("---------------------Expected Value--------------------")
-    count = 0
-    for game in games:
-        home_team = game[0]
-        away_team = game[1]
-        ev_home = ev_away = 0
-        if home_team_odds[count] and away_team_odds[count]:
-            ev_home = float(Expected_Value.expected_value(ml_predictions_array[count][0][1], int(home_team_odds[count])))
-            ev_away = float(Expected_Value.expected_value(ml_predictions_array[count][0][0], int(away_team_odds[count])))
-        expected_value_colors = {'home_color': Fore.GREEN if ev_home > 0 else Fore.RED, 'away_color': Fore.GREEN if ev_away > 0 else Fore.RED}
-        bankroll_descriptor = ' Fraction of Bankroll: '
-        bankroll_fraction_home = bankroll_descriptor + str(kc.calculate_kelly_criterion(home_team_odds[count], ml_predictions_array[count][0][1])) + '%'
-        bankroll_fraction_away = bankroll_descriptor + str(kc.calculate_kelly_criterion(away_team_odds[count], ml_predictions_array[count][0][0])) + '%'
-
-        print(home_team + ' EV: ' + expected_value_colors['home_color'] + str(ev_home) + Style.RESET_ALL + (bankroll_fraction_home if kelly_criterion else ''))
-        print(away_team + ' EV: ' + expected_value_colors['away_color'] + str(ev_away) + Style.RESET_ALL + (bankroll_fraction_away if kelly_criterion else ''))
-        count += 1
-
-    deinit()
+
+from src.Predict import Model_Registry
+from src.Predict.Predictions import build_results, to_prediction_array
+from src.Predict.Renderers import render_console
+
+batch_size = 256
+forward_passes = {}
+
+
+def forward_pass(model, n_features):
+    """
+    Returns a compiled forward pass for the model, traced once for a fixed batch shape.
+    """
+    key = (id(model), n_features)
+    if key not in forward_passes:
+        forward_passes[key] = tf.function(
+            lambda x: model(x, training=False),
+            input_signature=[tf.TensorSpec(shape=(batch_size, n_features), dtype=tf.float32)])
+    return forward_passes[key]
+
+
+def predict_batched(model, data):
+    """
+    Runs inference over any number of rows in fixed-size batches, padding the last one so the
+    compiled forward pass is never retraced.
+
+    Returns:
+        tuple: (predictions array, list of per-batch latencies in milliseconds)
+    """
+    data = np.asarray(data, dtype=np.float32)
+    forward = forward_pass(model, data.shape[1])
+    predictions = np.empty((len(data), model.output_shape[-1]), dtype=np.float32)
+    batch = np.zeros((batch_size, data.shape[1]), dtype=np.float32)
+    latencies = []
+
+    for start in range(0, len(data), batch_size):
+        stop = min(start + batch_size, len(data))
+        batch[:stop - start] = data[start:stop]
+        batch_start = time.perf_counter()
+        predictions[start:stop] = forward(batch).numpy()[:stop - start]
+        latencies.append((time.perf_counter() - batch_start) * 1000)
+
+    return predictions, latencies
+
+
+def predict_slate(ml_data, ou_data, report_latency=False):
+    """
+    Scores every game with the money line and under/over models, both inputs already normalized. Batch latencies
+    go to stderr, so they never mix with JSON or CSV output.
+    """
+    model = Model_Registry.get_model('nn', 'ML')
+    ou_model = Model_Registry.get_model('nn', 'OU')
+    ml_predictions, ml_latencies = predict_batched(model, ml_data)
+    ou_predictions, ou_latencies = predict_batched(ou_model, ou_data)
+    if report_latency:
+        for name, latencies in (('ML', ml_latencies), ('OU', ou_latencies)):
+            print(f"{name} model: {len(latencies)} batch(es), " + ', '.join(f'{ms:.1f}ms' for ms in latencies),
+                  file=sys.stderr)
+    return to_prediction_array(ml_predictions, ou_predictions)
+
+
+def nn_runner(data, todays_games_uo, frame_ml, games, home_team_odds, away_team_odds, kelly_criterion,
+              renderer=render_console, report_latency=False):
+    """
+    Scores today's games and hands the results to a renderer, the colored console output by default. With
+    report_latency the time taken by every inference batch is printed to stderr too.
+
+    Returns:
+        numpy structured array of Predictions.result_dtype
+    """
+    ou_data = np.column_stack([frame_ml.values.astype(float), np.asarray(todays_games_uo, dtype=float)])
+    ou_data = tf.keras.utils.normalize(ou_data, axis=1)
+
+    predictions = predict_slate(data, ou_data, report_latency=report_latency)
+    results = build_results(predictions, games, todays_games_uo, home_team_odds, away_team_odds)
+    if renderer is not None:
+        renderer(results, kelly_criterion)
+    return results
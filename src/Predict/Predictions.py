@@ -0,0 +1,85 @@
+import numpy as np
+
+from src.Utils import Expected_Value
+from src.Utils import Kelly_Criterion as kc
+
+# One record per game: class probabilities for the money line (away, home) and
+# under/over (under, over, push) models, plus the arg max picks.
+prediction_dtype = np.dtype([
+    ('ml_proba', np.float32, (2,)),
+    ('ou_proba', np.float32, (3,)),
+    ('winner', np.int8),
+    ('under_over', np.int8),
+])
+
+# Model output joined with the game, its lines and everything derived from them. Missing odds are NaN.
+result_dtype = np.dtype([
+    ('home_team', 'U32'),
+    ('away_team', 'U32'),
+    ('ou_line', np.float64),
+    ('home_odds', np.float64),
+    ('away_odds', np.float64),
+] + prediction_dtype.descr + [
+    ('winner_confidence', np.float64),
+    ('ou_confidence', np.float64),
+    ('home_ev', np.float64),
+    ('away_ev', np.float64),
+    ('home_kelly', np.float64),
+    ('away_kelly', np.float64),
+])
+
+
+def to_prediction_array(ml_predictions, ou_predictions):
+    """
+    Packs batched model outputs into a structured array with one record per game.
+    """
+    ml_predictions = np.asarray(ml_predictions, dtype=np.float32)
+    ou_predictions = np.asarray(ou_predictions, dtype=np.float32)
+    predictions = np.zeros(len(ml_predictions), dtype=prediction_dtype)
+    predictions['ml_proba'] = ml_predictions
+    predictions['ou_proba'][:, :ou_predictions.shape[1]] = ou_predictions
+    predictions['winner'] = np.argmax(ml_predictions, axis=1)
+    predictions['under_over'] = np.argmax(ou_predictions, axis=1)
+    return predictions
+
+
+def to_float_array(values):
+    """
+    Converts odds or lines as they come from the provider or user input (numbers, strings, None) to floats.
+    """
+    if isinstance(values, np.ndarray) and values.dtype.kind == 'f':
+        return values.astype(np.float64)
+    return np.array([float(value) if value not in (None, '') else np.nan for value in values], dtype=np.float64)
+
+
+def build_results(predictions, games, todays_games_uo, home_team_odds, away_team_odds):
+    """
+    Computes picks, confidence, expected value and Kelly fractions for every game of a slate.
+
+    Returns:
+        numpy structured array of result_dtype, one record per game
+    """
+    results = np.zeros(len(predictions), dtype=result_dtype)
+    for field in prediction_dtype.names:
+        results[field] = predictions[field]
+    results['home_team'] = [game[0] for game in games]
+    results['away_team'] = [game[1] for game in games]
+    results['ou_line'] = to_float_array(todays_games_uo)
+    results['home_odds'] = to_float_array(home_team_odds)
+    results['away_odds'] = to_float_array(away_team_odds)
+
+    ml_proba = results['ml_proba'].astype(np.float64)
+    ou_proba = results['ou_proba'].astype(np.float64)
+    rows = np.arange(len(results))
+    results['winner_confidence'] = np.round(ml_proba[rows, results['winner']] * 100, 1)
+    # anything but an under pick is shown as an over
+    results['ou_confidence'] = np.round(ou_proba[rows, np.where(results['under_over'] == 0, 0, 1)] * 100, 1)
+
+    home_odds, away_odds = results['home_odds'], results['away_odds']
+    # EV and Kelly fractions are only shown when both sides have a line
+    has_odds = (home_odds != 0) & (away_odds != 0) & ~np.isnan(home_odds) & ~np.isnan(away_odds)
+    results['home_ev'] = np.where(has_odds, Expected_Value.expected_value_array(ml_proba[:, 1], home_odds), np.nan)
+    results['away_ev'] = np.where(has_odds, Expected_Value.expected_value_array(ml_proba[:, 0], away_odds), np.nan)
+    results['home_kelly'] = np.where(has_odds, kc.calculate_kelly_criterion_array(home_odds, ml_proba[:, 1]), np.nan)
+    results['away_kelly'] = np.where(has_odds, kc.calculate_kelly_criterion_array(away_odds, ml_proba[:, 0]), np.nan)
+    return results
@@ -0,0 +1,121 @@
+import csv
+import io
+import json
+
+import numpy as np
+from colorama import Fore, Style, init, deinit
+
+
+def format_number(value):
+    """
+    Formats EV and Kelly values the way the console has always shown them, with 0 for missing values.
+    """
+    if np.isnan(value) or value == 0:
+        return '0'
+    return str(float(value))
+
+
+def to_records(results):
+    """
+    Converts a results array into a list of plain dicts, with picks spelled out and NaN as None.
+
+    Returns:
+        list: [{home_team, away_team, home_team_odds, away_team_odds, ou_value, home_win_proba, away_win_proba,
+        under_proba, over_proba, winner, winner_confidence, ou_pick, ou_confidence, home_team_ev, away_team_ev,
+        home_team_kelly, away_team_kelly}, ...]
+    """
+    def number(value):
+        return None if np.isnan(value) else float(value)
+
+    records = []
+    for result in results:
+        records.append({
+            'home_team': str(result['home_team']),
+            'away_team': str(result['away_team']),
+            'home_team_odds': number(result['home_odds']),
+            'away_team_odds': number(result['away_odds']),
+            'ou_value': number(result['ou_line']),
+            'home_win_proba': float(result['ml_proba'][1]),
+            'away_win_proba': float(result['ml_proba'][0]),
+            'under_proba': float(result['ou_proba'][0]),
+            'over_proba': float(result['ou_proba'][1]),
+            'winner': str(result['home_team'] if result['winner'] == 1 else result['away_team']),
+            'winner_confidence': float(result['winner_confidence']),
+            'ou_pick': 'UNDER' if result['under_over'] == 0 else 'OVER',
+            'ou_confidence': float(result['ou_confidence']),
+            'home_team_ev': number(result['home_ev']),
+            'away_team_ev': number(result['away_ev']),
+            'home_team_kelly': number(result['home_kelly']),
+            'away_team_kelly': number(result['away_kelly']),
+        })
+    return records
+
+
+def to_json(results):
+    """
+    Serializes a results array, or a {model name: results array} dictionary, to JSON.
+    """
+    if isinstance(results, dict):
+        return json.dumps({model: to_records(model_results) for model, model_results in results.items()}, indent=4)
+    return json.dumps(to_records(results), indent=4)
+
+
+def to_csv(results):
+    """
+    Serializes a results array, or a {model name: results array} dictionary with a leading model column, to CSV.
+    """
+    if not isinstance(results, dict):
+        results = {None: results}
+    rows = []
+    for model, model_results in results.items():
+        for record in to_records(model_results):
+            rows.append(record if model is None else {'model': model, **record})
+    output = io.StringIO()
+    if rows:
+        writer = csv.DictWriter(output, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+    return output.getvalue()
+
+
+def render_console(results, kelly_criterion):
+    """
+    Prints colored picks followed by expected value (and Kelly fractions) for every game.
+    """
+    init()
+    for result in results:
+        home_team, away_team = result['home_team'], result['away_team']
+        confidence = Fore.CYAN + f" ({result['winner_confidence']}%)" + Style.RESET_ALL
+        if result['winner'] == 1:
+            teams = Fore.GREEN + home_team + Style.RESET_ALL + confidence + ' vs ' + Fore.RED + away_team + Style.RESET_ALL
+        else:
+            teams = Fore.RED + home_team + Style.RESET_ALL + ' vs ' + Fore.GREEN + away_team + Style.RESET_ALL + confidence
+        if result['under_over'] == 0:
+            pick = Fore.MAGENTA + 'UNDER ' + Style.RESET_ALL
+        else:
+            pick = Fore.BLUE + 'OVER ' + Style.RESET_ALL
+        print(teams + ': ' + pick + f"{result['ou_line']:g}" + Style.RESET_ALL + Fore.CYAN + f" ({result['ou_confidence']}%)" + Style.RESET_ALL)
+
+    if kelly_criterion:
+        print("------------Expected Value & Kelly Criterion-----------")
+    else:
+        print("---------------------Expected Value--------------------")
+    for result in results:
+        bankroll_descriptor = ' Fraction of Bankroll: '
+        for team, ev, kelly in ((result['home_team'], result['home_ev'], result['home_kelly']),
+                                (result['away_team'], result['away_ev'], result['away_kelly'])):
+            ev_color = Fore.GREEN if ev > 0 else Fore.RED
+            bankroll_fraction = bankroll_descriptor + format_number(kelly) + '%'
+            print(team + ' EV: ' + ev_color + format_number(ev) + Style.RESET_ALL + (bankroll_fraction if kelly_criterion else ''))
+    deinit()
+
+
+def render_json(results, kelly_criterion=False):
+    print(to_json(results))
+
+
+def render_csv(results, kelly_criterion=False):
+    print(to_csv(results), end='')
+
+
+renderers = {'console': render_console, 'json': render_json, 'csv': render_csv}
@@ -1,96 +1,58 @@
-import copy
-
 import numpy as np
-import pandas as pd
-import xgboost as xgb
-from colorama import Fore, Style, init, deinit
-from src.Utils import Expected_Value
-from src.Utils import Kelly_Criterion as kc
-
-
-# from src.Utils.Dictionaries import team_index_current
-# from src.Utils.tools import get_json_data, to_data_frame, get_todays_games_json, create_todays_games
-init()
-xgb_ml = xgb.Booster()
-xgb_ml.load_model('Models/XGBoost_Models/XGBoost_68.7%_ML-4.json')
-xgb_uo = xgb.Booster()
-xgb_uo.load_model('Models/XGBoost_Models/XGBoost_53.7%_UO-9.json')
-
-
-def xgb_runner(data, todays_games_uo, frame_ml, games, home_team_odds, away_team_odds, kelly_criterion):
-    ml_predictions_array = []
-
-    for row in data:
-        ml_predictions_array.append(xgb_ml.predict(xgb.DMatrix(np.array([row]))))
-
-    frame_uo = copy.deepcopy(frame_ml)
-    frame_uo['OU'] = np.asarray(todays_games_uo)
-    data = frame_uo.values
-    data = data.astype(float)
-
-    ou_predictions_array = []
-
-    for row in data:
-        ou_predictions_array.append(xgb_uo.predict(xgb.DMatrix(np.array([row]))))
-
-    count = 0
-    for game in games:
-        home_team = game[0]
-        away_team = game[1]
-        winner = int(np.argmax(ml_predictions_array[count]))
-        under_over = int(np.argmax(ou_predictions_array[count]))
-        winner_confidence = ml_predictions_array[count]
-        un_confidence = ou_predictions_array[count]
-        if winner == 1:
-            winner_confidence = round(winner_confidence[0][1] * 100, 1)
-            if under_over == 0:
-                un_confidence = round(ou_predictions_array[count][0][0] * 100, 1)
-                print(
-                    Fore.GREEN + home_team + Style.RESET_ALL + Fore.CYAN + f" ({winner_confidence}%)" + Style.RESET_ALL + ' vs ' + Fore.RED + away_team + Style.RESET_ALL + ': ' +
-                    Fore.MAGENTA + 'UNDER ' + Style.RESET_ALL + str(
-                        todays_games_uo[count]) + Style.RESET_ALL + Fore.CYAN + f" ({un_confidence}%)" + Style.RESET_ALL)
-            else:
-                un_confidence = round(ou_predictions_array[count][0][1] * 100, 1)
-                print(
-                    Fore.GREEN + home_team + Style.RESET_ALL + Fore.CYAN + f" ({winner_confidence}%)" + Style.RESET_ALL + ' vs ' + Fore.RED + away_team + Style.RESET_ALL + ': ' +
-                    Fore.BLUE + 'OVER ' + Style.RESET_ALL + str(
-                        todays_games_uo[count]) + Style.RESET_ALL + Fore.CYAN + f" ({un_confidence}%)" + Style.RESET_ALL)
-        else:
-            winner_confidence = round(winner_confidence[0][0] * 100, 1)
-            if under_over == 0:
-                un_confidence = round(ou_predictions_array[count][0][0] * 100, 1)
-                print(
-                    Fore.RED + home_team + Style.RESET_ALL + ' vs ' + Fore.GREEN + away_team + Style.RESET_ALL + Fore.CYAN + f" ({winner_confidence}%)" + Style.RESET_ALL + ': ' +
-                    Fore.MAGENTA + 'UNDER ' + Style.RESET_ALL + str(
-                        todays_games_uo[count]) + Style.RESET_ALL + Fore.CYAN + f" ({un_confidence}%)" + Style.RESET_ALL)
-            else:
-                un_confidence = round(ou_predictions_array[count][0][1] * 100, 1)
-                print(
-                    Fore.RED + home_team + Style.RESET_ALL + ' vs ' + Fore.GREEN + away_team + Style.RESET_ALL + Fore.CYAN + f" ({winner_confidence}%)" + Style.RESET_ALL + ': ' +
-                    Fore.BLUE + 'OVER ' + Style.RESET_ALL + str(
-                        todays_games_uo[count]) + Style.RESET_ALL + Fore.CYAN + f" ({un_confidence}%)" + Style.RESET_ALL)
-        count += 1
-
-    if kelly_criterion:
-        print("------------Expected Value & Kelly Criterion-----------")
-    else:
-        print("---------------------Expected Value--------------------")
-    count = 0
-    for game in games:
-        home_team = game[0]
-        away_team = game[1]
-        ev_home = ev_away = 0
-        if home_team_odds[count] and away_team_odds[count]:
-            ev_home = float(Expected_Value.expected_value(ml_predictions_array[count][0][1], int(home_team_odds[count])))
-            ev_away = float(Expected_Value.expected_value(ml_predictions_array[count][0][0], int(away_team_odds[count])))
-        expected_value_colors = {'home_color': Fore.GREEN if ev_home > 0 else Fore.RED,
-                        'away_color': Fore.GREEN if ev_away > 0 else Fore.RED}
-        bankroll_descriptor = ' Fraction of Bankroll: '
-        bankroll_fraction_home = bankroll_descriptor + str(kc.calculate_kelly_criterion(home_team_odds[count], ml_predictions_array[count][0][1])) + '%'
-        bankroll_fraction_away = bankroll_descriptor + str(kc.calculate_kelly_criterion(away_team_odds[count], ml_predictions_array[count][0][0])) + '%'
-
-        print(home_team + ' EV: ' + expected_value_colors['home_color'] + str(ev_home) + Style.RESET_ALL + (bankroll_fraction_home if kelly_criterion else ''))
-        print(away_team + ' EV: ' + expected_value_colors['away_color'] + str(ev_away) + Style.RESET_ALL + (bankroll_fraction_away if kelly_criterion else ''))
-        count += 1
 
-    deinit()
+from src.Predict import Model_Registry
+from src.Predict.Predictions import build_results, to_prediction_array
+from src.Predict.Renderers import render_console
+
+
+def predict_slate(data, todays_games_uo, lines_per_game=1):
+    """
+    Scores every game with one batched call per model.
+
+    The under/over model takes the money line features plus the OU line as its last column, so both
+    models read from the same preallocated float32 matrix. With several OU lines per game, todays_games_uo
+    holds them game by game: the money line is scored once per game and only the under/over rows are repeated.
+    """
+    n_games = len(data)
+    features = np.empty((n_games, lines_per_game, np.shape(data)[1] + 1), dtype=np.float32)
+    features[:, :, :-1] = np.asarray(data)[:, None, :]
+    features[:, :, -1] = np.asarray(todays_games_uo, dtype=np.float32).reshape(n_games, lines_per_game)
+
+    xgb_ml = Model_Registry.get_model('xgboost', 'ML')
+    xgb_uo = Model_Registry.get_model('xgboost', 'OU')
+    ml_predictions = xgb_ml.inplace_predict(np.ascontiguousarray(features[:, 0, :-1]))
+    ou_predictions = xgb_uo.inplace_predict(features.reshape(n_games * lines_per_game, -1))
+    return to_prediction_array(np.repeat(ml_predictions, lines_per_game, axis=0), ou_predictions)
+
+
+def xgb_runner(data, todays_games_uo, frame_ml, games, home_team_odds, away_team_odds, kelly_criterion,
+               renderer=render_console):
+    """
+    Scores today's games and hands the results to a renderer, the colored console output by default.
+
+    Returns:
+        numpy structured array of Predictions.result_dtype
+    """
+    predictions = predict_slate(data, todays_games_uo)
+    results = build_results(predictions, games, todays_games_uo, home_team_odds, away_team_odds)
+    if renderer is not None:
+        renderer(results, kelly_criterion)
+    return results
+
+
+def predict_books(data, odds):
+    """
+    Scores every game against the lines of every sportsbook in one batch. The money line inputs are shared by all
+    books while the OU line differs, so only the under/over rows are scored once per book.
+
+    data holds one row per game of odds['games'], odds comes from SbrOddsProvider.get_all_odds.
+
+    Returns:
+        numpy structured array of Predictions.result_dtype, games x sportsbooks
+    """
+    n_games, n_books = odds['total'].shape
+    predictions = predict_slate(data, odds['total'].ravel(), lines_per_game=n_books)
+    games = [game for game in odds['games'] for _ in range(n_books)]
+    results = build_results(predictions, games, odds['total'].ravel(), odds['home_ml'].ravel(),
+                            odds['away_ml'].ravel())
+    return results.reshape(n_games, n_books)
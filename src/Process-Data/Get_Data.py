@@ -1,40 +1,27 @@
+import argparse
 import os
-import random
-import sqlite3
 import sys
-import time
-from datetime import datetime, timedelta
 
 import toml
 
 sys.path.insert(1, os.path.join(sys.path[0], '../..'))
-from src.Utils.tools import get_json_data, to_data_frame
+from src.DataProviders.TeamStatsDownloader import TeamStatsDownloader
+from src.Utils import Sqlite_Storage
+
+parser = argparse.ArgumentParser(description='Download daily team stats for the seasons in config.toml')
+parser.add_argument('-workers', type=int, default=4, help='Concurrent requests')
+parser.add_argument('-rate', type=float, default=1.0, help='Requests started per second across all workers')
+args = parser.parse_args()
 
 config = toml.load("../../config.toml")
 
 url = config['data_url']
 
-con = sqlite3.connect("../../Data/TeamData.sqlite")
-
-for key, value in config['get-data'].items():
-    date_pointer = datetime.strptime(value['start_date'], "%Y-%m-%d").date()
-    end_date = datetime.strptime(value['end_date'], "%Y-%m-%d").date()
-
-    while date_pointer <= end_date:
-        print("Getting data: ", date_pointer)
-
-        raw_data = get_json_data(
-            url.format(date_pointer.month, date_pointer.day, value['start_year'], date_pointer.year, key))
-        df = to_data_frame(raw_data)
-
-        date_pointer = date_pointer + timedelta(days=1)
-
-        df['Date'] = str(date_pointer)
-
-        df.to_sql(date_pointer.strftime("%Y-%m-%d"), con, if_exists="replace")
-
-        time.sleep(random.randint(1, 3))
+con = Sqlite_Storage.connect("../../Data/TeamData.sqlite")
 
-        # TODO: Add tests
+downloader = TeamStatsDownloader(con, url, workers=args.workers, rate=args.rate)
+failed = downloader.run(config['get-data'])
+if failed:
+    print(f"{len(failed)} dates failed, run again to retry them: {sorted(failed)}")
 
 con.close()
@@ -1,75 +1,130 @@
+import argparse
 import os
 import random
-import sqlite3
 import sys
 import time
 from datetime import datetime, timedelta
+from itertools import groupby, islice
+from multiprocessing import Pool
 
 import pandas as pd
 import toml
 from sbrscrape import Scoreboard
 
-# TODO: Add tests
-
 sys.path.insert(1, os.path.join(sys.path[0], '../..'))
+from src.Utils import Sqlite_Storage
 
 sportsbook = 'fanduel'
-df_data = []
 
-config = toml.load("config.toml")
 
-con = sqlite3.connect("Data/OddsData.sqlite")
+def season_dates(seasons):
+    """
+    The work queue: every (season, date) to scrape, season by season in date order.
+    """
+    for key, value in seasons.items():
+        date_pointer = datetime.strptime(value['start_date'], "%Y-%m-%d").date()
+        end_date = datetime.strptime(value['end_date'], "%Y-%m-%d").date()
+        while date_pointer <= end_date:
+            yield key, date_pointer
+            date_pointer = date_pointer + timedelta(days=1)
+
+
+def fetch_day(work):
+    """
+    Scrapes one day's scoreboard.
+
+    Returns:
+        tuple: (season, date, [(home team, away team, odds row or None when the sportsbook has no lines)])
+    """
+    key, date_pointer = work
+    print("Getting odds data: ", date_pointer)
+    sb = Scoreboard(date=date_pointer)
+
+    if not hasattr(sb, "games"):
+        return key, date_pointer, []
+
+    games = []
+    for game in sb.games:
+        try:
+            row = {
+                'Date': date_pointer,
+                'Home': game['home_team'],
+                'Away': game['away_team'],
+                'OU': game['total'][sportsbook],
+                'Spread': game['away_spread'][sportsbook],
+                'ML_Home': game['home_ml'][sportsbook],
+                'ML_Away': game['away_ml'][sportsbook],
+                'Points': game['away_score'] + game['home_score'],
+                'Win_Margin': game['home_score'] - game['away_score'],
+            }
+        except KeyError:
+            print(f"No {sportsbook} odds data found for game: {game}")
+            row = None
+        games.append((game['home_team'], game['away_team'], row))
+
+    time.sleep(random.randint(1, 3))
+    return key, date_pointer, games
 
-for key, value in config['get-odds-data'].items():
-    date_pointer = datetime.strptime(value['start_date'], "%Y-%m-%d").date()
-    end_date = datetime.strptime(value['end_date'], "%Y-%m-%d").date()
+
+def odds_rows(days):
+    """
+    Adds each team's days of rest to the scraped games, which must arrive in date order. Rest is counted from
+    the start of each season, a team's first game getting 7 days.
+
+    Returns:
+        generator: (season, odds row) for every game with odds
+    """
+    season = None
     teams_last_played = {}
+    for key, date_pointer, games in days:
+        if key != season:
+            season = key
+            teams_last_played = {}
+        for home_team, away_team, row in games:
+            home_games_rested = (date_pointer - teams_last_played.get(home_team, date_pointer - timedelta(days=7))).days
+            teams_last_played[home_team] = date_pointer
+            away_games_rested = (date_pointer - teams_last_played.get(away_team, date_pointer - timedelta(days=7))).days
+            teams_last_played[away_team] = date_pointer
+            if row is not None:
+                yield key, {**row, 'Days_Rest_Home': home_games_rested, 'Days_Rest_Away': away_games_rested}
 
-    while date_pointer <= end_date:
-        print("Getting odds data: ", date_pointer)
-        sb = Scoreboard(date=date_pointer)
 
-        if not hasattr(sb, "games"):
-            date_pointer = date_pointer + timedelta(days=1)
-            continue
-
-        for game in sb.games:
-            if game['home_team'] not in teams_last_played:
-                teams_last_played[game['home_team']] = date_pointer
-                home_games_rested = timedelta(days=7)  # start of season, big number
-            else:
-                current_date = date_pointer
-                home_games_rested = current_date - teams_last_played[game['home_team']]
-                teams_last_played[game['home_team']] = current_date
-
-            if game['away_team'] not in teams_last_played:
-                teams_last_played[game['away_team']] = date_pointer
-                away_games_rested = timedelta(days=7)  # start of season, big number
-            else:
-                current_date = date_pointer
-                away_games_rested = current_date - teams_last_played[game['away_team']]
-                teams_last_played[game['away_team']] = current_date
-
-            try:
-                df_data.append({
-                    'Date': date_pointer,
-                    'Home': game['home_team'],
-                    'Away': game['away_team'],
-                    'OU': game['total'][sportsbook],
-                    'Spread': game['away_spread'][sportsbook],
-                    'ML_Home': game['home_ml'][sportsbook],
-                    'ML_Away': game['away_ml'][sportsbook],
-                    'Points': game['away_score'] + game['home_score'],
-                    'Win_Margin': game['home_score'] - game['away_score'],
-                    'Days_Rest_Home': home_games_rested.days,
-                    'Days_Rest_Away': away_games_rested.days
-                })
-            except KeyError:
-                print(f"No {sportsbook} odds data found for game: {game}")
-
-        date_pointer = date_pointer + timedelta(days=1)
-        time.sleep(random.randint(1, 3))
-
-    df = pd.DataFrame(df_data, )
-    df.to_sql(key, con, if_exists="replace")
-con.close()
+def write_seasons(con, rows, chunk_size):
+    """
+    Flushes the rows to their season tables chunk by chunk, the first chunk of a season replacing its table.
+    A season that yields no games keeps its table as it was, so a scrape that comes back empty cannot wipe odds
+    already stored.
+    """
+    for key, season_rows in groupby(rows, key=lambda item: item[0]):
+        start = 0
+        while True:
+            chunk = [row for _, row in islice(season_rows, chunk_size)]
+            if not chunk:
+                break
+            df = pd.DataFrame(chunk, index=range(start, start + len(chunk)))
+            with Sqlite_Storage.transaction(con):
+                if start == 0:
+                    Sqlite_Storage.write_frame(con, key, df)
+                else:
+                    Sqlite_Storage.append_frame(con, key, df)
+            start += len(chunk)
+        print(f"Wrote {start} games to {key}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Scrape historical odds for the seasons in config.toml')
+    parser.add_argument('-workers', type=int, default=1, help='Processes scraping days in parallel')
+    parser.add_argument('-chunk', type=int, default=500, help='Games held in memory before they are written')
+    args = parser.parse_args()
+
+    config = toml.load("config.toml")
+
+    con = Sqlite_Storage.connect("Data/OddsData.sqlite")
+    work = season_dates(config['get-odds-data'])
+    if args.workers > 1:
+        # imap hands the days back in queue order, so rest days are still counted in date order
+        with Pool(args.workers) as pool:
+            write_seasons(con, odds_rows(pool.imap(fetch_day, work)), args.chunk)
+    else:
+        write_seasons(con, odds_rows(map(fetch_day, work)), args.chunk)
+    con.close()
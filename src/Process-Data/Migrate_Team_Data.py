@@ -0,0 +1,15 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(1, os.path.join(sys.path[0], '../..'))
+from src.Utils import Sqlite_Storage, Team_Stats_Store
+
+parser = argparse.ArgumentParser(description='Move the per-date team stats tables into the single team_stats table')
+parser.add_argument('-drop', action='store_true', help='Drop each per-date table once it has been copied')
+args = parser.parse_args()
+
+con = Sqlite_Storage.connect("../../Data/TeamData.sqlite")
+migrated = Team_Stats_Store.migrate_per_date_tables(con, drop=args.drop)
+print(f"Migrated {migrated} dates into {Team_Stats_Store.table}")
+con.close()
@@ -1,11 +1,15 @@
+import os
 import sqlite3
+import sys
 import time
 
 import numpy as np
-import pandas as pd
 import tensorflow as tf
 from keras.callbacks import TensorBoard, EarlyStopping, ModelCheckpoint
 
+sys.path.insert(1, os.path.join(sys.path[0], '../..'))
+from src.Utils import Feature_Store
+
 current_time = str(time.time())
 
 tensorboard = TensorBoard(log_dir='../../Logs/{}'.format(current_time))
@@ -14,15 +18,11 @@ mcp_save = ModelCheckpoint('../../Models/Trained-Model-ML-' + current_time, save
 
 dataset = "dataset_2012-24_new"
 con = sqlite3.connect("../../Data/dataset.sqlite")
-data = pd.read_sql_query(f"select * from \"{dataset}\"", con, index_col="index")
+features = Feature_Store.load(con, dataset)
 con.close()
 
-scores = data['Score']
-margin = data['Home-Team-Win']
-data.drop(['Score', 'Home-Team-Win', 'TEAM_NAME', 'Date', 'TEAM_NAME.1', 'Date.1', 'OU', 'OU-Cover'], axis=1, inplace=True)
-
-data = data.values
-data = data.astype(float)
+margin = features.labels['Home-Team-Win']
+data = features.ml_features()
 
 x_train = tf.keras.utils.normalize(data, axis=1)
 y_train = np.asarray(margin)
@@ -1,11 +1,15 @@
+import os
 import sqlite3
+import sys
 import time
 
 import numpy as np
-import pandas as pd
 import tensorflow as tf
 from keras.callbacks import TensorBoard, EarlyStopping, ModelCheckpoint
 
+sys.path.insert(1, os.path.join(sys.path[0], '../..'))
+from src.Utils import Feature_Store
+
 current_time = str(time.time())
 
 tensorboard = TensorBoard(log_dir='../../Logs/{}'.format(current_time))
@@ -14,16 +18,11 @@ mcp_save = ModelCheckpoint('../../Models/Trained-Model-OU-' + current_time, save
 
 dataset = "dataset_2012-24_new"
 con = sqlite3.connect("../../Data/dataset.sqlite")
-data = pd.read_sql_query(f"select * from \"{dataset}\"", con, index_col="index")
+features = Feature_Store.load(con, dataset)
 con.close()
 
-OU = data['OU-Cover']
-total = data['OU']
-data.drop(['Score', 'Home-Team-Win', 'TEAM_NAME', 'Date', 'TEAM_NAME.1', 'Date.1', 'OU-Cover', 'OU'], axis=1, inplace=True)
-
-data['OU'] = np.asarray(total)
-data = data.values
-data = data.astype(float)
+OU = features.labels['OU-Cover']
+data = features.ou_features()
 
 x_train = tf.keras.utils.normalize(data, axis=1)
 y_train = np.asarray(OU)
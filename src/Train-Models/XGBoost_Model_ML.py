@@ -1,30 +1,34 @@
+import os
 import sqlite3
+import sys
 
 import numpy as np
-import pandas as pd
 import xgboost as xgb
 from sklearn.metrics import accuracy_score
 from sklearn.model_selection import train_test_split
 from tqdm import tqdm
 
+sys.path.insert(1, os.path.join(sys.path[0], '../..'))
+from src.Utils import Feature_Store
+
 dataset = "dataset_2012-24_new"
 con = sqlite3.connect("../../Data/dataset.sqlite")
-data = pd.read_sql_query(f"select * from \"{dataset}\"", con, index_col="index")
+features = Feature_Store.load(con, dataset)
 con.close()
 
-margin = data['Home-Team-Win']
-data.drop(['Score', 'Home-Team-Win', 'TEAM_NAME', 'Date', 'TEAM_NAME.1', 'Date.1', 'OU-Cover', 'OU'],
-          axis=1, inplace=True)
-
-data = data.values
-
-data = data.astype(float)
+margin = features.labels['Home-Team-Win']
+data = features.ml_features()
+# sketch the histogram cut points once from the features alone and bin every split with them. No labels go into
+# the sketch, so no targets leak; the test rows only shape the bin edges, as an unsupervised scaler fit on all rows
+reference = xgb.QuantileDMatrix(data)
+rows = np.arange(len(data))
 acc_results = []
 for x in tqdm(range(300)):
-    x_train, x_test, y_train, y_test = train_test_split(data, margin, test_size=.1)
+    train_rows, test_rows = train_test_split(rows, test_size=.1)
+    y_test = margin[test_rows]
 
-    train = xgb.DMatrix(x_train, label=y_train)
-    test = xgb.DMatrix(x_test, label=y_test)
+    train = xgb.QuantileDMatrix(data[train_rows], label=margin[train_rows], ref=reference)
+    test = xgb.QuantileDMatrix(data[test_rows], label=y_test, ref=reference)
 
     param = {
         'max_depth': 3,
@@ -0,0 +1,174 @@
+import argparse
+import itertools
+import json
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import xgboost as xgb
+from sklearn.model_selection import train_test_split
+
+sys.path.insert(1, os.path.join(sys.path[0], '../..'))
+from src.Utils import Feature_Store
+
+dataset = "dataset_2012-24_new"
+# model: (label, classes, default trials, default params, model file name)
+models = {
+    'ML': ('Home-Team-Win', 2, 300, {'max_depth': [3], 'eta': [0.01]}, 'XGBoost_{}%_ML-4.json'),
+    'UO': ('OU-Cover', 3, 100, {'max_depth': [20], 'eta': [0.05]}, 'XGBoost_{}%_UO-9.json'),
+}
+epochs = 750
+
+trial_data = {}
+
+
+class PruneCallback(xgb.callback.TrainingCallback):
+    """ Stops a trial whose test error falls behind the best finished trial's error at the same round.
+    """
+
+    def __init__(self, best_curve, warmup, every, tolerance):
+        super().__init__()
+        self.best_curve = best_curve
+        self.warmup = warmup
+        self.every = every
+        self.tolerance = tolerance
+        self.pruned = False
+
+    def after_iteration(self, model, epoch, evals_log):
+        if self.best_curve is None or epoch < self.warmup or (epoch + 1) % self.every:
+            return False
+        error = evals_log['test']['merror'][-1]
+        self.pruned = error > self.best_curve[epoch] + self.tolerance
+        return self.pruned
+
+
+def load_trial_data(model, threads):
+    con = sqlite3.connect("../../Data/dataset.sqlite")
+    features = Feature_Store.load(con, dataset)
+    con.close()
+    label = models[model][0]
+    data = features.ml_features() if model == 'ML' else features.ou_features()
+    trial_data['data'] = data
+    trial_data['labels'] = features.labels[label]
+    trial_data['classes'] = models[model][1]
+    # histogram cut points are sketched once from the features alone and shared by every split. No labels go
+    # into the sketch, so no targets leak; the test rows only shape the bin edges
+    trial_data['reference'] = xgb.QuantileDMatrix(data, nthread=threads)
+
+
+def run_trial(trial, seed, params, threads, best_curve, best_accuracy, prune):
+    """
+    Trains one model on a seeded split with a fixed thread budget.
+
+    Returns:
+        dictionary: trial results, with the serialized model when it beats best_accuracy
+    """
+    start = time.perf_counter()
+    data, labels, reference = trial_data['data'], trial_data['labels'], trial_data['reference']
+    train_rows, test_rows = train_test_split(np.arange(len(labels)), test_size=.1, random_state=seed)
+    y_test = labels[test_rows]
+    train = xgb.QuantileDMatrix(data[train_rows], label=labels[train_rows], ref=reference, nthread=threads)
+    test = xgb.QuantileDMatrix(data[test_rows], label=y_test, ref=reference, nthread=threads)
+
+    param = dict(params, objective='multi:softprob', num_class=trial_data['classes'],
+                 eval_metric='merror', seed=seed, nthread=threads)
+    callback = PruneCallback(best_curve, **prune) if prune else None
+    evals_result = {}
+    # the test error is only tracked every round when pruning needs it
+    model = xgb.train(param, train, epochs, evals=[(test, 'test')] if callback else (), evals_result=evals_result,
+                      verbose_eval=False, callbacks=[callback] if callback else None)
+
+    predictions = np.argmax(model.predict(test), axis=1)
+    acc = round(float(np.mean(predictions == y_test)) * 100, 1)
+    pruned = callback is not None and callback.pruned
+    return {
+        'trial': trial,
+        'seed': seed,
+        'params': params,
+        'accuracy': acc,
+        'rounds': model.num_boosted_rounds(),
+        'pruned': pruned,
+        'seconds': time.perf_counter() - start,
+        'curve': evals_result['test']['merror'] if callback else None,
+        'model': model.save_raw('json') if not pruned and acc > best_accuracy else None,
+    }
+
+
+def trial_configs(model, args):
+    grid = dict(models[model][3])
+    if args.max_depth:
+        grid['max_depth'] = args.max_depth
+    if args.eta:
+        grid['eta'] = args.eta
+    return [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+
+
+def create_results_table(con):
+    con.execute('create table if not exists xgboost_trials (run TEXT, model TEXT, trial INTEGER, seed INTEGER, '
+                'params TEXT, accuracy REAL, rounds INTEGER, pruned INTEGER, seconds REAL)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Parallel XGBoost training trials')
+    parser.add_argument('-model', choices=models.keys(), default='ML', help='Model to train')
+    parser.add_argument('-trials', type=int, help='Number of trials (300 for ML, 100 for UO by default)')
+    parser.add_argument('-seed', type=int, default=0, help='Seed of the first trial, trial i uses seed + i')
+    parser.add_argument('-threads', type=int, default=2, help='Threads per trial')
+    parser.add_argument('-workers', type=int, help='Concurrent trials, cores / threads by default')
+    parser.add_argument('-max_depth', type=int, nargs='+', help='max_depth values to search')
+    parser.add_argument('-eta', type=float, nargs='+', help='eta values to search')
+    parser.add_argument('-prune', action='store_true',
+                        help='Stop trials whose test error trails the best finished trial. Which trials get pruned '
+                             'depends on completion order, so only unpruned runs are exactly reproducible')
+    args = parser.parse_args()
+
+    trials = args.trials or models[args.model][2]
+    workers = args.workers or max(1, (os.cpu_count() or 1) // args.threads)
+    configs = trial_configs(args.model, args)
+    prune = {'warmup': 150, 'every': 50, 'tolerance': 0.01} if args.prune else None
+    run = time.strftime('%Y-%m-%dT%H:%M:%S')
+
+    con = sqlite3.connect("../../Data/search.sqlite")
+    create_results_table(con)
+    best = None
+    pending = iter(range(trials))
+    with ProcessPoolExecutor(max_workers=workers, initializer=load_trial_data,
+                             initargs=(args.model, args.threads)) as executor:
+        running = set()
+
+        def submit(trial):
+            best_curve = best['curve'] if best else None
+            running.add(executor.submit(run_trial, trial, args.seed + trial, configs[trial % len(configs)],
+                                        args.threads, best_curve, best['accuracy'] if best else -1, prune))
+
+        for trial in itertools.islice(pending, workers):
+            submit(trial)
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                with con:
+                    con.execute('insert into xgboost_trials values (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                (run, args.model, result['trial'], result['seed'], json.dumps(result['params']),
+                                 result['accuracy'], result['rounds'], result['pruned'], result['seconds']))
+                print(f"trial {result['trial']}: {result['accuracy']}%{' (pruned)' if result['pruned'] else ''}")
+                if result['model'] is not None and (best is None or result['accuracy'] > best['accuracy']):
+                    best = result
+                for trial in itertools.islice(pending, 1):
+                    submit(trial)
+    con.close()
+
+    if best is None:
+        print("No trial finished")
+        return
+    path = os.path.join('../../Models/XGBoost_Models', models[args.model][4].format(best['accuracy']))
+    with open(path, 'wb') as model_file:
+        model_file.write(best['model'])
+    print(f"Best: trial {best['trial']} (seed {best['seed']}, {best['params']}) {best['accuracy']}%, saved {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+loaded_schedules = {}
+
+
+class ScheduleIndex:
+    """ Per-team index over a season schedule, used to look up how long teams have rested.
+    Game times of all teams are kept in one array, sorted by team and then by date, so the last game of
+    any number of teams can be found with a single searchsorted call.
+    """
+
+    def __init__(self, teams, starts, dates):
+        self.teams = teams
+        self.starts = starts
+        self.dates = dates
+        self.team_codes = {team: code for code, team in enumerate(teams)}
+        # searchsorted keys: team code * span + game time offset, unique per team and ordered by date within it
+        self.base = int(dates.min())
+        self.span = int(dates.max()) - self.base + 2
+        team_of_game = np.repeat(np.arange(len(teams)), np.diff(starts))
+        self.keys = team_of_game * self.span + (dates - self.base + 1)
+
+    @classmethod
+    def from_csv(cls, path):
+        schedule_df = pd.read_csv(path, parse_dates=['Date'], date_format='%d/%m/%Y %H:%M')
+        dates = schedule_df['Date'].values.astype('datetime64[us]').astype(np.int64)
+        home_teams = schedule_df['Home Team'].values.astype(str)
+        away_teams = schedule_df['Away Team'].values.astype(str)
+
+        teams = np.unique(np.concatenate([home_teams, away_teams]))
+        game_teams = np.searchsorted(teams, np.concatenate([home_teams, away_teams]))
+        game_dates = np.concatenate([dates, dates])
+        order = np.lexsort((game_dates, game_teams))
+        starts = np.searchsorted(game_teams[order], np.arange(len(teams) + 1))
+        return cls(teams, starts, game_dates[order])
+
+    def days_rest(self, teams, now, default=7):
+        """
+        Days since each team's last game on or before now, counting today, like (1 day + now - last game).days.
+
+        Returns:
+            numpy array: days rest per team, default for teams with no earlier game
+        """
+        codes = np.array([self.team_codes.get(team, -1) for team in teams], dtype=np.int64)
+        now = np.datetime64(now, 'us').astype(np.int64)
+        offset = np.clip(now - self.base + 1, 0, self.span - 1)
+        positions = np.searchsorted(self.keys, np.maximum(codes, 0) * self.span + offset, side='right') - 1
+
+        known = codes >= 0
+        has_game = known & (positions >= self.starts[np.maximum(codes, 0)])
+        last_game = self.dates[np.where(has_game, positions, 0)]
+        one_day = 86400 * 10 ** 6
+        days = (now - last_game + one_day) // one_day
+        return np.where(has_game, days, default)
+
+
+def load_schedule(path):
+    """
+    Loads the schedule index for a CSV, from memory, from its on-disk cache when the CSV has not changed since
+    the cache was written, or by parsing the CSV and refreshing the cache.
+    """
+    mtime = os.path.getmtime(path)
+    if path in loaded_schedules and loaded_schedules[path][0] == mtime:
+        return loaded_schedules[path][1]
+
+    cache_path = path + '.npz'
+    schedule = None
+    if os.path.exists(cache_path):
+        with np.load(cache_path) as cache:
+            if cache['mtime'] == mtime:
+                schedule = ScheduleIndex(cache['teams'], cache['starts'], cache['dates'])
+    if schedule is None:
+        schedule = ScheduleIndex.from_csv(path)
+        try:
+            with open(cache_path, 'wb') as cache_file:
+                np.savez(cache_file, mtime=mtime, teams=schedule.teams, starts=schedule.starts, dates=schedule.dates)
+        except OSError:
+            pass
+
+    loaded_schedules[path] = (mtime, schedule)
+    return schedule
+
+
+def rest_between_games(dates, home_teams, away_teams, groups=None, first_game=10, cap=9):
+    """
+    Days each team rested before each game, walking the games in the order given. A team's first game within its
+    group gets first_game and gaps outside 1 to cap - 1 days are capped at cap.
+
+    Returns:
+        tuple: (home days rest, away days rest) numpy arrays
+    """
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    groups = np.zeros(len(dates), dtype=np.int64) if groups is None else np.asarray(groups)
+    # home and away of every game interleaved, so each team's games are visited in table order
+    games = pd.DataFrame({
+        'group': np.repeat(groups, 2),
+        'team': np.column_stack([np.asarray(home_teams), np.asarray(away_teams)]).ravel(),
+        'date': np.repeat(dates, 2),
+    })
+    days = games.groupby(['group', 'team'], sort=False)['date'].diff().dt.days.to_numpy()
+    rest = np.where(np.isnan(days), first_game, np.where((days > 0) & (days < cap), days, cap)).astype(np.int64)
+    return rest[0::2], rest[1::2]
@@ -1,3 +1,6 @@
+from src.Utils.Team_Index import get_team_index
+
+
 team_codes = {
     'Atlanta': 'Atlanta Hawks',
     'NewJersey': 'New Jersey Nets',
@@ -33,201 +36,10 @@ team_codes = {
     'Washington': 'Washington Wizards',
 }
 
-team_index_07 = {
-    'Atlanta Hawks': 0,
-    'Boston Celtics': 1,
-    'Charlotte Bobcats': 2,
-    'Chicago Bulls': 3,
-    'Cleveland Cavaliers': 4,
-    'Dallas Mavericks': 5,
-    'Denver Nuggets': 6,
-    'Detroit Pistons': 7,
-    'Golden State Warriors': 8,
-    'Houston Rockets': 9,
-    'Indiana Pacers': 10,
-    'Los Angeles Clippers': 11,
-    'Los Angeles Lakers': 12,
-    'Memphis Grizzlies': 13,
-    'Miami Heat': 14,
-    'Milwaukee Bucks': 15,
-    'Minnesota Timberwolves': 16,
-    'New Jersey Nets': 17,
-    'New Orleans Pelicans': 18,
-    'New York Knicks': 19,
-    'Orlando Magic': 20,
-    'Philadelphia 76ers': 21,
-    'Phoenix Suns': 22,
-    'Portland Trail Blazers': 23,
-    'Sacramento Kings': 24,
-    'San Antonio Spurs': 25,
-    'Seattle SuperSonics': 26,
-    'Toronto Raptors': 27,
-    'Utah Jazz': 28,
-    'Washington Wizards': 29
-}
-
-team_index_08 = {
-    'Atlanta Hawks': 0,
-    'Boston Celtics': 1,
-    'Charlotte Bobcats': 2,
-    'Chicago Bulls': 3,
-    'Cleveland Cavaliers': 4,
-    'Dallas Mavericks': 5,
-    'Denver Nuggets': 6,
-    'Detroit Pistons': 7,
-    'Golden State Warriors': 8,
-    'Houston Rockets': 9,
-    'Indiana Pacers': 10,
-    'Los Angeles Clippers': 11,
-    'Los Angeles Lakers': 12,
-    'Memphis Grizzlies': 13,
-    'Miami Heat': 14,
-    'Milwaukee Bucks': 15,
-    'Minnesota Timberwolves': 16,
-    'New Jersey Nets': 17,
-    'New Orleans Pelicans': 18,
-    'New York Knicks': 19,
-    'Oklahoma City Thunder': 20,
-    'Orlando Magic': 21,
-    'Philadelphia 76ers': 22,
-    'Phoenix Suns': 23,
-    'Portland Trail Blazers': 24,
-    'Sacramento Kings': 25,
-    'San Antonio Spurs': 26,
-    'Toronto Raptors': 27,
-    'Utah Jazz': 28,
-    'Washington Wizards': 29
-}
-
-team_index_12 = {
-    'Atlanta Hawks': 0,
-    'Boston Celtics': 1,
-    'Brooklyn Nets': 2,
-    'Charlotte Bobcats': 3,
-    'Chicago Bulls': 4,
-    'Cleveland Cavaliers': 5,
-    'Dallas Mavericks': 6,
-    'Denver Nuggets': 7,
-    'Detroit Pistons': 8,
-    'Golden State Warriors': 9,
-    'Houston Rockets': 10,
-    'Indiana Pacers': 11,
-    'Los Angeles Clippers': 12,
-    'Los Angeles Lakers': 13,
-    'Memphis Grizzlies': 14,
-    'Miami Heat': 15,
-    'Milwaukee Bucks': 16,
-    'Minnesota Timberwolves': 17,
-    'New Orleans Pelicans': 18,
-    'New York Knicks': 19,
-    'Oklahoma City Thunder': 20,
-    'Orlando Magic': 21,
-    'Philadelphia 76ers': 22,
-    'Phoenix Suns': 23,
-    'Portland Trail Blazers': 24,
-    'Sacramento Kings': 25,
-    'San Antonio Spurs': 26,
-    'Toronto Raptors': 27,
-    'Utah Jazz': 28,
-    'Washington Wizards': 29
-}
-
-team_index_13 = {
-    'Atlanta Hawks': 0,
-    'Boston Celtics': 1,
-    'Brooklyn Nets': 2,
-    'Charlotte Bobcats': 3,
-    'Chicago Bulls': 4,
-    'Cleveland Cavaliers': 5,
-    'Dallas Mavericks': 6,
-    'Denver Nuggets': 7,
-    'Detroit Pistons': 8,
-    'Golden State Warriors': 9,
-    'Houston Rockets': 10,
-    'Indiana Pacers': 11,
-    'Los Angeles Clippers': 12,
-    'Los Angeles Lakers': 13,
-    'Memphis Grizzlies': 14,
-    'Miami Heat': 15,
-    'Milwaukee Bucks': 16,
-    'Minnesota Timberwolves': 17,
-    'New Orleans Pelicans': 18,
-    'New York Knicks': 19,
-    'Oklahoma City Thunder': 20,
-    'Orlando Magic': 21,
-    'Philadelphia 76ers': 22,
-    'Phoenix Suns': 23,
-    'Portland Trail Blazers': 24,
-    'Sacramento Kings': 25,
-    'San Antonio Spurs': 26,
-    'Toronto Raptors': 27,
-    'Utah Jazz': 28,
-    'Washington Wizards': 29
-}
-
-team_index_14 = {
-    'Atlanta Hawks': 0,
-    'Boston Celtics': 1,
-    'Brooklyn Nets': 2,
-    'Charlotte Bobcats': 3,
-    'Chicago Bulls': 4,
-    'Cleveland Cavaliers': 5,
-    'Dallas Mavericks': 6,
-    'Denver Nuggets': 7,
-    'Detroit Pistons': 8,
-    'Golden State Warriors': 9,
-    'Houston Rockets': 10,
-    'Indiana Pacers': 11,
-    'Los Angeles Clippers': 12,
-    'Los Angeles Lakers': 13,
-    'Memphis Grizzlies': 14,
-    'Miami Heat': 15,
-    'Milwaukee Bucks': 16,
-    'Minnesota Timberwolves': 17,
-    'New Orleans Pelicans': 18,
-    'New York Knicks': 19,
-    'Oklahoma City Thunder': 20,
-    'Orlando Magic': 21,
-    'Philadelphia 76ers': 22,
-    'Phoenix Suns': 23,
-    'Portland Trail Blazers': 24,
-    'Sacramento Kings': 25,
-    'San Antonio Spurs': 26,
-    'Toronto Raptors': 27,
-    'Utah Jazz': 28,
-    'Washington Wizards': 29
-}
-
-team_index_current = {
-    'Atlanta Hawks': 0,
-    'Boston Celtics': 1,
-    'Brooklyn Nets': 2,
-    'Charlotte Hornets': 3,
-    'Chicago Bulls': 4,
-    'Cleveland Cavaliers': 5,
-    'Dallas Mavericks': 6,
-    'Denver Nuggets': 7,
-    'Detroit Pistons': 8,
-    'Golden State Warriors': 9,
-    'Houston Rockets': 10,
-    'Indiana Pacers': 11,
-    'Los Angeles Clippers': 12,
-    'LA Clippers': 12,
-    'Los Angeles Lakers': 13,
-    'Memphis Grizzlies': 14,
-    'Miami Heat': 15,
-    'Milwaukee Bucks': 16,
-    'Minnesota Timberwolves': 17,
-    'New Orleans Pelicans': 18,
-    'New York Knicks': 19,
-    'Oklahoma City Thunder': 20,
-    'Orlando Magic': 21,
-    'Philadelphia 76ers': 22,
-    'Phoenix Suns': 23,
-    'Portland Trail Blazers': 24,
-    'Sacramento Kings': 25,
-    'San Antonio Spurs': 26,
-    'Toronto Raptors': 27,
-    'Utah Jazz': 28,
-    'Washington Wizards': 29
-}
+# team name -> row position in the daily team stats snapshots, per era of team names (see Data/team-index.toml)
+team_index_07 = get_team_index().season_team_index('2007-08')
+team_index_08 = get_team_index().season_team_index('2008-09')
+team_index_12 = get_team_index().season_team_index('2012-13')
+team_index_13 = get_team_index().season_team_index('2013-14')
+team_index_14 = get_team_index().season_team_index('2014-15')
+team_index_current = get_team_index().season_team_index(get_team_index().current_season)
@@ -1,11 +1,30 @@
+import numpy as np
+
+from src.Utils.Rounding import round_array
+
+
 def expected_value(Pwin, odds):
-    Ploss = 1 - Pwin
-    Mwin = payout(odds)
-    return round((Pwin * Mwin) - (Ploss * 100), 2)
+    return float(expected_value_array(Pwin, odds))
 
 
 def payout(odds):
-    if odds > 0:
-        return odds
-    else:
-        return (100 / (-1 * odds)) * 100
+    return float(payout_array(odds))
+
+
+def expected_value_array(Pwin, odds):
+    """
+    Expected profit of a 100 unit bet for arrays of win probabilities and American odds, NaN where odds are missing.
+    """
+    Pwin = np.asarray(Pwin, dtype=np.float64)
+    Ploss = 1 - Pwin
+    Mwin = payout_array(odds)
+    return round_array((Pwin * Mwin) - (Ploss * 100), 2)
+
+
+def payout_array(odds):
+    """
+    Profit of a winning 100 unit bet for an array of American odds.
+    """
+    odds = np.asarray(odds, dtype=np.float64)
+    with np.errstate(divide='ignore'):
+        return np.where(odds > 0, odds, (100 / (-1 * odds)) * 100)
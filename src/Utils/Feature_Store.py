@@ -0,0 +1,142 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.Utils import Games_Dataset
+
+store_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'Data', 'features'))
+drop_columns = ['Score', 'Home-Team-Win', 'TEAM_NAME', 'Date', 'TEAM_NAME.1', 'Date.1', 'OU-Cover', 'OU']
+# label name -> (dataset column, dtype)
+label_columns = {
+    'Home-Team-Win': ('Home-Team-Win', np.int8),
+    'OU-Cover': ('OU-Cover', np.int8),
+    'Score': ('Score', np.float32),
+}
+
+
+def season_of(dates):
+    """
+    Returns:
+        numpy array: NBA season ('2012-13') of each YYYY-MM-DD date, seasons starting in August
+    """
+    dates = pd.to_datetime(pd.Series(dates))
+    start_year = np.where(dates.dt.month >= 8, dates.dt.year, dates.dt.year - 1)
+    return np.array([f"{year}-{str(year + 1)[-2:]}" for year in start_year])
+
+
+class FeatureSet:
+    """ A dataset table exported as memory-mapped arrays.
+    Features hold the money line model inputs with the OU line appended as the last column, rows grouped by
+    season, so the model inputs and any season range are views of the same file.
+    """
+
+    def __init__(self, directory, metadata):
+        self.directory = directory
+        self.metadata = metadata
+        self.columns = metadata['columns']
+        self.seasons = {season: tuple(rows) for season, rows in metadata['seasons'].items()}
+        self.features = np.load(os.path.join(directory, 'features.npy'), mmap_mode='r')
+        self.dates = np.load(os.path.join(directory, 'dates.npy'), mmap_mode='r')
+        # the "index" of each row in the dataset table
+        self.index = np.load(os.path.join(directory, 'index.npy'), mmap_mode='r')
+        self.labels = {name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r')
+                       for name in label_columns}
+
+    def __len__(self):
+        return self.features.shape[0]
+
+    def ml_features(self, rows=slice(None)):
+        return self.features[rows, :-1]
+
+    def ou_features(self, rows=slice(None)):
+        return self.features[rows]
+
+    def season_rows(self, *seasons):
+        """
+        Returns:
+            slice: rows of the given consecutive seasons
+        """
+        ranges = [self.seasons[season] for season in seasons]
+        return slice(min(start for start, _ in ranges), max(stop for _, stop in ranges))
+
+
+def dataset_directory(dataset, directory=None):
+    return os.path.join(directory or store_dir, dataset)
+
+
+def source_version(con, dataset):
+    """
+    Returns:
+        list: what identifies the table's contents, its size, column schema and the version stamp write_games left
+    """
+    rows, last_index = con.execute(f'select count(*), max("index") from "{dataset}"').fetchone()
+    columns = [[name, column_type] for _, name, column_type, *_ in con.execute(f'pragma table_info("{dataset}")')]
+    return [rows, last_index, columns, Games_Dataset.read_version(con, dataset)]
+
+
+def export(con, dataset, directory=None):
+    """
+    Writes a dataset table to the feature store. Files are written under temporary names and moved into place,
+    metadata last, so readers never see a half written export.
+
+    Returns:
+        FeatureSet: the exported dataset
+    """
+    directory = dataset_directory(dataset, directory)
+    os.makedirs(directory, exist_ok=True)
+    version = source_version(con, dataset)
+    data = pd.read_sql_query(f"select * from \"{dataset}\"", con, index_col="index")
+
+    seasons = season_of(data['Date'])
+    order = np.argsort(seasons, kind='stable')
+    data = data.iloc[order]
+    seasons = seasons[order]
+
+    feature_columns = [column for column in data.columns if column not in drop_columns] + ['OU']
+    features = np.empty((len(data.index), len(feature_columns)), dtype=np.float32)
+    for i, column in enumerate(feature_columns):
+        features[:, i] = data[column].values
+
+    arrays = {'features': features, 'dates': data['Date'].values.astype('U10'),
+              'index': data.index.values.astype(np.int64)}
+    for name, (column, dtype) in label_columns.items():
+        arrays[name] = data[column].values.astype(dtype)
+    for name, array in arrays.items():
+        with open(os.path.join(directory, f'{name}.tmp.npy'), 'wb') as array_file:
+            np.save(array_file, array)
+        os.replace(os.path.join(directory, f'{name}.tmp.npy'), os.path.join(directory, f'{name}.npy'))
+
+    season_names, starts = np.unique(seasons, return_index=True)
+    stops = np.append(starts[1:], len(seasons)) if len(starts) else starts
+    metadata = {
+        'dataset': dataset,
+        'source_version': version,
+        'columns': feature_columns,
+        'seasons': {str(season): [int(start), int(stop)] for season, start, stop in zip(season_names, starts, stops)},
+    }
+    with open(os.path.join(directory, 'metadata.tmp.json'), 'w') as metadata_file:
+        json.dump(metadata, metadata_file, indent=2)
+    os.replace(os.path.join(directory, 'metadata.tmp.json'), os.path.join(directory, 'metadata.json'))
+    return FeatureSet(directory, metadata)
+
+
+def load(con, dataset, directory=None):
+    """
+    Opens a dataset from the feature store, exporting it first when the table has changed since the last export.
+
+    Returns:
+        FeatureSet: memory-mapped features, labels and dates
+    """
+    path = dataset_directory(dataset, directory)
+    try:
+        with open(os.path.join(path, 'metadata.json')) as metadata_file:
+            metadata = json.load(metadata_file)
+    except (OSError, ValueError):
+        metadata = None
+    # exports made before row indexes were kept have no index.npy
+    if metadata is None or metadata['source_version'] != source_version(con, dataset) or \
+            not os.path.exists(os.path.join(path, 'index.npy')):
+        return export(con, dataset, directory)
+    return FeatureSet(path, metadata)
@@ -0,0 +1,182 @@
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from src.Utils import Team_Stats_Store
+from src.Utils.Sqlite_Storage import frame_rows, insert_rows, transaction, write_frame
+from src.Utils.Team_Index import get_team_index
+
+teams_per_date = 30
+built_table = 'dataset_games'
+game_keys = ['Date', 'Home', 'Away']
+version_table = 'dataset_versions'
+
+
+def season_team_index(season):
+    """
+    Returns:
+        dictionary: {team name: row of the team in that season's daily snapshots}
+    """
+    return get_team_index().season_team_index(season)
+
+
+def team_positions(season, teams):
+    positions = get_team_index().season_positions(season, teams)
+    unknown = positions < 0
+    if unknown.any():
+        raise KeyError(np.asarray(teams)[unknown][0])
+    return positions
+
+
+def build_season_games(season, odds_df, team_stats):
+    """
+    Joins a season's odds rows (an odds_{season}_new table) to the team snapshots of their dates. Games on dates
+    without a full snapshot of every team are left out, so a range without snapshots builds nothing.
+
+    Returns:
+        DataFrame: one row per game, home team stats, away team stats suffixed with .1, then the labels
+    """
+    if len(team_stats.index) == 0:
+        return pd.DataFrame()
+    complete_dates = team_stats.groupby('Date').size()
+    complete_dates = complete_dates.index[complete_dates == teams_per_date]
+    odds_df = odds_df[odds_df['Date'].isin(complete_dates)].reset_index(drop=True)
+
+    # snapshot rows laid out as a (date, team position) grid, so both teams of every game are one lookup
+    team_stats = team_stats[team_stats['Date'].isin(complete_dates)]
+    if team_stats.duplicated(['Date', 'index']).any():
+        raise ValueError(f'Team stats snapshots of {season} hold a team position twice on the same date')
+    dates = pd.Index(complete_dates)
+    grid = np.full((len(dates), teams_per_date), -1, dtype=np.int64)
+    grid[dates.get_indexer(team_stats['Date']), team_stats['index'].to_numpy()] = np.arange(len(team_stats.index))
+    game_dates = dates.get_indexer(odds_df['Date'])
+    home_rows = grid[game_dates, team_positions(season, odds_df['Home'])]
+    away_rows = grid[game_dates, team_positions(season, odds_df['Away'])]
+    if (home_rows < 0).any() or (away_rows < 0).any():
+        raise ValueError(f'Team stats snapshots of {season} are missing a team position')
+    home_team_frame = team_stats.iloc[home_rows].reset_index(drop=True)
+    away_team_frame = team_stats.iloc[away_rows].reset_index(drop=True)
+    columns = [column for column in team_stats.columns.values if column != 'index']
+    games = pd.concat([home_team_frame[columns], away_team_frame[columns].rename(
+        columns={col: f"{col}.1" for col in columns}
+    )], axis=1)
+
+    frame = games.drop(columns=['TEAM_ID', 'TEAM_ID.1'])
+    frame['Score'] = odds_df['Points'].values
+    frame['Home-Team-Win'] = np.where(odds_df['Win_Margin'].values > 0, 1, 0)
+    frame['OU'] = odds_df['OU'].values
+    frame['OU-Cover'] = np.where(odds_df['Points'].values < odds_df['OU'].values, 0,
+                                 np.where(odds_df['Points'].values > odds_df['OU'].values, 1, 2))
+    frame['Days-Rest-Home'] = odds_df['Days_Rest_Home'].values
+    frame['Days-Rest-Away'] = odds_df['Days_Rest_Away'].values
+    return frame
+
+
+def fix_types(frame):
+    """
+    Casts every column but team names and dates to float, as the models are trained on.
+    """
+    for field in frame.columns.values:
+        if 'TEAM_' in field or 'Date' in field or field not in frame:
+            continue
+        frame[field] = frame[field].astype(float)
+    return frame
+
+
+def create_built_table(con):
+    con.execute(f'create table if not exists "{built_table}" (dataset TEXT, season TEXT, "Date" TEXT, "Home" TEXT, '
+                f'"Away" TEXT, "index" INTEGER, primary key (dataset, season, "Date", "Home", "Away"))')
+    if 'index' not in [row[1] for row in con.execute(f'pragma table_info("{built_table}")')]:
+        # records written before the dataset index was kept, they stay NULL until a rebuild
+        con.execute(f'alter table "{built_table}" add column "index" INTEGER')
+
+
+def read_built_games(con, dataset):
+    """
+    Returns:
+        DataFrame: season, Date, Home and Away of every odds row already built into the dataset table, with the
+        index of the dataset row it became
+    """
+    create_built_table(con)
+    return pd.read_sql_query(f'select season, "Date", "Home", "Away", "index" from "{built_table}" '
+                             f'where dataset = ?', con, params=(dataset,))
+
+
+def build_new_games(season, odds_df, built, teams_con):
+    """
+    Builds the odds rows of a season that are not in the dataset yet. Rows of dates whose snapshot is still
+    incomplete stay unbuilt, so a later run picks them up once the snapshot is filled in, as it does odds rows
+    that arrive late for a date already built.
+
+    Returns:
+        tuple: (built games frame, their season / Date / Home / Away keys), both empty when nothing was built
+    """
+    done = built.loc[built['season'] == season, game_keys]
+    odds_df = odds_df.merge(done.drop_duplicates(), how='left', on=game_keys, indicator=True)
+    odds_df = odds_df[odds_df['_merge'] == 'left_only'].drop(columns='_merge').reset_index(drop=True)
+    keys = pd.DataFrame(columns=['season'] + game_keys)
+    if len(odds_df.index) == 0:
+        return pd.DataFrame(), keys
+    team_stats = Team_Stats_Store.read_snapshots(teams_con, odds_df['Date'].min(), odds_df['Date'].max())
+    frame = build_season_games(season, odds_df, team_stats)
+    if len(frame.index) == 0:
+        return frame, keys
+    keys = odds_df.loc[odds_df['Date'].isin(frame['Date']), game_keys]
+    keys.insert(0, 'season', season)
+    return frame, keys
+
+
+def read_version(con, dataset):
+    """
+    Returns:
+        string: the stamp write_games left on its last write of the dataset, None if it never wrote it
+    """
+    if con.execute("select 1 from sqlite_master where type = 'table' and name = ?", (version_table,)).fetchone() is None:
+        return None
+    row = con.execute(f'select version from "{version_table}" where dataset = ?', (dataset,)).fetchone()
+    return row[0] if row else None
+
+
+def stamp_version(con, dataset):
+    # random rather than counted, so a dataset rebuilt in a fresh database never repeats an old stamp
+    con.execute(f'create table if not exists "{version_table}" (dataset TEXT PRIMARY KEY, version TEXT)')
+    con.execute(f'insert or replace into "{version_table}" values (?, ?)', (dataset, uuid.uuid4().hex))
+
+
+def record_built_games(con, dataset, built, index):
+    rows = built[['season'] + game_keys].copy()
+    rows.insert(0, 'dataset', dataset)
+    rows['index'] = index
+    insert_rows(con, built_table, rows.columns, frame_rows(rows), replace=True)
+
+
+def write_games(con, dataset, frame, built, replace=False):
+    """
+    Appends built games to the dataset table and records the odds rows they came from (a frame of season, Date,
+    Home and Away, row for row with the games) in one transaction, or rewrites the table and every record in one
+    transaction with replace=True. Appended rows continue the table's index, and each record keeps the index of
+    its game.
+    Every write stamps the dataset with a new version, which tells the feature store to export it again.
+    """
+    if len(built.index) != len(frame.index):
+        raise ValueError(f'{len(frame.index)} games to write but {len(built.index)} odds rows they came from')
+    create_built_table(con)
+    if replace:
+        with transaction(con):
+            write_frame(con, dataset, frame)
+            con.execute(f'delete from "{built_table}" where dataset = ?', (dataset,))
+            record_built_games(con, dataset, built, frame.index.values)
+            stamp_version(con, dataset)
+        return
+
+    columns = [row[1] for row in con.execute(f'pragma table_info("{dataset}")')]
+    if columns != ['index'] + list(frame.columns.values):
+        raise ValueError(f'Columns of "{dataset}" do not match the games being added, rebuild it with -full')
+    with con:
+        start = con.execute(f'select coalesce(max("index") + 1, 0) from "{dataset}"').fetchone()[0]
+        frame = frame.copy()
+        frame.insert(0, 'index', range(start, start + len(frame.index)))
+        insert_rows(con, dataset, frame.columns, frame_rows(frame))
+        record_built_games(con, dataset, built, frame['index'].values)
+        stamp_version(con, dataset)
@@ -0,0 +1,123 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+default_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'Data', 'HttpCache.sqlite'))
+
+session = None
+lock = threading.Lock()
+
+
+def get_session():
+    """
+    Returns the process wide session, pooling connections and retrying throttled or failed GETs with backoff.
+    """
+    global session
+    with lock:
+        if session is None:
+            session = requests.Session()
+            retry = Retry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504],
+                          allowed_methods=['GET'], respect_retry_after_header=True)
+            adapter = HTTPAdapter(max_retries=retry, pool_maxsize=8)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        return session
+
+
+class HttpCache:
+    """ On-disk cache of GET responses keyed by URL.
+    Responses younger than their TTL are served from disk. Older ones are revalidated with their ETag /
+    Last-Modified, so an unchanged resource costs a 304 instead of a full download, and a failed request falls
+    back to the cached copy.
+    """
+
+    def __init__(self, path=default_path, session=None):
+        self.path = path
+        self.session = session
+        con = self.connect()
+        with con:
+            con.execute('create table if not exists responses (url TEXT PRIMARY KEY, fetched_at REAL, etag TEXT, '
+                        'last_modified TEXT, body BLOB)')
+        con.close()
+
+    def connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def lookup(self, url):
+        con = self.connect()
+        row = con.execute('select fetched_at, etag, last_modified, body from responses where url = ?',
+                          (url,)).fetchone()
+        con.close()
+        return row
+
+    def store(self, url, fetched_at, etag, last_modified, body):
+        con = self.connect()
+        with con:
+            con.execute('insert or replace into responses values (?, ?, ?, ?, ?)',
+                        (url, fetched_at, etag, last_modified, body))
+        con.close()
+
+    def touch(self, url, fetched_at):
+        con = self.connect()
+        with con:
+            con.execute('update responses set fetched_at = ? where url = ?', (fetched_at, url))
+        con.close()
+
+    def get(self, url, headers=None, ttl=3600, timeout=30, validate=None):
+        """
+        Fetches a URL through the cache. Bodies rejected by validate are returned but not cached.
+
+        Returns:
+            bytes: the response body, from the cache when it is fresh, unchanged or the server cannot be reached
+        """
+        cached = self.lookup(url)
+        now = time.time()
+        if cached is not None and now - cached[0] <= ttl:
+            return cached[3]
+
+        headers = dict(headers or {})
+        if cached is not None:
+            if cached[1]:
+                headers['If-None-Match'] = cached[1]
+            if cached[2]:
+                headers['If-Modified-Since'] = cached[2]
+        try:
+            response = (self.session or get_session()).get(url, headers=headers, timeout=timeout)
+        except requests.RequestException as e:
+            if cached is None:
+                raise
+            print(f"Using cached response after failed request: {e}")
+            return cached[3]
+
+        if response.status_code == 304 and cached is not None:
+            self.touch(url, now)
+            return cached[3]
+        if response.status_code != 200:
+            if cached is not None:
+                print(f"Using cached response after HTTP {response.status_code}")
+                return cached[3]
+            return response.content
+        if validate is None or validate(response.content):
+            self.store(url, now, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                       response.content)
+        return response.content
+
+    def get_json(self, url, headers=None, ttl=3600, timeout=30, validate=None):
+        """
+        Returns:
+            the decoded JSON body, only cached when it decodes and passes validate
+        """
+        def valid(body):
+            try:
+                data = json.loads(body)
+            except ValueError:
+                return False
+            return validate is None or validate(data)
+
+        return json.loads(self.get(url, headers, ttl, timeout, validate=valid))
@@ -1,17 +1,36 @@
+import numpy as np
+
+from src.Utils.Rounding import round_array
+
+
 def american_to_decimal(american_odds):
     """
     Converts American odds to decimal odds (European odds).
     """
-    if american_odds >= 100:
-        decimal_odds = (american_odds / 100)
-    else:
-        decimal_odds = (100 / abs(american_odds))
-    return round(decimal_odds, 2)
+    return float(american_to_decimal_array(american_odds))
 
 def calculate_kelly_criterion(american_odds, model_prob):
     """
     Calculates the fraction of the bankroll to be wagered on each bet
     """
-    decimal_odds = american_to_decimal(american_odds)
-    bankroll_fraction = round((100 * (decimal_odds * model_prob - (1 - model_prob))) / decimal_odds, 2)
-    return bankroll_fraction if bankroll_fraction > 0 else 0
\ No newline at end of file
+    bankroll_fraction = float(calculate_kelly_criterion_array(american_odds, model_prob))
+    return bankroll_fraction if bankroll_fraction > 0 else 0
+
+def american_to_decimal_array(american_odds):
+    """
+    Converts an array of American odds to decimal odds (European odds).
+    """
+    american_odds = np.asarray(american_odds, dtype=np.float64)
+    with np.errstate(divide='ignore'):
+        decimal_odds = np.where(american_odds >= 100, american_odds / 100, 100 / np.abs(american_odds))
+    return round_array(decimal_odds, 2)
+
+def calculate_kelly_criterion_array(american_odds, model_prob):
+    """
+    Calculates the fraction of the bankroll to be wagered for arrays of American odds and model probabilities.
+    Fractions are clipped at 0 and are NaN where odds are missing.
+    """
+    decimal_odds = american_to_decimal_array(american_odds)
+    model_prob = np.asarray(model_prob, dtype=np.float64)
+    bankroll_fraction = round_array((100 * (decimal_odds * model_prob - (1 - model_prob))) / decimal_odds, 2)
+    return np.where(bankroll_fraction <= 0, 0, bankroll_fraction)
@@ -0,0 +1,22 @@
+import numpy as np
+
+
+def round_array(values, decimals=2):
+    """
+    Vectorized equivalent of Python's round(value, decimals).
+
+    np.round scales by 10 ** decimals first, so a value such as 22.055 (stored as 22.05499...) can land exactly on
+    a half and round the wrong way. The rounding error of the scaling product is recovered exactly (Dekker's
+    two-product) and used to settle those ties the way round() does.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    scale = 10.0 ** decimals
+    scaled = values * scale
+    split = 134217729.0 * values  # 2 ** 27 + 1
+    high = split - (split - values)
+    low = values - high
+    error = (high * scale - scaled) + low * scale
+    rounded = np.rint(scaled)
+    tie = (np.abs(scaled - np.trunc(scaled)) == 0.5) & (error != 0)
+    rounded = np.where(tie, np.where(error > 0, np.ceil(scaled), np.floor(scaled)), rounded)
+    return rounded / scale
@@ -0,0 +1,96 @@
+import sqlite3
+from contextlib import contextmanager
+from itertools import islice
+
+import pandas as pd
+
+chunk_size = 10000
+pragmas = {
+    'journal_mode': 'WAL',
+    # with WAL a commit no longer waits for an fsync, only checkpoints do
+    'synchronous': 'NORMAL',
+    'cache_size': -64 * 1024,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+
+def connect(path, timeout=30):
+    """
+    Opens a SQLite database tuned for bulk writes: WAL journal, synchronous=NORMAL, a 64 MB page cache and
+    memory mapped reads.
+    """
+    con = sqlite3.connect(path, timeout=timeout)
+    for name, value in pragmas.items():
+        con.execute(f'pragma {name} = {value}')
+    return con
+
+
+@contextmanager
+def transaction(con):
+    """
+    Runs the block in one explicit transaction, table drops and creates included, rolling back on errors.
+    """
+    con.execute('begin')
+    try:
+        yield con
+    except BaseException:
+        con.rollback()
+        raise
+    con.commit()
+
+
+def frame_rows(frame):
+    """
+    Returns:
+        iterator: the frame's rows as tuples SQLite can bind, with missing values as NULL
+    """
+    frame = frame.copy()
+    for column, dtype in frame.dtypes.items():
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            frame[column] = frame[column].dt.strftime('%Y-%m-%dT%H:%M:%S')
+    return frame.astype(object).where(frame.notna(), None).itertuples(index=False, name=None)
+
+
+def insert_rows(con, table, columns, rows, replace=False, size=chunk_size):
+    """
+    Inserts rows through one prepared statement, chunk by chunk, without committing.
+    """
+    names = ', '.join(f'"{column}"' for column in columns)
+    placeholders = ', '.join('?' for _ in columns)
+    statement = f'insert {"or replace " if replace else ""}into "{table}" ({names}) values ({placeholders})'
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            break
+        con.executemany(statement, chunk)
+
+
+def write_frame(con, table, frame, size=chunk_size):
+    """
+    Replaces a table with a frame and its index, as DataFrame.to_sql(if_exists="replace") does, inside the
+    caller's transaction.
+    """
+    frame = frame.reset_index()
+    con.execute(f'drop table if exists "{table}"')
+    con.execute(pd.io.sql.get_schema(frame, table))
+    con.execute(f'create index "ix_{table}_index" on "{table}" ("index")')
+    insert_rows(con, table, frame.columns, frame_rows(frame), size=size)
+
+
+def append_frame(con, table, frame, size=chunk_size):
+    """
+    Appends a frame and its index to a table write_frame created, inside the caller's transaction.
+    """
+    frame = frame.reset_index()
+    insert_rows(con, table, frame.columns, frame_rows(frame), size=size)
+
+
+def write_frames(con, frames, size=chunk_size):
+    """
+    Replaces every {table: frame} in a single transaction.
+    """
+    with transaction(con):
+        for table, frame in frames.items():
+            write_frame(con, table, frame, size=size)
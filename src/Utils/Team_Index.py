@@ -0,0 +1,73 @@
+import os
+
+import numpy as np
+import pandas as pd
+import toml
+
+default_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'Data', 'team-index.toml'))
+
+team_index = None
+
+
+class TeamIndex:
+    """ Team identities across seasons, compiled once from Data/team-index.toml.
+    Every team name has the stable integer id the file gives it, and each era of team names is a row of a
+    (eras x ids) array of snapshot row positions, so the positions of any number of teams in a season are a single
+    fancy-indexing lookup.
+    """
+
+    def __init__(self, eras, seasons, default_era, current_season, team_ids):
+        if len(set(team_ids.values())) != len(team_ids):
+            raise ValueError("Team ids must be unique")
+        missing = sorted({name for teams in eras.values() for name in teams} - set(team_ids))
+        if missing:
+            raise ValueError(f"Teams without an id: {missing}")
+        self.eras = eras
+        self.era_names = list(eras)
+        self.names = pd.Index(list(team_ids))
+        self.name_ids = np.array(list(team_ids.values()), dtype=np.int64)
+        self.positions = np.full((len(eras), self.name_ids.max() + 1), -1, dtype=np.int64)
+        for row, teams in enumerate(eras.values()):
+            self.positions[row, self.team_ids(teams)] = list(teams.values())
+        self.season_eras = {season: self.era_names.index(era) for season, era in seasons.items()}
+        self.default_era = self.era_names.index(default_era)
+        self.current_season = current_season
+
+    @classmethod
+    def from_toml(cls, path=default_path):
+        config = toml.load(path)
+        return cls(config['eras'], config['seasons'], config['default_era'], config['current_season'],
+                   config['team_ids'])
+
+    def era(self, season):
+        return self.season_eras.get(season, self.default_era)
+
+    def team_ids(self, teams):
+        """
+        Returns:
+            numpy array: the id of each team name, -1 for names never seen
+        """
+        found = self.names.get_indexer(list(teams))
+        return np.where(found >= 0, self.name_ids[found], -1)
+
+    def season_positions(self, season, teams):
+        """
+        Returns:
+            numpy array: each team's row in that season's daily snapshots, -1 for teams not playing that season
+        """
+        ids = self.team_ids(teams)
+        return np.where(ids >= 0, self.positions[self.era(season), ids], -1)
+
+    def season_team_index(self, season):
+        """
+        Returns:
+            dictionary: {team name: row of the team in that season's daily snapshots}
+        """
+        return dict(self.eras[self.era_names[self.era(season)]])
+
+
+def get_team_index():
+    global team_index
+    if team_index is None:
+        team_index = TeamIndex.from_toml()
+    return team_index
@@ -0,0 +1,116 @@
+import re
+
+import pandas as pd
+
+from src.Utils.Sqlite_Storage import frame_rows, insert_rows
+
+table = 'team_stats'
+date_table_pattern = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+def column_type(dtype):
+    if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'REAL'
+    return 'TEXT'
+
+
+def table_columns(con):
+    return [row[1] for row in con.execute(f'pragma table_info("{table}")')]
+
+
+def ensure_table(con, df):
+    """
+    Creates the snapshot table from a day's frame, or adds any columns the frame has that the table lacks.
+
+    Rows are stored in a WITHOUT ROWID table clustered on (Date, TEAM_ID), so the primary key covers lookups by
+    date and team; "index" keeps each team's row position within its day as the per-date tables had it.
+    """
+    existing = table_columns(con)
+    if not existing:
+        columns = ', '.join(f'"{column}" {column_type(dtype)}' for column, dtype in df.dtypes.items())
+        con.execute(f'create table "{table}" ({columns}, primary key ("Date", "TEAM_ID")) without rowid')
+        con.execute(f'create unique index if not exists "ix_{table}_position" on "{table}" ("Date", "index")')
+        return
+    for column, dtype in df.dtypes.items():
+        if column not in existing:
+            con.execute(f'alter table "{table}" add column "{column}" {column_type(dtype)}')
+
+
+def write_snapshot(con, date, df):
+    """
+    Stores one day's team stats, replacing any earlier snapshot of that date.
+    """
+    if len(df.index) == 0:
+        if table_columns(con):
+            with con:
+                con.execute(f'delete from "{table}" where "Date" = ?', (date,))
+        return
+    df = df.copy()
+    df['Date'] = date
+    if 'index' not in df.columns:
+        df.insert(0, 'index', range(len(df)))
+    with con:
+        ensure_table(con, df)
+        con.execute(f'delete from "{table}" where "Date" = ?', (date,))
+        insert_rows(con, table, df.columns, frame_rows(df))
+
+
+def count_teams_by_date(con):
+    """
+    Returns:
+        dictionary: {date: number of teams in that day's snapshot}
+    """
+    if not table_columns(con):
+        return {}
+    return dict(con.execute(f'select "Date", count(*) from "{table}" group by "Date"').fetchall())
+
+
+def read_snapshots(con, start, end):
+    """
+    Returns:
+        DataFrame: every team's snapshot for the dates from start to end inclusive
+    """
+    if not table_columns(con):
+        return pd.DataFrame()
+    return pd.read_sql_query(f'select * from "{table}" where "Date" between ? and ?', con, params=(start, end))
+
+
+def get_team_stats(con, pairs, by='TEAM_ID'):
+    """
+    Looks up the snapshots of many (date, team) pairs in one query. Teams are identified by TEAM_ID, or by their
+    row position within the day's snapshot with by='index'.
+
+    Returns:
+        DataFrame: one row per pair, in the order given, with NaN rows for pairs that have no snapshot
+    """
+    columns = table_columns(con)
+    selected = ', '.join(f't."{column}"' for column in columns)
+    query = f'select {selected} from wanted_team_stats w left join "{table}" t ' \
+            f'on t."Date" = w."Date" and t."{by}" = w.team order by w.rowid'
+    with con:
+        con.execute('create temp table if not exists wanted_team_stats ("Date" TEXT, team INTEGER)')
+        con.execute('delete from wanted_team_stats')
+        con.executemany('insert into wanted_team_stats values (?, ?)', ((date, int(team)) for date, team in pairs))
+        stats = pd.read_sql_query(query, con)
+        con.execute('delete from wanted_team_stats')
+    return stats
+
+
+def migrate_per_date_tables(con, drop=False):
+    """
+    Copies every per-date table (named YYYY-MM-DD) into the snapshot table, optionally dropping them afterwards.
+
+    Returns:
+        int: number of dates migrated
+    """
+    dates = sorted(name for (name,) in con.execute("select name from sqlite_master where type = 'table'")
+                   if date_table_pattern.match(name))
+    for date in dates:
+        df = pd.read_sql_query(f'select * from "{date}"', con)
+        write_snapshot(con, date, df)
+        if drop:
+            with con:
+                con.execute(f'drop table "{date}"')
+    return len(dates)
@@ -1,10 +1,7 @@
-import re
-from datetime import datetime
-
 import pandas as pd
-import requests
 
 from .Dictionaries import team_index_current
+from .Http_Cache import HttpCache
 
 games_header = {
     'user-agent': 'Mozilla/5.0 (Windows NT 6.2; WOW64) AppleWebKit/537.36 (KHTML, like Gecko) '
@@ -27,19 +24,31 @@ data_headers = {
 }
 
 
-def get_json_data(url):
-    raw_data = requests.get(url, headers=data_headers)
+http_cache = None
+
+
+def get_http_cache():
+    global http_cache
+    if http_cache is None:
+        http_cache = HttpCache()
+    return http_cache
+
+
+def get_json_data(url, ttl=6 * 3600):
+    """
+    Fetches a stats.nba.com endpoint, reusing the cached response for ttl seconds and revalidating it after.
+    """
     try:
-        json = raw_data.json()
+        json = get_http_cache().get_json(url, headers=data_headers, ttl=ttl,
+                                         validate=lambda data: bool(data.get('resultSets')))
     except Exception as e:
         print(e)
         return {}
     return json.get('resultSets')
 
 
-def get_todays_games_json(url):
-    raw_data = requests.get(url, headers=games_header)
-    json = raw_data.json()
+def get_todays_games_json(url, ttl=300):
+    json = get_http_cache().get_json(url, headers=games_header, ttl=ttl)
     return json.get('gs').get('g')
 
 
@@ -74,6 +83,34 @@ def create_todays_games_from_odds(input_dict):
 
 
 def get_date(date_string):
-    year1, month, day = re.search(r'(\d+)-\d+-(\d\d)(\d\d)', date_string).groups()
-    year = year1 if int(month) > 8 else int(year1) + 1
-    return datetime.strptime(f"{year}-{month}-{day}", '%Y-%m-%d')
+    """
+    Parses a single SBR season date with parse_sbr_dates, for callers holding one date at a time.
+
+    Returns:
+        datetime: the date, months before September falling in the second year of the season
+    """
+    date = parse_sbr_dates([date_string])[0]
+    if pd.isna(date):
+        raise ValueError(f"Not an SBR season date: {date_string}")
+    return date.to_pydatetime()
+
+
+def parse_sbr_dates(dates, rollover='month'):
+    """
+    Parses a column of SBR season dates like 2022-23-1018 (season start year, then month and day) in one pass.
+    With rollover='month' dates before September fall in the second year of the season, like get_date. With
+    rollover='january' every date from the first January one on does, in the order given, like the row order
+    Fix_Odds_Date_Format.py has always walked. Strings that do not parse become NaT.
+
+    Returns:
+        pandas Series: datetime64 dates
+    """
+    parts = pd.Series(dates).str.extract(r'(\d+)-\d+-(\d\d)(\d\d)').astype(float)
+    year, month, day = parts[0], parts[1], parts[2]
+    if rollover == 'month':
+        second_year = month <= 8
+    elif rollover == 'january':
+        second_year = (month == 1).cummax()
+    else:
+        raise ValueError(f"Unknown rollover: {rollover}")
+    return pd.to_datetime(pd.DataFrame({'year': year + second_year, 'month': month, 'day': day}), errors='coerce')